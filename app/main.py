@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import sys
 
+from core.license_entitlements import set_default_manager
 from core.license_manager import LicenseManager, LicenseValidationError
 
 
@@ -15,14 +16,20 @@ def bootstrap_application() -> None:
 
 def main() -> None:
     """Entry point for launching the application."""
+    manager = None
     try:
         manager = LicenseManager()
         if not manager.validate_license():  # Defensive; validate_license raises on failure.
             raise LicenseValidationError("Invalid or expired license.")
     except LicenseValidationError as exc:
         print(f"[LICENSE ERROR] {exc}")
+        if manager is not None:
+            # License events are written asynchronously; persist them before exiting.
+            manager.flush_events()
         sys.exit(1)
 
+    # Feature gates (@requires_license) read this manager's cached result.
+    set_default_manager(manager)
     bootstrap_application()
 
 
@@ -0,0 +1,388 @@
+"""Microbenchmarks for the licensing hot paths.
+
+Run from the repository root::
+
+    python benchmarks/bench_license.py --output bench.json
+    python benchmarks/bench_license.py --baseline bench.json --threshold 0.25
+
+Each case reports the best per-operation time over several repeats. With
+``--baseline`` the run exits non-zero when a case is slower than the baseline
+by more than ``--threshold`` (a fraction, 0.25 = 25%). It also exits non-zero
+when the license middleware adds more than ``--gate-budget`` nanoseconds per
+request over the bare app (one microsecond by default).
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from functools import cached_property, partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey  # noqa: E402
+
+from core.gen_license import canonical_payload_v2, human_readable, sign_with_key_v2  # noqa: E402
+from core.license_manager import LicenseManager  # noqa: E402
+from core.license_middleware import LicenseASGIMiddleware, LicenseGate, LicenseWSGIMiddleware  # noqa: E402
+from core.license_verifier import (  # noqa: E402
+    LicenseVerificationError,
+    _load_public_key,
+    clear_public_key_cache,
+    decode_token,
+    normalize_token,
+    verify_token,
+)
+
+Case = Tuple[str, Callable[[], Any], Optional[int]]
+# Like ``Case``, but with a setup function that builds the timed callable.
+CaseSetup = Tuple[str, Callable[[], Callable[[], Any]], Optional[int]]
+
+# Per-request budget for the license middleware over the bare app.
+GATE_BUDGET_NS = 1000.0
+
+
+def make_token(private_key: Ed25519PrivateKey, *, expiry: int) -> str:
+    payload = f"bench-customer|ShopSaavy|1.0.0|{expiry}".encode("utf-8")
+    payload_b64 = base64.urlsafe_b64encode(payload).decode("utf-8").rstrip("=")
+    signature_b64 = base64.urlsafe_b64encode(private_key.sign(payload)).decode("utf-8").rstrip("=")
+    return f"{payload_b64}.{signature_b64}"
+
+
+def grouped(token: str) -> str:
+    encoded = base64.b32encode(token.encode("utf-8")).decode("utf-8").rstrip("=")
+    return "-".join(encoded[i : i + 5] for i in range(0, len(encoded), 5))
+
+
+def tamper(token: str) -> str:
+    index = token.index(".") + 2
+    return token[:index] + ("A" if token[index] != "A" else "B") + token[index + 1 :]
+
+
+def expect_failure(func: Callable[[], Any]) -> Callable[[], None]:
+    def run() -> None:
+        try:
+            func()
+        except LicenseVerificationError:
+            return
+        raise AssertionError("expected verification to fail")
+
+    return run
+
+
+def wsgi_app(environ: Dict[str, Any], start_response: Callable[..., Any]) -> List[bytes]:
+    start_response("200 OK", [])
+    return [b"ok"]
+
+
+async def asgi_app(scope: Dict[str, Any], receive: Any, send: Any) -> None:
+    return None
+
+
+def drive(coroutine: Any) -> None:
+    """Run a coroutine that never suspends without an event loop."""
+
+    try:
+        coroutine.send(None)
+    except StopIteration:
+        return
+    raise AssertionError("coroutine suspended")
+
+
+class Fixtures:
+    """Keys, tokens and license gates shared by the cases, created on first use.
+
+    Only the fixtures a selected case needs are built, so ``--filter`` skips
+    key generation, signing and gate validation the subset does not use.
+    """
+
+    def __init__(self, workdir: Path) -> None:
+        self.workdir = workdir
+        self.now = int(time.time())
+        self._env_ready = False
+
+    @cached_property
+    def private_key(self) -> Ed25519PrivateKey:
+        return Ed25519PrivateKey.generate()
+
+    @cached_property
+    def public_path(self) -> Path:
+        path = self.workdir / "license_public.pem"
+        path.write_bytes(
+            self.private_key.public_key().public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+        )
+        _load_public_key(path)
+        return path
+
+    @cached_property
+    def raw(self) -> str:
+        return make_token(self.private_key, expiry=self.now + 86400)
+
+    @cached_property
+    def expired(self) -> str:
+        return make_token(self.private_key, expiry=self.now - 60)
+
+    @cached_property
+    def v2(self) -> str:
+        payload = canonical_payload_v2("bench-customer", "ShopSaavy", "1.0.0", self.now + 86400)
+        return sign_with_key_v2(self.private_key, payload)
+
+    @cached_property
+    def human(self) -> str:
+        return human_readable(self.raw)
+
+    @cached_property
+    def gates(self) -> Tuple[LicenseGate, LicenseGate]:
+        self.configure_env()
+        allowed = LicenseGate(LicenseManager())
+        denied = LicenseGate(LicenseManager(self.expired))
+        if not allowed.refresh() or denied.refresh():
+            raise AssertionError("unexpected license state for middleware benchmarks")
+        return allowed, denied
+
+    def configure_env(self) -> None:
+        """Point ``LicenseManager`` at the benchmark key and token."""
+
+        if self._env_ready:
+            return
+        os.environ.update(
+            {
+                "LICENSE_TOKEN": self.raw,
+                "LICENSE_PUBLIC_KEY_PATH": str(self.public_path),
+                "LICENSE_LOG_PATH": str(self.workdir / "license.log"),
+                "LICENSE_STATUS_PATH": str(self.workdir / "license_status.json"),
+                "LICENSE_REVOCATION_PATH": str(self.workdir / "missing_revocations.bin"),
+            }
+        )
+        os.environ.pop("LICENSE_KEY", None)
+        self._env_ready = True
+
+
+def middleware_cases(fx: Fixtures) -> List[CaseSetup]:
+    # Compare each gated case with its bare counterpart: the difference is the
+    # per-request overhead (see GATE_BUDGET_NS).
+    environ: Dict[str, Any] = {"PATH_INFO": "/"}
+    scope = {"type": "http", "path": "/"}
+
+    def start_response(status: str, headers: Any) -> None:
+        return None
+
+    def wsgi(allowed: bool) -> Callable[[], Any]:
+        gated = LicenseWSGIMiddleware(wsgi_app, fx.gates[0 if allowed else 1], start=False)
+        return lambda: gated(environ, start_response)
+
+    def asgi() -> Callable[[], Any]:
+        gated = LicenseASGIMiddleware(asgi_app, fx.gates[0], start=False)
+        return lambda: drive(gated(scope, None, None))
+
+    return [
+        ("middleware.wsgi.bare", lambda: lambda: wsgi_app(environ, start_response), None),
+        ("middleware.wsgi.allowed", lambda: wsgi(True), None),
+        ("middleware.wsgi.denied", lambda: wsgi(False), None),
+        ("middleware.asgi.bare", lambda: lambda: drive(asgi_app(scope, None, None)), None),
+        ("middleware.asgi.allowed", asgi, None),
+    ]
+
+
+def build_cases(workdir: Path, selected: Optional[str] = None) -> List[Case]:
+    """Return the cases whose name contains ``selected`` (all by default)."""
+
+    fx = Fixtures(workdir)
+
+    def base32() -> str:
+        return grouped(fx.raw)
+
+    def typo() -> str:
+        human = fx.human
+        return human[:8] + ("Z" if human[8] != "Z" else "Y") + human[9:]
+
+    def cold_key_load() -> Callable[[], None]:
+        public_path = fx.public_path
+
+        def run() -> None:
+            clear_public_key_cache()
+            _load_public_key(public_path)
+
+        return run
+
+    def expired_check() -> Callable[[], None]:
+        public_path, expired = fx.public_path, fx.expired
+
+        def run() -> None:
+            if not verify_token(public_path, expired).is_expired:
+                raise AssertionError("expected an expired payload")
+
+        return run
+
+    def manager_init() -> Callable[[], Any]:
+        fx.configure_env()
+        return LicenseManager
+
+    def cli_status() -> Callable[[], None]:
+        fx.configure_env()
+        return partial(launch_cli, "status")
+
+    setups: List[CaseSetup] = [
+        ("normalize_token.raw", lambda: partial(normalize_token, fx.raw), None),
+        ("normalize_token.base32", lambda: partial(normalize_token, base32()), None),
+        ("normalize_token.v2.base32", lambda: partial(normalize_token, human_readable(fx.v2)), None),
+        ("normalize_token.human", lambda: partial(normalize_token, fx.human), None),
+        ("decode_token.raw", lambda: partial(decode_token, fx.raw), None),
+        ("decode_token.v2", lambda: partial(decode_token, fx.v2), None),
+        ("load_public_key.cold", cold_key_load, None),
+        ("load_public_key.warm", lambda: partial(_load_public_key, fx.public_path), None),
+        ("verify_token.valid.raw", lambda: partial(verify_token, fx.public_path, fx.raw), None),
+        ("verify_token.valid.base32", lambda: partial(verify_token, fx.public_path, base32()), None),
+        ("verify_token.valid.v2", lambda: partial(verify_token, fx.public_path, fx.v2), None),
+        (
+            "verify_token.tampered",
+            lambda: expect_failure(partial(verify_token, fx.public_path, tamper(fx.raw))),
+            None,
+        ),
+        ("verify_token.expired", expired_check, None),
+        (
+            "verify_token.checksum_typo",
+            lambda: expect_failure(partial(verify_token, fx.public_path, typo())),
+            None,
+        ),
+        ("license_manager.init", manager_init, None),
+        ("license_cli.process.status", cli_status, 1),
+        *middleware_cases(fx),
+    ]
+    return [(name, setup(), number) for name, setup, number in setups if not selected or selected in name]
+
+
+def launch_cli(command: str) -> None:
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    subprocess.run(
+        [sys.executable, "-m", "core.license_cli", command],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+
+
+def measure(func: Callable[[], Any], *, number: Optional[int], repeat: int) -> Dict[str, Any]:
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {"ns_per_op": best * 1e9, "number": number, "repeat": repeat}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a description of every case slower than ``baseline`` by more than ``threshold``."""
+
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        ratio = current["ns_per_op"] / previous["ns_per_op"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {previous['ns_per_op']:.0f} ns -> {current['ns_per_op']:.0f} ns ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def gate_overheads(results: Dict[str, Any]) -> Dict[str, float]:
+    """Return the ns/request each gated middleware case adds over its bare app."""
+
+    overheads = {}
+    for protocol in ("wsgi", "asgi"):
+        bare = results.get(f"middleware.{protocol}.bare")
+        if bare is None:
+            continue
+        for outcome in ("allowed", "denied"):
+            gated = results.get(f"middleware.{protocol}.{outcome}")
+            if gated is not None:
+                overheads[f"middleware.{protocol}.{outcome}"] = gated["ns_per_op"] - bare["ns_per_op"]
+    return overheads
+
+
+def run(selected: Optional[str] = None, *, repeat: int = 5) -> Dict[str, Any]:
+    saved_env = dict(os.environ)
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            results = {}
+            for name, func, number in build_cases(Path(workdir), selected):
+                results[name] = measure(func, number=number, repeat=repeat)
+    finally:
+        os.environ.clear()
+        os.environ.update(saved_env)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the licensing hot paths")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this path")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous JSON result")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown fraction")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per case")
+    parser.add_argument(
+        "--gate-budget",
+        type=float,
+        default=GATE_BUDGET_NS,
+        help="Allowed middleware overhead in ns per request",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, repeat=args.repeat)
+    for name, result in results.items():
+        print(f"{name:<32} {result['ns_per_op']:>14,.0f} ns/op")
+
+    code = 0
+    overheads = gate_overheads(results)
+    if overheads:
+        print(f"Middleware overhead (budget {args.gate_budget:,.0f} ns/request):")
+        for name, overhead in overheads.items():
+            verdict = "ok" if overhead <= args.gate_budget else "OVER BUDGET"
+            print(f"  {name:<30} {overhead:>12,.0f} ns  {verdict}")
+            if overhead > args.gate_budget:
+                code = 1
+
+    document = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": int(time.time()),
+        },
+        "results": results,
+        "gate_overhead_ns": overheads,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Regressions beyond threshold:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return code
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
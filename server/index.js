@@ -3,7 +3,8 @@ const cors = require('cors');
 const dotenv = require('dotenv');
 const net = require('net');
 const path = require('path');
-const { execFile, execFileSync } = require('child_process');
+const readline = require('readline');
+const { execFile, execFileSync, spawn } = require('child_process');
 
 const {
   initializeDb,
@@ -33,7 +34,7 @@ function buildPythonEnv() {
   };
 }
 
-function runLicenseCommand(command) {
+function runLicenseCommandOnce(command) {
   return new Promise((resolve, reject) => {
     execFile(
       'python3',
@@ -44,6 +45,16 @@ function runLicenseCommand(command) {
         encoding: 'utf-8'
       },
       (error, stdout = '', stderr = '') => {
+        if (command === 'metrics') {
+          // Prometheus text, not JSON; shaped like the daemon's reply.
+          if (error) {
+            reject(new Error(stderr.trim() || error.message || 'License command failed'));
+            return;
+          }
+          resolve({ metrics: stdout });
+          return;
+        }
+
         let parsed;
         if (stdout) {
           try {
@@ -72,6 +83,79 @@ function runLicenseCommand(command) {
   });
 }
 
+let licenseDaemon = null;
+const LICENSE_DAEMON_TIMEOUT_MS = Number(process.env.LICENSE_DAEMON_TIMEOUT_MS) || 10000;
+
+function startLicenseDaemon() {
+  const child = spawn('python3', ['-m', 'core.license_cli', 'serve'], {
+    cwd: resolveFromRoot('.'),
+    env: buildPythonEnv(),
+    stdio: ['pipe', 'pipe', 'inherit']
+  });
+  const daemon = { child, pending: new Map(), nextId: 1 };
+
+  const failPending = (error) => {
+    for (const { reject } of daemon.pending.values()) {
+      reject(error);
+    }
+    daemon.pending.clear();
+    if (licenseDaemon === daemon) {
+      licenseDaemon = null;
+    }
+  };
+
+  readline.createInterface({ input: child.stdout }).on('line', (line) => {
+    let reply;
+    try {
+      reply = JSON.parse(line);
+    } catch (parseError) {
+      console.error('Unable to parse license daemon response', parseError);
+      return;
+    }
+    const entry = daemon.pending.get(reply.id);
+    if (!entry) {
+      return;
+    }
+    daemon.pending.delete(reply.id);
+    delete reply.id;
+    entry.resolve(reply);
+  });
+
+  child.on('error', failPending);
+  child.on('exit', () => failPending(new Error('License daemon exited')));
+  child.stdin.on('error', failPending);
+  return daemon;
+}
+
+function runLicenseCommand(command) {
+  if (!licenseDaemon) {
+    licenseDaemon = startLicenseDaemon();
+  }
+  const daemon = licenseDaemon;
+  const id = daemon.nextId++;
+  return new Promise((resolve, reject) => {
+    const timer = setTimeout(() => {
+      daemon.pending.delete(id);
+      reject(new Error(`License daemon did not answer within ${LICENSE_DAEMON_TIMEOUT_MS} ms`));
+      // A stuck daemon would stall every later request; the next call starts a new one.
+      if (licenseDaemon === daemon) {
+        licenseDaemon = null;
+      }
+      daemon.child.kill();
+    }, LICENSE_DAEMON_TIMEOUT_MS);
+    const settle = (callback) => (value) => {
+      clearTimeout(timer);
+      callback(value);
+    };
+    daemon.pending.set(id, { resolve: settle(resolve), reject: settle(reject) });
+    daemon.child.stdin.write(`${JSON.stringify({ id, command })}\n`);
+  }).catch((error) => {
+    console.warn('License daemon unavailable, falling back to a one-off process', error.message);
+    // A fresh process reads the current credentials anyway.
+    return runLicenseCommandOnce(command === 'reload' ? 'validate' : command);
+  });
+}
+
 function validateLicenseOnStartup() {
   try {
     execFileSync('python3', ['-m', 'core.license_cli', 'validate'], {
@@ -216,7 +300,15 @@ app.get('/api/license/status', requireAdmin, async (_req, res) => {
 
 app.post('/api/license/revalidate', requireAdmin, async (_req, res) => {
   try {
-    const payload = await runLicenseCommand('validate');
+    // 'reload' re-reads rotated token files before validating; the warm daemon
+    // otherwise keeps checking the token it started with.
+    const payload = await runLicenseCommand('reload');
+    if (payload.retry_after !== undefined) {
+      // Rejected by admission control (negative cache or rate limit) without re-verifying.
+      res.set('Retry-After', String(Math.max(1, Math.ceil(payload.retry_after))));
+      res.status(429).json(payload);
+      return;
+    }
     res.json(payload);
   } catch (error) {
     console.error('Failed to revalidate license', error);
@@ -224,6 +316,16 @@ app.post('/api/license/revalidate', requireAdmin, async (_req, res) => {
   }
 });
 
+app.get('/api/license/metrics', requireAdmin, async (_req, res) => {
+  try {
+    const payload = await runLicenseCommand('metrics');
+    res.type('text/plain; version=0.0.4').send(payload.metrics || '');
+  } catch (error) {
+    console.error('Failed to load license metrics', error);
+    res.status(500).json({ message: 'Failed to load license metrics' });
+  }
+});
+
 app.get('/api/products', async (req, res) => {
   try {
     const { category, minPrice, maxPrice } = req.query;
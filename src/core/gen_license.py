@@ -4,47 +4,460 @@ from __future__ import annotations
 
 import argparse
 import base64
+import binascii
+import csv
+import hashlib
+import json
+import os
+import struct
+import sys
 import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
 
+IssueRow = Tuple[str, str, str, int]
+
+BULK_FIELDS = ["identifier", "product", "version", "expiry", "token", "human_readable"]
+
+TOKEN_FORMATS = ("v1", "v2")
+
+# Must match the v2 layout parsed by core.license_verifier.
+_V2_VERSION = 2
+_V2_HEADER = struct.Struct("<BIIB")
+_V2_FEATURES = struct.Struct("<QB")
+_V2_QUOTA = struct.Struct("<I")
+_FLAG_ENTITLEMENTS = 0x80
+_MAX_FEATURES = 64
+
+Quotas = Dict[str, int]
+
+# Must match the human form parsed by core.license_verifier.
+_HUMAN_PREFIX = "SSK-"
+_TO_CROCKFORD = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", "0123456789ABCDEFGHJKMNPQRSTVWXYZ")
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
 def b64u(value: bytes) -> str:
     return base64.urlsafe_b64encode(value).decode("utf-8").rstrip("=")
 
 
-def canonical_payload(identifier: str, product: str, version: str, expiry: int) -> bytes:
-    return f"{identifier}|{product}|{version}|{expiry}".encode("utf-8")
+def canonical_payload(
+    identifier: str,
+    product: str,
+    version: str,
+    expiry: int,
+    *,
+    features: int = 0,
+    quotas: Optional[Quotas] = None,
+) -> bytes:
+    text = f"{identifier}|{product}|{version}|{expiry}"
+    if features or quotas:
+        _check_entitlements(features, quotas)
+        text += f"|{features:x}"
+        if quotas:
+            text += ";" + ",".join(f"{name}={value}" for name, value in quotas.items())
+    return text.encode("utf-8")
 
 
-def sign_payload(private_key_path: Path, payload: bytes) -> str:
-    private_key_data = private_key_path.read_bytes()
+def _check_entitlements(features: int, quotas: Optional[Quotas]) -> None:
+    if not 0 <= features < 1 << _MAX_FEATURES:
+        raise ValueError(f"Features must fit in {_MAX_FEATURES} bits")
+    for name, value in (quotas or {}).items():
+        if not name or any(char in name for char in "|;,=") or len(name.encode("utf-8")) > 255:
+            raise ValueError(f"Invalid quota name {name!r}")
+        if not 0 <= value < 1 << 32:
+            raise ValueError(f"Quota {name!r} must be between 0 and {(1 << 32) - 1}")
+    if quotas and len(quotas) > 255:
+        raise ValueError("At most 255 quotas are supported")
+
+
+def parse_features(values: Iterable[str], feature_map: Optional[Dict[str, int]] = None) -> int:
+    """Return the bitset for feature bit numbers or names from ``feature_map``."""
+
+    features = 0
+    for value in values:
+        for item in filter(None, (part.strip() for part in value.split(","))):
+            if item.isdigit():
+                bit = int(item)
+            elif feature_map is not None and item in feature_map:
+                bit = int(feature_map[item])
+            else:
+                raise ValueError(f"Unknown feature {item!r}; pass a bit number or --feature-map")
+            if not 0 <= bit < _MAX_FEATURES:
+                raise ValueError(f"Feature bit {bit} is out of range")
+            features |= 1 << bit
+    return features
+
+
+def parse_quotas(values: Iterable[str]) -> Quotas:
+    """Parse ``NAME=VALUE`` quota arguments."""
+
+    quotas: Quotas = {}
+    for value in values:
+        name, separator, amount = value.partition("=")
+        if not separator or not amount.strip().isdigit():
+            raise ValueError(f"Quota must look like NAME=VALUE, got {value!r}")
+        quotas[name.strip()] = int(amount)
+    return quotas
+
+
+def canonical_payload_v2(
+    identifier: str,
+    product: str,
+    version: str,
+    expiry: int,
+    *,
+    key_id: int = 0,
+    flags: int = 0,
+    features: int = 0,
+    quotas: Optional[Quotas] = None,
+) -> bytes:
+    """Pack a v2 payload: fixed header followed by length-prefixed strings.
+
+    Features and quotas, when given, follow the strings and set the
+    entitlements flag bit.
+    """
+
+    if features or quotas:
+        _check_entitlements(features, quotas)
+        flags |= _FLAG_ENTITLEMENTS
+    parts = [_V2_HEADER.pack(_V2_VERSION, expiry, key_id, flags)]
+    for value in (identifier, product, version):
+        encoded = value.encode("utf-8")
+        if len(encoded) > 255:
+            raise ValueError(f"Field is longer than 255 bytes: {value[:32]!r}...")
+        parts.append(bytes((len(encoded),)))
+        parts.append(encoded)
+    if flags & _FLAG_ENTITLEMENTS:
+        quotas = quotas or {}
+        parts.append(_V2_FEATURES.pack(features, len(quotas)))
+        for name, value in quotas.items():
+            encoded = name.encode("utf-8")
+            parts.append(bytes((len(encoded),)))
+            parts.append(encoded)
+            parts.append(_V2_QUOTA.pack(value))
+    return b"".join(parts)
+
+
+def key_id_for(private_key: Ed25519PrivateKey) -> int:
+    """Return the 32-bit key id embedded in v2 tokens signed by ``private_key``."""
+
+    raw = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw,
+    )
+    return int.from_bytes(hashlib.sha256(raw).digest()[:4], "big")
+
+
+def load_private_key(private_key_data: bytes) -> Ed25519PrivateKey:
     private_key = serialization.load_pem_private_key(private_key_data, password=None)
     assert isinstance(private_key, Ed25519PrivateKey)
+    return private_key
+
+
+def sign_with_key(private_key: Ed25519PrivateKey, payload: bytes) -> str:
     signature = private_key.sign(payload)
     return f"{b64u(payload)}.{b64u(signature)}"
 
 
+def sign_with_key_v2(private_key: Ed25519PrivateKey, payload: bytes) -> str:
+    return b64u(payload + private_key.sign(payload))
+
+
+def issue_token(
+    private_key: Ed25519PrivateKey,
+    row: IssueRow,
+    *,
+    token_format: str = "v1",
+    key_id: int = 0,
+    features: int = 0,
+    quotas: Optional[Quotas] = None,
+) -> str:
+    """Sign ``(identifier, product, version, expiry)`` in the requested format."""
+
+    if token_format == "v2":
+        return sign_with_key_v2(
+            private_key, canonical_payload_v2(*row, key_id=key_id, features=features, quotas=quotas)
+        )
+    return sign_with_key(private_key, canonical_payload(*row, features=features, quotas=quotas))
+
+
+def sign_payload(private_key_path: Path, payload: bytes) -> str:
+    private_key = load_private_key(private_key_path.read_bytes())
+    return sign_with_key(private_key, payload)
+
+
 def human_readable(token: str) -> str:
-    encoded = base64.b32encode(token.encode("utf-8")).decode("utf-8").rstrip("=")
+    """Return ``token`` as grouped Crockford Base32 followed by check symbols."""
+
+    if "." in token:
+        data = token.encode("utf-8")
+    else:
+        # v2 tokens are a single binary blob; group its bytes, not its Base64 text.
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    encoded = base64.b32encode(data).decode("utf-8").rstrip("=").translate(_TO_CROCKFORD)
     groups = [encoded[i : i + 5] for i in range(0, len(encoded), 5)]
-    return "-".join(groups)
+    # Low 20 bits of CRC-32 catch typos and transpositions before any signature work.
+    check = binascii.crc32(data) & 0xFFFFF
+    groups.append("".join(_CROCKFORD[(check >> shift) & 31] for shift in (15, 10, 5, 0)))
+    return _HUMAN_PREFIX + "-".join(groups)
+
+
+# Bulk issuance ------------------------------------------------------
+
+_WORKER_KEY: Optional[Ed25519PrivateKey] = None
+_WORKER_FORMAT = "v1"
+_WORKER_KEY_ID = 0
+
+
+def _init_worker(private_key_data: bytes, token_format: str = "v1") -> None:
+    global _WORKER_KEY, _WORKER_FORMAT, _WORKER_KEY_ID
+    _WORKER_KEY = load_private_key(private_key_data)
+    _WORKER_FORMAT = token_format
+    _WORKER_KEY_ID = key_id_for(_WORKER_KEY)
+
+
+def _sign_chunk(rows: List[IssueRow]) -> List[Tuple[str, str]]:
+    assert _WORKER_KEY is not None
+    signed = []
+    for row in rows:
+        token = issue_token(_WORKER_KEY, row, token_format=_WORKER_FORMAT, key_id=_WORKER_KEY_ID)
+        signed.append((token, human_readable(token)))
+    return signed
+
+
+def read_rows(
+    stream: IO[str],
+    input_format: str,
+    *,
+    product: str,
+    version: str,
+    days: int,
+    now: Optional[int] = None,
+) -> Iterator[IssueRow]:
+    """Yield ``(identifier, product, version, expiry)`` rows from CSV or JSONL.
+
+    Only ``identifier`` (or ``id``) is required per row; missing ``product``,
+    ``version`` and ``days`` fall back to the supplied defaults.
+    """
+
+    issued_at = int(time.time()) if now is None else now
+    if input_format == "csv":
+        records: Iterable[Dict[str, Any]] = csv.DictReader(stream)
+    else:
+        records = (json.loads(line) for line in stream if line.strip())
+
+    for record in records:
+        identifier = record.get("identifier") or record.get("id")
+        if not identifier:
+            raise ValueError(f"Row is missing an identifier: {record!r}")
+        raw_days = record.get("days")
+        # CSV leaves absent cells as "", while JSON ``0`` is a real value.
+        row_days = days if raw_days is None or raw_days == "" else int(raw_days)
+        yield (
+            str(identifier),
+            str(record.get("product") or product),
+            str(record.get("version") or version),
+            issued_at + row_days * 24 * 3600,
+        )
+
+
+def issue_bulk(
+    rows: Iterable[IssueRow],
+    private_key_data: bytes,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+    token_format: str = "v1",
+) -> Iterator[Dict[str, Any]]:
+    """Sign ``rows`` across a process pool and yield records in input order.
+
+    Each worker parses the private key once. Only a bounded number of chunks
+    are in flight, so ``rows`` may be read lazily from a large file.
+    """
+
+    workers = workers or os.cpu_count() or 1
+
+    def chunks() -> Iterator[List[IssueRow]]:
+        chunk: List[IssueRow] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def records(chunk: List[IssueRow], signed: List[Tuple[str, str]]) -> Iterator[Dict[str, Any]]:
+        for (identifier, product, version, expiry), (token, friendly) in zip(chunk, signed):
+            yield dict(zip(BULK_FIELDS, (identifier, product, version, expiry, token, friendly)))
+
+    if workers == 1:
+        _init_worker(private_key_data, token_format)
+        for chunk in chunks():
+            yield from records(chunk, _sign_chunk(chunk))
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(private_key_data, token_format),
+    ) as pool:
+        pending: Deque[Tuple[List[IssueRow], Future[List[Tuple[str, str]]]]] = deque()
+        for chunk in chunks():
+            pending.append((chunk, pool.submit(_sign_chunk, chunk)))
+            if len(pending) >= workers * 2:
+                done_chunk, future = pending.popleft()
+                yield from records(done_chunk, future.result())
+        while pending:
+            done_chunk, future = pending.popleft()
+            yield from records(done_chunk, future.result())
+
+
+def write_records(records: Iterable[Dict[str, Any]], out: IO[str], output_format: str) -> int:
+    """Write issued ``records`` as JSONL or CSV and return how many were written."""
+
+    count = 0
+    if output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=BULK_FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    else:
+        for record in records:
+            out.write(json.dumps(record) + "\n")
+            count += 1
+    out.flush()
+    return count
+
+
+def _detect_format(path: str, explicit: Optional[str]) -> str:
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def _open_registry(path: str) -> Any:
+    from core.license_registry import LicenseRegistry
+
+    return LicenseRegistry(path)
+
+
+def _run_bulk(args: argparse.Namespace) -> None:
+    private_key_data = Path(args.priv).read_bytes()
+    input_format = _detect_format(args.bulk, args.input_format)
+    output_path = args.output or "-"
+    output_format = _detect_format(output_path, args.output_format)
+
+    source = sys.stdin if args.bulk == "-" else open(args.bulk, encoding="utf-8", newline="")
+    sink = sys.stdout if output_path == "-" else open(output_path, "w", encoding="utf-8", newline="")
+    registry = _open_registry(args.registry) if args.registry else None
+    started = time.perf_counter()
+    try:
+        rows = read_rows(
+            source,
+            input_format,
+            product=args.product,
+            version=args.version,
+            days=args.days,
+        )
+        records = issue_bulk(
+            rows,
+            private_key_data,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            token_format=args.token_format,
+        )
+        if registry is not None:
+            key_id = key_id_for(load_private_key(private_key_data))
+            records = registry.record_stream(records, key_id=key_id)
+        count = write_records(records, sink, output_format)
+    finally:
+        if registry is not None:
+            registry.close()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"Issued {count} tokens in {elapsed:.2f}s ({rate:,.0f} tokens/s)", file=sys.stderr)
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate a signed license token")
     parser.add_argument("--priv", default="license_private.pem", help="Path to the private PEM file")
-    parser.add_argument("--id", required=True, help="License identifier (user or device)")
+    parser.add_argument("--id", help="License identifier (user or device)")
     parser.add_argument("--product", default="ShopSaavy", help="Product identifier")
     parser.add_argument("--version", default="1.0.0", help="Product version")
     parser.add_argument("--days", type=int, default=365, help="Days until expiry")
+    parser.add_argument(
+        "--token-format",
+        choices=TOKEN_FORMATS,
+        default="v1",
+        help="v1 (pipe-delimited text) or v2 (compact binary, shorter human form)",
+    )
+    parser.add_argument(
+        "--feature",
+        action="append",
+        default=[],
+        help="Grant a feature by bit number or --feature-map name (repeatable, comma-separated)",
+    )
+    parser.add_argument("--feature-map", help="JSON file mapping feature names to bit numbers")
+    parser.add_argument("--quota", action="append", default=[], help="Sign a NAME=VALUE quota (repeatable)")
+    parser.add_argument("--bulk", help="CSV or JSONL file of rows to issue ('-' for stdin)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="Bulk input format (default: by suffix)")
+    parser.add_argument("--output", help="Bulk output file (default: stdout)")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="Bulk output format (default: by suffix)")
+    parser.add_argument("--workers", type=int, default=None, help="Signing processes for bulk mode")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per worker task in bulk mode")
+    parser.add_argument(
+        "--registry",
+        default=os.getenv("LICENSE_REGISTRY_PATH"),
+        help="Record issued tokens in this SQLite registry (default: $LICENSE_REGISTRY_PATH)",
+    )
     args = parser.parse_args()
 
+    if args.bulk:
+        if args.feature or args.quota:
+            parser.error("--feature and --quota only apply to single tokens")
+        _run_bulk(args)
+        return
+    if not args.id:
+        parser.error("--id is required unless --bulk is given")
+
+    feature_map = json.loads(Path(args.feature_map).read_text(encoding="utf-8")) if args.feature_map else None
+    try:
+        features = parse_features(args.feature, feature_map)
+        quotas = parse_quotas(args.quota)
+    except ValueError as exc:
+        parser.error(str(exc))
+
     expiry = int(time.time()) + args.days * 24 * 3600
-    payload = canonical_payload(args.id, args.product, args.version, expiry)
-    token = sign_payload(Path(args.priv), payload)
+    private_key = load_private_key(Path(args.priv).read_bytes())
+    key_id = key_id_for(private_key)
+    token = issue_token(
+        private_key,
+        (args.id, args.product, args.version, expiry),
+        token_format=args.token_format,
+        key_id=key_id,
+        features=features,
+        quotas=quotas,
+    )
+    if args.registry:
+        registry = _open_registry(args.registry)
+        try:
+            registry.record(token, key_id=key_id)
+        finally:
+            registry.close()
 
     print("RAW TOKEN:")
     print(token)
@@ -0,0 +1,172 @@
+"""Admission control for license validation.
+
+Repeatedly validating the same bad token should not cost a signature check
+each time. :class:`NegativeCache` remembers failures for deterministic reasons
+(a tampered, expired or mismatched token stays bad) and backs off
+exponentially while the same failure repeats. :class:`TokenBucket` caps how
+many validations actually reach the crypto. Both answer a rejected call with
+how long to wait before retrying.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, FrozenSet, NamedTuple, Optional
+
+from .license_verifier import (
+    REASON_CHECKSUM,
+    REASON_EXPIRED,
+    REASON_MALFORMED,
+    REASON_PRODUCT_MISMATCH,
+    REASON_REVOKED,
+    REASON_SIGNATURE,
+    REASON_VERSION_MISMATCH,
+)
+
+REASON_RATE_LIMITED = "rate_limited"
+
+# Failures that only a different token (or key/configuration, which changes
+# the cache key) can fix. I/O and missing-key errors are never cached.
+CACHEABLE_REASONS: FrozenSet[str] = frozenset(
+    {
+        REASON_CHECKSUM,
+        REASON_EXPIRED,
+        REASON_MALFORMED,
+        REASON_PRODUCT_MISMATCH,
+        REASON_REVOKED,
+        REASON_SIGNATURE,
+        REASON_VERSION_MISMATCH,
+    }
+)
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, holding at most ``burst``."""
+
+    def __init__(self, rate: float, burst: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` and return 0, or return the seconds until they are available."""
+
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+
+class CachedFailure(NamedTuple):
+    """A remembered validation failure."""
+
+    reason: str
+    message: str
+    failures: int
+    retry_at: float
+
+
+class NegativeCache:
+    """Bounded LRU of recent validation failures with exponential backoff.
+
+    Keys identify the token together with everything that decides its outcome
+    (the manager uses its snapshot binding). A repeat of the same failure
+    doubles the backoff, from ``base_delay`` up to ``max_delay`` seconds; a
+    different reason starts again from ``base_delay``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        *,
+        base_delay: float = 1.0,
+        max_delay: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+        self._entries: "OrderedDict[bytes, CachedFailure]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: bytes) -> Optional[CachedFailure]:
+        """Return the failure for ``key`` while its backoff is still running."""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.retry_at <= self.clock():
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def record_failure(self, key: bytes, reason: str, message: str) -> float:
+        """Remember a failure and return its backoff in seconds (0 if not cacheable)."""
+
+        if reason not in CACHEABLE_REASONS:
+            return 0.0
+        with self._lock:
+            previous = self._entries.get(key)
+            failures = previous.failures + 1 if previous is not None and previous.reason == reason else 1
+            delay = min(self.max_delay, self.base_delay * 2 ** (failures - 1))
+            self._entries[key] = CachedFailure(reason, message, failures, self.clock() + delay)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return delay
+
+    def forget(self, key: bytes) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class AdmissionControl:
+    """Negative cache plus rate limit consulted before each validation."""
+
+    def __init__(
+        self,
+        *,
+        rate: Optional[float] = 5.0,
+        burst: float = 10.0,
+        negative_cache: Optional[NegativeCache] = None,
+    ) -> None:
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.negative_cache = negative_cache if negative_cache is not None else NegativeCache()
+
+    @classmethod
+    def from_env(cls) -> "AdmissionControl":
+        """Build from ``LICENSE_VALIDATE_RATE`` (per second, 0 disables) and ``LICENSE_VALIDATE_BURST``."""
+
+        return cls(
+            rate=float(os.getenv("LICENSE_VALIDATE_RATE", "5")),
+            burst=float(os.getenv("LICENSE_VALIDATE_BURST", "10")),
+        )
+
+
+__all__ = [
+    "AdmissionControl",
+    "CACHEABLE_REASONS",
+    "CachedFailure",
+    "NegativeCache",
+    "REASON_RATE_LIMITED",
+    "TokenBucket",
+]
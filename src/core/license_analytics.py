@@ -0,0 +1,347 @@
+"""Columnar analytics over large sets of license tokens.
+
+:func:`load_columns` decodes tokens straight into NumPy columns instead of
+keeping one :class:`LicensePayload` per token: expiry as ``int64``, product and
+version as ``int32`` codes into small lookup lists, and identifiers as one
+UTF-8 byte buffer with ``int64`` offsets. Queries on :class:`LicenseColumns`
+are vectorized, so counting or grouping millions of licenses takes
+milliseconds once the columns are built.
+
+NumPy is an optional dependency, imported when columns are first built.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
+
+from .license_verifier import (
+    REASON_MALFORMED,
+    LicensePayload,
+    LicenseVerificationError,
+    TokenSource,
+    _b64u_decode_or_none,
+    _split_v2,
+    decode_token,
+    normalize_token,
+    verify_many,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import numpy as np
+
+DAY = 86400
+GROUP_BY = ("product", "version", "product_version")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as exc:  # pragma: no cover - depends on the environment
+        raise RuntimeError("License analytics require NumPy; install it with 'pip install numpy'.") from exc
+    return numpy
+
+
+def _decode_unverified(token: str) -> LicensePayload:
+    # Raw v2 tokens are parsed once here; normalize_token would parse them twice.
+    token = token.strip()
+    if "." not in token:
+        blob = _b64u_decode_or_none(token)
+        parts = _split_v2(blob) if blob else None
+        if parts is not None:
+            return parts[0]
+    return decode_token(normalize_token(token))[0]
+
+
+class _Codes:
+    """Assign dense integer codes to repeated strings."""
+
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class LicenseColumns:
+    """Decoded license fields stored column-wise."""
+
+    def __init__(
+        self,
+        expiry: np.ndarray,
+        product_codes: np.ndarray,
+        products: List[str],
+        version_codes: np.ndarray,
+        versions: List[str],
+        identifier_data: np.ndarray,
+        identifier_offsets: np.ndarray,
+        key_ids: np.ndarray,
+        rejected: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.expiry = expiry
+        self.product_codes = product_codes
+        self.products = products
+        self.version_codes = version_codes
+        self.versions = versions
+        self.identifier_data = identifier_data
+        self.identifier_offsets = identifier_offsets
+        self.key_ids = key_ids
+        self.rejected = dict(rejected or {})
+
+    def __len__(self) -> int:
+        return len(self.expiry)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays."""
+
+        return sum(
+            column.nbytes
+            for column in (
+                self.expiry,
+                self.product_codes,
+                self.version_codes,
+                self.identifier_data,
+                self.identifier_offsets,
+                self.key_ids,
+            )
+        )
+
+    def identifier(self, index: int) -> str:
+        start, end = self.identifier_offsets[index], self.identifier_offsets[index + 1]
+        return self.identifier_data[start:end].tobytes().decode("utf-8")
+
+    def payload(self, index: int) -> LicensePayload:
+        return LicensePayload(
+            self.identifier(index),
+            self.products[self.product_codes[index]],
+            self.versions[self.version_codes[index]],
+            int(self.expiry[index]),
+            int(self.key_ids[index]),
+        )
+
+    # Masks -----------------------------------------------------------
+
+    def expiring_mask(self, days: float, *, now: Optional[float] = None) -> np.ndarray:
+        """Select unexpired licenses whose expiry is within ``days`` of ``now``."""
+
+        now = int(time.time() if now is None else now)
+        return (self.expiry >= now) & (self.expiry < now + int(days * DAY))
+
+    def expired_mask(self, *, now: Optional[float] = None) -> np.ndarray:
+        return self.expiry < int(time.time() if now is None else now)
+
+    def product_mask(self, product: str) -> np.ndarray:
+        if product not in self.products:
+            return _numpy().zeros(len(self), dtype=bool)
+        return self.product_codes == self.products.index(product)
+
+    def identifier_prefix_mask(self, prefix: str) -> np.ndarray:
+        """Select licenses whose identifier starts with ``prefix``."""
+
+        np = _numpy()
+        encoded = prefix.encode("utf-8")
+        starts = self.identifier_offsets[:-1]
+        mask = (self.identifier_offsets[1:] - starts) >= len(encoded)
+        for position, byte in enumerate(encoded):
+            candidates = np.flatnonzero(mask)
+            if not len(candidates):
+                break
+            mask[candidates] = self.identifier_data[starts[candidates] + position] == byte
+        return mask
+
+    def select(self, mask: np.ndarray) -> "LicenseColumns":
+        """Return the rows where ``mask`` is true as new columns."""
+
+        np = _numpy()
+        rows = np.flatnonzero(mask)
+        starts = self.identifier_offsets[:-1][rows]
+        lengths = self.identifier_offsets[1:][rows] - starts
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Byte positions of every selected identifier, gathered in one step.
+        gather = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1], dtype=np.int64)
+        return LicenseColumns(
+            self.expiry[rows],
+            self.product_codes[rows],
+            self.products,
+            self.version_codes[rows],
+            self.versions,
+            self.identifier_data[gather],
+            offsets,
+            self.key_ids[rows],
+        )
+
+    # Aggregates ------------------------------------------------------
+
+    def count_expiring_within(self, days: float, *, now: Optional[float] = None) -> int:
+        return int(self.expiring_mask(days, now=now).sum())
+
+    def histogram(self, by: str = "product", mask: Optional[np.ndarray] = None) -> Dict[Any, int]:
+        """Count licenses per product, version or ``(product, version)`` pair."""
+
+        np = _numpy()
+        if by not in GROUP_BY:
+            raise ValueError(f"Unknown grouping {by!r}; expected one of {', '.join(GROUP_BY)}")
+        products, versions = self.product_codes, self.version_codes
+        if mask is not None:
+            products, versions = products[mask], versions[mask]
+        if by == "product":
+            counts = np.bincount(products, minlength=len(self.products))
+            return {self.products[code]: int(n) for code, n in enumerate(counts) if n}
+        if by == "version":
+            counts = np.bincount(versions, minlength=len(self.versions))
+            return {self.versions[code]: int(n) for code, n in enumerate(counts) if n}
+        width = max(1, len(self.versions))
+        counts = np.bincount(products.astype(np.int64) * width + versions, minlength=len(self.products) * width)
+        return {
+            (self.products[code // width], self.versions[code % width]): int(counts[code])
+            for code in np.flatnonzero(counts)
+        }
+
+    def expiry_forecast(
+        self,
+        *,
+        period_days: float = 30,
+        periods: int = 12,
+        now: Optional[float] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> List[int]:
+        """Count licenses expiring in each of ``periods`` consecutive periods from ``now``."""
+
+        np = _numpy()
+        now = int(time.time() if now is None else now)
+        width = int(period_days * DAY)
+        expiry = self.expiry if mask is None else self.expiry[mask]
+        upcoming = expiry[(expiry >= now) & (expiry < now + width * periods)]
+        return np.bincount((upcoming - now) // width, minlength=periods).tolist()
+
+
+def load_columns(
+    tokens: Iterable[str],
+    public_key: Optional[TokenSource] = None,
+    *,
+    verify: bool = True,
+    max_workers: Optional[int] = None,
+) -> LicenseColumns:
+    """Decode ``tokens`` into :class:`LicenseColumns`.
+
+    With ``verify`` (the default) every signature is checked against
+    ``public_key`` and failing tokens are counted in ``rejected`` by reason.
+    Pass ``verify=False`` for tokens from a trusted source, such as the
+    issuer's own output, to only decode them. Expired tokens are kept either
+    way; they are what the expiry queries are for.
+    """
+
+    np = _numpy()
+    if verify and public_key is None:
+        raise ValueError("public_key is required unless verify=False")
+
+    expiry = array("q")
+    product_codes = array("i")
+    version_codes = array("i")
+    key_ids = array("I")
+    offsets = array("q", [0])
+    identifiers = bytearray()
+    products, versions = _Codes(), _Codes()
+    rejected: Dict[str, int] = {}
+
+    def append(payload: LicensePayload) -> None:
+        expiry.append(payload.expiry)
+        product_codes.append(products.code(payload.product))
+        version_codes.append(versions.code(payload.version))
+        key_ids.append(payload.key_id)
+        identifiers.extend(payload.identifier.encode("utf-8"))
+        offsets.append(len(identifiers))
+
+    if verify:
+        for result in verify_many(tokens, public_key, check_expiry=False, max_workers=max_workers):
+            if result.payload is None or not result.valid:
+                rejected[result.reason] = rejected.get(result.reason, 0) + 1
+                continue
+            append(result.payload)
+    else:
+        for token in tokens:
+            try:
+                payload = _decode_unverified(token)
+            except (LicenseVerificationError, ValueError):
+                rejected[REASON_MALFORMED] = rejected.get(REASON_MALFORMED, 0) + 1
+                continue
+            append(payload)
+
+    return LicenseColumns(
+        np.frombuffer(expiry, dtype=np.int64),
+        np.frombuffer(product_codes, dtype=np.int32),
+        products.values,
+        np.frombuffer(version_codes, dtype=np.int32),
+        versions.values,
+        np.frombuffer(bytes(identifiers), dtype=np.uint8),
+        np.frombuffer(offsets, dtype=np.int64),
+        np.frombuffer(key_ids, dtype=np.uint32),
+        rejected,
+    )
+
+
+def summarize(
+    columns: LicenseColumns,
+    *,
+    days: float = 30,
+    by: str = "product",
+    prefix: Optional[str] = None,
+    now: Optional[float] = None,
+) -> Dict[str, Union[int, Dict[Any, int], List[int]]]:
+    """Return the renewal report printed by the command line tool."""
+
+    if prefix:
+        columns = columns.select(columns.identifier_prefix_mask(prefix))
+    expiring = columns.expiring_mask(days, now=now)
+    return {
+        "total": len(columns),
+        "expired": int(columns.expired_mask(now=now).sum()),
+        "expiring": int(expiring.sum()),
+        "expiring_by": {str(key): count for key, count in columns.histogram(by, expiring).items()},
+        "by": {str(key): count for key, count in columns.histogram(by).items()},
+        "forecast": columns.expiry_forecast(period_days=days, now=now),
+        "rejected": columns.rejected,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .license_registry import _tokens_from_lines
+
+    parser = argparse.ArgumentParser(description="Summarize expiries across a set of license tokens")
+    parser.add_argument("source", help="File of tokens or gen_license JSONL ('-' for stdin)")
+    parser.add_argument("--public-key", help="Verify signatures with this key (default: decode only)")
+    parser.add_argument("--days", type=float, default=30, help="Expiry window and forecast period in days")
+    parser.add_argument("--by", choices=GROUP_BY, default="product", help="Grouping for histograms")
+    parser.add_argument("--prefix", help="Only identifiers starting with this text")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.source == "-" else open(args.source, encoding="utf-8")
+    try:
+        columns = load_columns(
+            _tokens_from_lines(source),
+            args.public_key,
+            verify=args.public_key is not None,
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(json.dumps(summarize(columns, days=args.days, by=args.by, prefix=args.prefix), indent=2))
+    return 0
+
+
+__all__ = ["GROUP_BY", "LicenseColumns", "load_columns", "summarize"]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""asyncio front-end for :class:`LicenseManager`."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .license_manager import LicenseManager
+
+T = TypeVar("T")
+
+
+class AsyncLicenseManager:
+    """Run license work in an executor so the event loop never blocks.
+
+    Constructing the wrapped :class:`LicenseManager` (keyring and token file
+    probes), validation (signature check and log write) and status reads all
+    happen in ``executor`` (the loop's default when ``None``). Concurrent
+    ``validate_license()`` awaiters share one in-flight validation.
+    """
+
+    def __init__(
+        self,
+        license_token: Optional[str] = None,
+        *,
+        executor: Optional[Executor] = None,
+        manager_factory: Callable[..., LicenseManager] = LicenseManager,
+        **manager_kwargs: Any,
+    ) -> None:
+        self._factory = functools.partial(manager_factory, license_token, **manager_kwargs)
+        self._executor = executor
+        self._manager: Optional[LicenseManager] = None
+        self._manager_task: Optional[asyncio.Future[LicenseManager]] = None
+        self._validation: Optional[asyncio.Future[bool]] = None
+
+    @property
+    def manager(self) -> Optional[LicenseManager]:
+        """Return the wrapped manager once it has been created."""
+
+        return self._manager
+
+    async def get_manager(self) -> LicenseManager:
+        """Create the wrapped manager off the loop on first use."""
+
+        if self._manager is not None:
+            return self._manager
+        if self._manager_task is None:
+            self._manager_task = asyncio.ensure_future(self._run(self._factory))
+        task = self._manager_task
+        try:
+            self._manager = await asyncio.shield(task)
+        except Exception:
+            if self._manager_task is task:
+                self._manager_task = None
+            raise
+        return self._manager
+
+    async def validate_license(self) -> bool:
+        """Validate the license, joining any validation already in flight."""
+
+        if self._validation is None:
+            self._validation = asyncio.ensure_future(self._validate())
+            self._validation.add_done_callback(self._validation_done)
+        return await asyncio.shield(self._validation)
+
+    async def get_license_status(self) -> Dict[str, Any]:
+        """Return the last known license validation status."""
+
+        manager = await self.get_manager()
+        return await self._run(manager.get_license_status)
+
+    # Internal helpers ----------------------------------------------
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _validate(self) -> bool:
+        manager = await self.get_manager()
+        return await self._run(manager.validate_license)
+
+    def _validation_done(self, task: asyncio.Future[bool]) -> None:
+        if self._validation is task:
+            self._validation = None
+        # Mark the outcome as retrieved even if every awaiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+
+__all__ = ["AsyncLicenseManager"]
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
 
 from .license_manager import LicenseManager, LicenseValidationError
 
@@ -13,32 +16,131 @@ def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="License manager utility")
     parser.add_argument(
         "command",
-        choices=["status", "validate"],
+        choices=["status", "validate", "serve", "metrics"],
         help="Action to perform",
     )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Unix domain socket path for 'serve' (defaults to stdio)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print import-time and cProfile breakdowns to stderr",
+    )
     return parser
 
 
+def status_response(manager: LicenseManager) -> Dict[str, Any]:
+    """Return the payload printed by the ``status`` command."""
+
+    return {"status": manager.get_license_status()}
+
+
+def validate_response(manager: LicenseManager, *, reload: bool = False) -> Tuple[int, Dict[str, Any]]:
+    """Validate the license and return the exit code and printed payload.
+
+    With ``reload`` the token and public key are re-read from their sources
+    first (see :meth:`LicenseManager.reload_credentials`).
+    """
+
+    try:
+        if reload:
+            manager.reload_credentials()
+        else:
+            manager.validate_license()
+    except LicenseValidationError as exc:
+        payload: Dict[str, Any] = {"valid": False, "error": str(exc), "status": manager.get_license_status()}
+        if exc.retry_after is not None:
+            payload["retry_after"] = round(exc.retry_after, 3)
+        return 1, payload
+    return 0, {"valid": True, "status": manager.get_license_status()}
+
+
+def import_times(limit: int = 15) -> List[Tuple[str, int, int]]:
+    """Return ``(module, self_us, cumulative_us)`` for the slowest CLI imports.
+
+    A fresh interpreter is started with ``-X importtime`` because modules
+    already loaded in this process cannot be timed again.
+    """
+
+    import subprocess
+
+    env = dict(os.environ)
+    package_root = str(Path(__file__).resolve().parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import core.license_cli"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if self_us.isdigit():
+            rows.append((name, int(self_us), int(cumulative_us)))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:limit]
+
+
+def _profile(args: argparse.Namespace) -> int:
+    import cProfile
+    import pstats
+
+    print("Import time (cumulative us / self us / module):", file=sys.stderr)
+    for name, self_us, cumulative_us in import_times():
+        print(f"{cumulative_us:>10} {self_us:>10}  {name}", file=sys.stderr)
+    print(file=sys.stderr)
+
+    profiler = cProfile.Profile()
+    code = profiler.runcall(_run, args)
+    pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+    return code
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.profile:
+        return _profile(args)
+    return _run(args)
+
+
+def _run(args: argparse.Namespace) -> int:
+    if args.command == "serve":
+        from .license_daemon import LicenseDaemon
+
+        daemon = LicenseDaemon()
+        if args.socket:
+            daemon.serve_unix(args.socket)
+        else:
+            daemon.serve_stdio(sys.stdin, sys.stdout)
+        return 0
+
+    if args.command == "metrics":
+        from .license_metrics import enable_metrics, render_metrics
+
+        # A one-off process has no history of its own; ``serve`` accumulates.
+        # Only the status snapshot is read, so nothing is verified or written.
+        enable_metrics()
+        LicenseManager().get_license_status()
+        sys.stdout.write(render_metrics())
+        return 0
+
     manager = LicenseManager()
 
     if args.command == "status":
-        status = manager.get_license_status()
-        print(json.dumps({"status": status}, default=str))
+        print(json.dumps(status_response(manager), default=str))
         return 0
 
-    try:
-        manager.validate_license()
-    except LicenseValidationError as exc:
-        payload = {"valid": False, "error": str(exc), "status": manager.get_license_status()}
-        print(json.dumps(payload, default=str))
-        return 1
-
-    status = manager.get_license_status()
-    print(json.dumps({"valid": True, "status": status}, default=str))
-    return 0
+    code, payload = validate_response(manager)
+    print(json.dumps(payload, default=str))
+    return code
 
 
 if __name__ == "__main__":  # pragma: no cover
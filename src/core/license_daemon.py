@@ -0,0 +1,135 @@
+"""Long-lived license service answering newline-delimited JSON commands."""
+
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+from pathlib import Path
+from typing import Any, Callable, Dict, IO, Optional
+
+from .license_admission import AdmissionControl
+from .license_cli import status_response, validate_response
+from .license_manager import LicenseManager
+from .license_metrics import enable_metrics, render_metrics
+
+
+class LicenseDaemon:
+    """Keep one warm :class:`LicenseManager` and serve commands against it.
+
+    Each request is a single JSON object per line, for example
+    ``{"command": "status", "id": 7}``. Replies reuse the JSON shapes printed by
+    ``license_cli`` and echo ``id`` when the request carried one. Metrics are
+    collected for the daemon's lifetime; ``{"command": "metrics"}`` returns
+    them as Prometheus text under the ``metrics`` key.
+    ``reload`` re-reads the token and public key from their sources (token
+    files may have been rotated) and validates them, replying like ``validate``
+    plus ``"reloaded": true``.
+
+    ``validate`` goes through admission control (see
+    :mod:`core.license_admission`): a token that just failed is answered from
+    the negative cache and excess calls are rate limited, both with a
+    ``retry_after`` hint in seconds.
+    """
+
+    def __init__(
+        self,
+        manager_factory: Callable[[], LicenseManager] = LicenseManager,
+        *,
+        admission: Optional[AdmissionControl] = None,
+    ) -> None:
+        enable_metrics()
+        self._manager_factory = manager_factory
+        self.admission = admission if admission is not None else AdmissionControl.from_env()
+        self.manager = self._create_manager()
+
+    def _create_manager(self) -> LicenseManager:
+        manager = self._manager_factory()
+        manager.admission = self.admission
+        return manager
+
+    # Command handling ------------------------------------------------
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a decoded request and return its reply."""
+
+        command = request.get("command")
+        # The manager is thread-safe, so commands run concurrently.
+        if command == "status":
+            reply = status_response(self.manager)
+        elif command == "validate":
+            _, reply = validate_response(self.manager)
+        elif command == "metrics":
+            reply = {"metrics": render_metrics()}
+        elif command == "reload":
+            # Token files may have been rotated since the manager was created.
+            _, reply = validate_response(self.manager, reload=True)
+            reply = {"reloaded": True, **reply}
+        else:
+            reply = {"error": f"Unknown command: {command!r}"}
+
+        if "id" in request:
+            reply = {"id": request["id"], **reply}
+        return reply
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """Decode one request line and return the encoded reply line."""
+
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return json.dumps({"error": "Malformed request."})
+        if not isinstance(request, dict):
+            return json.dumps({"error": "Malformed request."})
+        return json.dumps(self.handle(request), default=str)
+
+    # Transports ------------------------------------------------------
+
+    def serve_stdio(self, stdin: IO[str], stdout: IO[str]) -> None:
+        """Answer requests from ``stdin`` until it is closed."""
+
+        for line in stdin:
+            reply = self.handle_line(line)
+            if reply is None:
+                continue
+            stdout.write(reply + "\n")
+            stdout.flush()
+
+    def create_unix_server(self, socket_path: os.PathLike[str] | str) -> socketserver.BaseServer:
+        """Bind a threaded Unix socket server without starting it."""
+
+        path = Path(socket_path)
+        if path.exists():
+            path.unlink()
+        daemon = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for raw in self.rfile:
+                    reply = daemon.handle_line(raw.decode("utf-8", errors="replace"))
+                    if reply is None:
+                        continue
+                    self.wfile.write(reply.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+        server = socketserver.ThreadingUnixStreamServer(str(path), _Handler)
+        server.daemon_threads = True
+        return server
+
+    def serve_unix(self, socket_path: os.PathLike[str] | str) -> None:
+        """Serve requests over a Unix domain socket until interrupted."""
+
+        server = self.create_unix_server(socket_path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:  # pragma: no cover - interactive shutdown
+            pass
+        finally:
+            server.server_close()
+            Path(socket_path).unlink(missing_ok=True)
+
+
+__all__ = ["LicenseDaemon"]
@@ -0,0 +1,138 @@
+"""Feature gates that read the cached license result.
+
+Tokens may carry a signed feature bitset and quotas (see
+``gen_license --feature/--quota``). Once a :class:`LicenseManager` has
+validated, :func:`requires_license` checks them with a bit test and an expiry
+comparison; no signature work happens per call.
+
+    define_features({"reports": 0, "multi_store": 1})
+
+    @requires_license(feature="reports")
+    def export_report(...):
+        ...
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+import weakref
+from typing import Any, Callable, Iterable, Optional, TypeVar, Union
+
+from .license_manager import LicenseManager, LicenseValidationError
+from .license_verifier import feature_mask
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+REASON_UNLICENSED = "unlicensed"
+REASON_FEATURE = "feature"
+
+Feature = Union[str, int]
+
+_default_manager: Optional[LicenseManager] = None
+_default_lock = threading.Lock()
+# Managers the gate has validated on demand; each is validated at most once.
+_attempted: "weakref.WeakSet[LicenseManager]" = weakref.WeakSet()
+
+
+def set_default_manager(manager: Optional[LicenseManager]) -> None:
+    """Use ``manager`` for gates declared without one."""
+
+    global _default_manager
+    _default_manager = manager
+
+
+def get_default_manager() -> LicenseManager:
+    """Return the default manager, creating one from the environment if needed."""
+
+    global _default_manager
+    manager = _default_manager
+    if manager is None:
+        with _default_lock:
+            if _default_manager is None:
+                _default_manager = LicenseManager()
+            manager = _default_manager
+    return manager
+
+
+def check_license(mask: int = 0, manager: Optional[LicenseManager] = None) -> None:
+    """Raise :class:`LicenseValidationError` unless the license grants ``mask``."""
+
+    manager = manager or get_default_manager()
+    if not manager.has_features(mask):
+        _deny(manager, mask)
+
+
+def _deny(manager: LicenseManager, mask: int) -> None:
+    status = manager.get_license_status()
+    if not status["valid"] and "validated_at" not in status and manager not in _attempted:
+        # Nothing validated this manager yet: do it once, surfacing its reason.
+        _attempted.add(manager)
+        manager.validate_license()
+        if manager.has_features(mask):
+            return
+        status = manager.get_license_status()
+    if not status["valid"]:
+        raise LicenseValidationError(status.get("message") or "No valid license.", REASON_UNLICENSED)
+    raise LicenseValidationError("The license does not include this feature.", REASON_FEATURE)
+
+
+def requires_license(
+    feature: Union[Feature, Iterable[Feature], None] = None,
+    *,
+    manager: Optional[LicenseManager] = None,
+) -> Callable[[F], F]:
+    """Decorate a function so that it only runs under a valid license.
+
+    ``feature`` is a feature name, bit number or several of them; all must be
+    granted. Names are resolved to a mask on the first call, so
+    :func:`~core.license_verifier.define_features` may run after import.
+    Works for plain and ``async`` functions.
+    """
+
+    if feature is None:
+        features: tuple = ()
+    elif isinstance(feature, (str, int)):
+        features = (feature,)
+    else:
+        features = tuple(feature)
+
+    def decorate(func: F) -> F:
+        mask: Optional[int] = None
+
+        def check() -> None:
+            nonlocal mask
+            if mask is None:
+                mask = feature_mask(*features)
+            target = manager or get_default_manager()
+            if not target.has_features(mask):
+                _deny(target, mask)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                check()
+                return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            check()
+            return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+__all__ = [
+    "REASON_FEATURE",
+    "REASON_UNLICENSED",
+    "check_license",
+    "get_default_manager",
+    "requires_license",
+    "set_default_manager",
+]
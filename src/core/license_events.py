@@ -0,0 +1,239 @@
+"""Queue-backed, batched writer for license events with log rotation."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+LEVEL_NAMES = {10: "DEBUG", 20: "INFO", 30: "WARNING", 40: "ERROR", 50: "CRITICAL"}
+
+FORMAT_JSON = "json"
+FORMAT_TEXT = "text"
+
+_Item = Union[Dict[str, Any], threading.Event, None]
+
+
+def format_text(event: Dict[str, Any]) -> str:
+    """Render ``event`` in the classic ``asctime - LEVEL - message | key=...`` form."""
+
+    timestamp = datetime.fromtimestamp(event["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+    return f"{timestamp} - {event['level']} - {event['message']} | key={event['key']}"
+
+
+def format_json(event: Dict[str, Any]) -> str:
+    record = dict(event)
+    record["ts"] = datetime.fromtimestamp(event["ts"]).astimezone().isoformat(timespec="milliseconds")
+    return json.dumps(record, default=str, separators=(",", ":"))
+
+
+class LicenseEventWriter:
+    """Append events to ``path`` from a background thread.
+
+    :meth:`emit` only enqueues, so callers never wait on the disk. The writer
+    thread drains up to ``batch_size`` events per write, rotates the file once
+    it exceeds ``max_bytes`` or is older than ``rotate_seconds`` and gzips the
+    rotated segment, keeping ``backup_count`` of them.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        fmt: str = FORMAT_JSON,
+        max_bytes: int = 10 * 1024 * 1024,
+        rotate_seconds: Optional[float] = None,
+        backup_count: int = 5,
+        batch_size: int = 256,
+    ) -> None:
+        self.path = Path(path)
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self._queue: "queue.SimpleQueue[_Item]" = queue.SimpleQueue()
+        self._handle: Optional[Any] = None
+        self._segment_started = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="license-events", daemon=True)
+        self._thread.start()
+
+    # Public API -----------------------------------------------------
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        """Queue ``event`` for writing; never blocks on I/O."""
+
+        if self._closed:
+            return
+        self._queue.put(event)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Wait until every event queued so far has been written."""
+
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Flush pending events and stop the writer thread."""
+
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+        # Write anything the thread could not reach before it stopped.
+        self._write_batch(self._drain())
+        self._close_handle()
+
+    # Writer thread ---------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[Dict[str, Any]] = []
+            waiters: List[threading.Event] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            except OSError:  # pragma: no cover - the log must never break validation
+                pass
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        events = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return events
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not None:
+                events.append(item)
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        render = format_text if self.fmt == FORMAT_TEXT else format_json
+        data = "".join(render(event) + "\n" for event in batch).encode("utf-8")
+        handle = self._open()
+        handle.write(data)
+        handle.flush()
+        if self._should_rotate(handle.tell()):
+            self._rotate()
+
+    def _open(self) -> Any:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.path, "ab")
+            self._segment_started = time.time()
+        return self._handle
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _should_rotate(self, size: int) -> bool:
+        if self.max_bytes and size >= self.max_bytes:
+            return True
+        if self.rotate_seconds and size and time.time() - self._segment_started >= self.rotate_seconds:
+            return True
+        return False
+
+    def _rotate(self) -> None:
+        import gzip
+        import shutil
+
+        self._close_handle()
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        rotated = self.path.with_name(f"{self.path.name}.{stamp}")
+        os.replace(self.path, rotated)
+        with open(rotated, "rb") as source, gzip.open(f"{rotated}.gz", "wb") as target:
+            shutil.copyfileobj(source, target)
+        rotated.unlink()
+
+        segments = sorted(self.path.parent.glob(f"{self.path.name}.*.gz"))
+        for stale in segments[: max(0, len(segments) - self.backup_count)]:
+            stale.unlink(missing_ok=True)
+
+
+_WRITERS: Dict[str, LicenseEventWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def get_event_writer(path: Path, **options: Any) -> LicenseEventWriter:
+    """Return the shared writer for ``path``, creating it on first use.
+
+    Options only apply when the writer is created.
+    """
+
+    try:
+        key = str(Path(path).resolve())
+    except OSError:
+        key = str(path)
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(key)
+        if writer is None or writer._closed:
+            writer = LicenseEventWriter(Path(path), **options)
+            _WRITERS[key] = writer
+        return writer
+
+
+def flush_all(timeout: Optional[float] = 5.0) -> None:
+    """Flush every shared writer."""
+
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS.values())
+    for writer in writers:
+        writer.flush(timeout)
+
+
+def close_all() -> None:
+    """Flush and close every shared writer."""
+
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS.values())
+        _WRITERS.clear()
+    for writer in writers:
+        writer.close()
+
+
+atexit.register(close_all)
+
+
+__all__ = [
+    "FORMAT_JSON",
+    "FORMAT_TEXT",
+    "LEVEL_NAMES",
+    "LicenseEventWriter",
+    "close_all",
+    "flush_all",
+    "get_event_writer",
+]
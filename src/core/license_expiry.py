@@ -0,0 +1,241 @@
+"""Fire callbacks when licenses expire or enter a warning window.
+
+:class:`ExpiryScheduler` keeps one heap of deadlines for any number of
+licenses, so nothing is re-verified between events: a background thread sleeps
+until the earliest deadline and wakes only to deliver it. Rescheduling or
+cancelling a key is O(log n); superseded heap entries are skipped lazily and
+compacted when they outnumber live ones.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .license_manager import LOG_ERROR, LOG_WARNING, LicenseManager
+
+EXPIRED = "expired"
+WARNING = "warning"
+
+DEFAULT_WARNING_WINDOWS = (14 * 86400,)
+
+# Upper bound on one sleep so wall-clock jumps are noticed eventually.
+_MAX_SLEEP = 3600.0
+
+
+class ExpiryEvent(NamedTuple):
+    """A license crossing its expiry or one of its warning windows."""
+
+    key: Hashable
+    kind: str
+    expiry: int
+    window: float = 0.0
+
+    @property
+    def deadline(self) -> float:
+        return self.expiry - self.window
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "kind": self.kind,
+            "expiry": datetime.fromtimestamp(self.expiry, tz=timezone.utc).isoformat(),
+            "window_seconds": self.window,
+        }
+
+
+ExpiryCallback = Callable[[ExpiryEvent], None]
+
+# (deadline, sequence, generation, event, callback); the sequence keeps
+# entries with equal deadlines in scheduling order and stops comparison there.
+_Entry = Tuple[float, int, int, ExpiryEvent, Optional[ExpiryCallback]]
+
+
+class ExpiryScheduler:
+    """Heap-ordered expiry and warning deadlines for many licenses.
+
+    ``callback`` receives every event; :meth:`schedule` may add a per-key
+    callback that runs first. Warning windows are seconds before expiry. A key
+    scheduled when it is already past some deadlines fires only the latest of
+    them (``expired``, or the narrowest warning window already entered), once.
+    Events are delivered by :meth:`run_pending`, called either by the thread
+    from :meth:`start` or by the host's own loop. A callback that raises does
+    not stop delivery; the error goes to ``event_log``'s event log (or to
+    stderr without one).
+    """
+
+    def __init__(
+        self,
+        callback: Optional[ExpiryCallback] = None,
+        *,
+        warning_windows: Sequence[float] = DEFAULT_WARNING_WINDOWS,
+        clock: Callable[[], float] = time.time,
+        event_log: Optional[LicenseManager] = None,
+    ) -> None:
+        self.callback = callback
+        self.event_log = event_log
+        self.warning_windows = tuple(sorted({float(window) for window in warning_windows if window > 0}, reverse=True))
+        self.clock = clock
+        self._heap: List[_Entry] = []
+        self._generations: Dict[Hashable, int] = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._generations)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._generations
+
+    # Scheduling ------------------------------------------------------
+
+    def schedule(self, key: Hashable, expiry: int, callback: Optional[ExpiryCallback] = None) -> None:
+        """Track ``key`` expiring at ``expiry`` (Unix seconds), replacing any earlier schedule."""
+
+        now = self.clock()
+        events = [ExpiryEvent(key, WARNING, expiry, window) for window in self.warning_windows]
+        events.append(ExpiryEvent(key, EXPIRED, expiry))
+        due = [event for event in events if event.deadline <= now]
+        # Only the most recent deadline already passed is still news.
+        pending = due[-1:] + [event for event in events if event.deadline > now]
+        with self._cond:
+            generation = next(self._counter)
+            self._generations[key] = generation
+            for event in pending:
+                heapq.heappush(self._heap, (event.deadline, next(self._counter), generation, event, callback))
+            self._compact()
+            self._cond.notify()
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._cond:
+            found = self._generations.pop(key, None) is not None
+            self._compact()
+        return found
+
+    def next_deadline(self) -> Optional[float]:
+        with self._cond:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, now: Optional[float] = None) -> List[ExpiryEvent]:
+        """Deliver every event whose deadline has passed and return them."""
+
+        now = self.clock() if now is None else now
+        fired: List[Tuple[ExpiryEvent, Optional[ExpiryCallback]]] = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, generation, event, callback = heapq.heappop(self._heap)
+                if self._generations.get(event.key) != generation:
+                    continue
+                if event.kind == EXPIRED:
+                    del self._generations[event.key]
+                fired.append((event, callback))
+        for event, callback in fired:
+            for target in (callback, self.callback):
+                if target is None:
+                    continue
+                try:
+                    target(event)
+                except Exception as exc:
+                    self._report(event, exc)
+        return [event for event, _ in fired]
+
+    def _report(self, event: ExpiryEvent, exc: Exception) -> None:
+        message = f"Expiry callback failed for {event.key!r} ({event.kind}): {exc!r}"
+        if self.event_log is not None:
+            self.event_log.log_event(message, LOG_ERROR)
+            return
+        import traceback
+
+        print(message, file=sys.stderr)
+        traceback.print_exception(type(exc), exc, exc.__traceback__, file=sys.stderr)
+
+    def _discard_stale(self) -> None:
+        while self._heap and self._generations.get(self._heap[0][3].key) != self._heap[0][2]:
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        if len(self._heap) > 2 * (len(self._generations) * (len(self.warning_windows) + 1)) + 64:
+            self._heap = [entry for entry in self._heap if self._generations.get(entry[3].key) == entry[2]]
+            heapq.heapify(self._heap)
+
+    # Thread lifecycle ------------------------------------------------
+
+    def start(self) -> "ExpiryScheduler":
+        if self._thread is not None:
+            return self
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="license-expiry", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "ExpiryScheduler":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                self._discard_stale()
+                timeout = _MAX_SLEEP
+                if self._heap:
+                    timeout = min(_MAX_SLEEP, self._heap[0][0] - self.clock())
+                if timeout > 0:
+                    self._cond.wait(timeout)
+                    continue
+            self.run_pending()
+
+
+def track_manager(scheduler: ExpiryScheduler, manager: LicenseManager, key: Hashable = "license") -> bool:
+    """Schedule ``manager``'s current license with ``scheduler``.
+
+    On expiry the manager's status flips to invalid; warnings are written to
+    its event log. Call again after each successful validation. Returns
+    whether a schedule was set (``False`` when no valid license is known).
+    """
+
+    expiry = manager.expires_at
+    if expiry is None:
+        scheduler.cancel(key)
+        return False
+
+    def on_event(event: ExpiryEvent) -> None:
+        if event.expiry != manager.expires_at:
+            return  # Revalidated with a different license since scheduling.
+        if event.kind == EXPIRED:
+            manager.mark_expired()
+        else:
+            days = max(0, round((event.expiry - scheduler.clock()) / 86400))
+            manager.log_event(f"License expires in {days} days.", LOG_WARNING)
+
+    scheduler.schedule(key, expiry, on_event)
+    return True
+
+
+__all__ = [
+    "DEFAULT_WARNING_WINDOWS",
+    "EXPIRED",
+    "ExpiryEvent",
+    "ExpiryScheduler",
+    "WARNING",
+    "track_manager",
+]
@@ -0,0 +1,276 @@
+"""Trusted public key sets for zero-downtime key rotation.
+
+A key set is loaded from either
+
+* a directory of ``*.pem`` files, with an optional ``keys.json`` manifest
+  giving validity windows per file::
+
+      {"keys": {"2025.pem": {"not_after": "2026-03-01T00:00:00+00:00"},
+                "2026.pem": {"not_before": 1767225600}}}
+
+* or a JSON bundle holding the PEMs inline::
+
+      {"keys": [{"public_key": "-----BEGIN PUBLIC KEY-----...", "not_before": ...}]}
+
+Each key is identified by the 32-bit id v2 tokens carry (the first four bytes
+of the SHA-256 of the raw public key), so a v2 token selects its key with one
+dict lookup. v1 tokens carry no id and are tried against every key that is
+currently valid, newest first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .license_verifier import (
+    REASON_KEY,
+    TOKEN_V2,
+    _V2_HEADER,
+    LicenseVerificationError,
+    _b64u_decode_or_none,
+    _load_public_key,
+    public_key_fingerprint,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+MANIFEST_NAME = "keys.json"
+
+# Base64 characters covering the fixed v2 header.
+_V2_HEADER_CHARS = 4 * -(-_V2_HEADER.size // 3)
+
+
+def public_key_id(key: Ed25519PublicKey) -> int:
+    """Return the 32-bit key id that v2 tokens carry for ``key``."""
+
+    return int.from_bytes(public_key_fingerprint(key)[:4], "big")
+
+
+def format_key_id(key_id: int) -> str:
+    return f"{key_id:08x}"
+
+
+def token_key_id(normalized_token: str) -> Optional[int]:
+    """Return the key id embedded in a v2 token, or ``None`` for v1 tokens."""
+
+    if "." in normalized_token:
+        return None
+    header = _b64u_decode_or_none(normalized_token[:_V2_HEADER_CHARS])
+    if not header or len(header) < _V2_HEADER.size or header[0] != TOKEN_V2:
+        return None
+    return _V2_HEADER.unpack_from(header)[2]
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError as exc:
+        raise LicenseVerificationError(f"Invalid key validity timestamp: {value!r}", REASON_KEY) from exc
+
+
+class TrustedKey(NamedTuple):
+    """One public key with its id and optional validity window."""
+
+    key_id: int
+    key: Ed25519PublicKey
+    not_before: Optional[float] = None
+    not_after: Optional[float] = None
+    source: str = ""
+
+    def is_valid_at(self, now: float) -> bool:
+        if self.not_before is not None and now < self.not_before:
+            return False
+        return self.not_after is None or now < self.not_after
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key_id": format_key_id(self.key_id),
+            "not_before": self.not_before,
+            "not_after": self.not_after,
+            "source": self.source,
+        }
+
+
+class KeySet:
+    """Immutable index of trusted keys by key id."""
+
+    def __init__(self, keys: List[TrustedKey]) -> None:
+        by_id: Dict[int, TrustedKey] = {}
+        for entry in keys:
+            existing = by_id.get(entry.key_id)
+            if existing is not None and public_key_fingerprint(existing.key) != public_key_fingerprint(entry.key):
+                raise LicenseVerificationError(
+                    f"Key id {format_key_id(entry.key_id)} is shared by {existing.source} and {entry.source}.",
+                    REASON_KEY,
+                )
+            by_id[entry.key_id] = entry
+        self._by_id = by_id
+        self._fingerprint: Optional[bytes] = None
+        # Newest first, so v1 fallback tries the current key before older ones.
+        self._ordered = tuple(
+            sorted(by_id.values(), key=lambda entry: entry.not_before or 0.0, reverse=True)
+        )
+
+    def __len__(self) -> int:
+        return len(self._ordered)
+
+    def __iter__(self):
+        return iter(self._ordered)
+
+    def get(self, key_id: int) -> Optional[TrustedKey]:
+        return self._by_id.get(key_id)
+
+    def active(self, now: Optional[float] = None) -> List[TrustedKey]:
+        now = time.time() if now is None else now
+        return [entry for entry in self._ordered if entry.is_valid_at(now)]
+
+    def keys_for_token(self, normalized_token: str, now: Optional[float] = None) -> Tuple[Ed25519PublicKey, ...]:
+        """Return the keys that may have signed ``normalized_token``.
+
+        Raises :class:`LicenseVerificationError` when the token names a key that
+        is unknown or outside its validity window.
+        """
+
+        now = time.time() if now is None else now
+        key_id = token_key_id(normalized_token)
+        if not key_id:
+            keys = tuple(entry.key for entry in self.active(now))
+            if not keys:
+                raise LicenseVerificationError("No license public key is currently valid.", REASON_KEY)
+            return keys
+        entry = self._by_id.get(key_id)
+        if entry is None:
+            raise LicenseVerificationError("License signed by an unknown key.", REASON_KEY)
+        if not entry.is_valid_at(now):
+            raise LicenseVerificationError("License key is not valid at this time.", REASON_KEY)
+        return (entry.key,)
+
+    def fingerprint(self) -> bytes:
+        if self._fingerprint is None:
+            digest = hashlib.sha256()
+            for entry in sorted(self._ordered, key=lambda entry: entry.key_id):
+                digest.update(repr((entry.key_id, entry.not_before, entry.not_after)).encode("utf-8"))
+                digest.update(public_key_fingerprint(entry.key))
+            self._fingerprint = digest.digest()
+        return self._fingerprint
+
+    @classmethod
+    def from_path(cls, path: Path) -> "KeySet":
+        path = Path(path)
+        if path.is_dir():
+            return cls._from_directory(path)
+        if path.suffix == ".json":
+            return cls._from_bundle(path)
+        key = _load_public_key(path)
+        return cls([TrustedKey(public_key_id(key), key, source=str(path))])
+
+    @classmethod
+    def _from_directory(cls, directory: Path) -> "KeySet":
+        windows: Dict[str, Dict[str, Any]] = {}
+        manifest = directory / MANIFEST_NAME
+        if manifest.exists():
+            windows = _read_json(manifest).get("keys") or {}
+        entries = []
+        for pem in sorted(directory.glob("*.pem")):
+            key = _load_public_key(pem)
+            window = windows.get(pem.name) or {}
+            entries.append(
+                TrustedKey(
+                    public_key_id(key),
+                    key,
+                    _timestamp(window.get("not_before")),
+                    _timestamp(window.get("not_after")),
+                    str(pem),
+                )
+            )
+        if not entries:
+            raise LicenseVerificationError(f"No public keys found in {directory}", REASON_KEY)
+        return cls(entries)
+
+    @classmethod
+    def _from_bundle(cls, path: Path) -> "KeySet":
+        entries = []
+        for index, item in enumerate(_read_json(path).get("keys") or []):
+            key = _load_public_key(str(item["public_key"]).encode("utf-8"))
+            entries.append(
+                TrustedKey(
+                    public_key_id(key),
+                    key,
+                    _timestamp(item.get("not_before")),
+                    _timestamp(item.get("not_after")),
+                    f"{path}#{index}",
+                )
+            )
+        if not entries:
+            raise LicenseVerificationError(f"No public keys found in {path}", REASON_KEY)
+        return cls(entries)
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as exc:
+        raise LicenseVerificationError(f"Invalid key manifest {path}: {exc}", REASON_KEY) from exc
+    if not isinstance(data, dict):
+        raise LicenseVerificationError(f"Invalid key manifest {path}", REASON_KEY)
+    return data
+
+
+def is_key_set_path(path: Path) -> bool:
+    """Return whether ``path`` names a key directory or JSON bundle."""
+
+    return path.suffix == ".json" or path.is_dir()
+
+
+def _signature(path: Path) -> Tuple[Any, ...]:
+    stat = os.stat(path)
+    entries: List[Any] = [(stat.st_mtime_ns, stat.st_size, stat.st_ino)]
+    if path.is_dir():
+        with os.scandir(path) as children:
+            for child in sorted(children, key=lambda child: child.name):
+                child_stat = child.stat()
+                entries.append((child.name, child_stat.st_mtime_ns, child_stat.st_size, child_stat.st_ino))
+    return tuple(entries)
+
+
+_KEY_SETS: Dict[str, Tuple[Tuple[Any, ...], KeySet]] = {}
+_KEY_SETS_LOCK = threading.Lock()
+
+
+def load_key_set(path: Path) -> KeySet:
+    """Return the key set at ``path``, reusing it until any of its files change."""
+
+    resolved = Path(path).resolve()
+    signature = _signature(resolved)
+    with _KEY_SETS_LOCK:
+        cached = _KEY_SETS.get(str(resolved))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    key_set = KeySet.from_path(resolved)
+    with _KEY_SETS_LOCK:
+        _KEY_SETS[str(resolved)] = (signature, key_set)
+    return key_set
+
+
+__all__ = [
+    "KeySet",
+    "MANIFEST_NAME",
+    "TrustedKey",
+    "format_key_id",
+    "is_key_set_path",
+    "load_key_set",
+    "public_key_id",
+    "token_key_id",
+]
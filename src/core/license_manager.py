@@ -2,26 +2,65 @@
 
 from __future__ import annotations
 
-import logging
 import os
-from dataclasses import dataclass
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
-
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .license_metrics import REGISTRY, record_cache_lookup, record_validation
+from .license_tracing import NO_SPAN, TRACER
+from .license_snapshot import (
+    load_secret,
+    read_snapshot,
+    remove_snapshot,
+    snapshot_binding,
+    write_snapshot,
+)
 from .license_verifier import (
+    REASON_EXPIRED,
+    REASON_KEY,
+    REASON_OK,
     LicenseVerificationError,
+    Quotas,
+    TokenSource,
+    VerificationCache,
+    feature_mask,
     normalize_token,
     verify_token,
 )
 
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .license_admission import AdmissionControl
+    from .license_events import LicenseEventWriter
+    from .license_revocation import RevocationList
+
+# Same values as logging.INFO/WARNING/ERROR.
+LOG_INFO = 20
+LOG_WARNING = 30
+LOG_ERROR = 40
+
+REASON_NO_TOKEN = "no_token"
+REASON_IO = "io"
+
+
 class LicenseValidationError(Exception):
-    """Raised when a license fails validation."""
+    """Raised when a license fails validation.
 
+    ``reason`` is a short code such as ``"expired"`` or ``"signature"``.
+    ``retry_after`` is set, in seconds, when admission control rejected the
+    call without verifying.
+    """
 
-@dataclass
-class LicenseStatus:
+    def __init__(self, message: str, reason: str = REASON_NO_TOKEN, *, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class LicenseStatus(NamedTuple):
     """Represents the status of the most recent validation."""
 
     valid: bool
@@ -40,8 +79,46 @@ class LicenseStatus:
         return payload
 
 
+class _ManagerState(NamedTuple):
+    """Everything ``get_license_status`` reports, replaced as one object."""
+
+    status: Optional[LicenseStatus] = None
+    validated_at: Optional[str] = None
+    expires_at: Optional[int] = None
+    # Signed entitlements of a valid license; zero/empty otherwise.
+    features: int = 0
+    quotas: Quotas = ()
+    # True only when this process checked the signature; restored snapshots are not.
+    verified: bool = False
+
+
+_NO_STATE = _ManagerState()
+
+
+class _Flight:
+    """One validation in progress that concurrent callers wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = False
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> bool:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
 class LicenseManager:
-    """Manage offline license validation using the embedded public key."""
+    """Manage offline license validation using the embedded public key.
+
+    The manager is safe to share between threads. Status reads are lock-free:
+    each validation publishes a new immutable state in a single assignment.
+    Concurrent :meth:`validate_license` calls share one in-flight verification.
+    """
 
     def __init__(
             self,
@@ -51,19 +128,31 @@ class LicenseManager:
             public_key_path: Optional[Path] = None,
             expected_product: Optional[str] = None,
             expected_version: Optional[str] = None,
+            verification_cache: Optional[VerificationCache] = None,
+            status_path: Optional[Path] = None,
+            log_format: Optional[str] = None,
+            revocation_path: Optional[Path] = None,
+            admission: Optional[AdmissionControl] = None,
     ) -> None:
         # ------------------------------------------------------------------
         # Resolve everything relative to the ShopSaavy project root
         # ------------------------------------------------------------------
-        APP_ROOT = Path(__file__).resolve().parents[2]  # ~/Git/shopsaavy
+        # LICENSE_APP_ROOT is set where __file__ is not inside the checkout (zipapp).
+        app_root_env = os.getenv("LICENSE_APP_ROOT")
+        APP_ROOT = Path(app_root_env) if app_root_env else Path(__file__).resolve().parents[2]  # ~/Git/shopsaavy
         DEFAULT_LOG_PATH = APP_ROOT / "logs" / "license.log"
         DEFAULT_PUBLIC_KEY = APP_ROOT / "src" / "core" / "license_public.pem"
+        DEFAULT_REVOCATIONS = APP_ROOT / "src" / "core" / "license_revocations.bin"
 
         # Environment overrides
         log_env = os.getenv("LICENSE_LOG_PATH")
         public_key_env = os.getenv("LICENSE_PUBLIC_KEY_PATH")
         product_env = os.getenv("LICENSE_PRODUCT")
         version_env = os.getenv("LICENSE_VERSION")
+        status_env = os.getenv("LICENSE_STATUS_PATH")
+        snapshot_key_env = os.getenv("LICENSE_SNAPSHOT_KEY_PATH")
+        log_format_env = os.getenv("LICENSE_LOG_FORMAT")
+        revocation_env = os.getenv("LICENSE_REVOCATION_PATH")
 
         # ------------------------------------------------------------------
         # Paths now resolve inside the app root, never /
@@ -78,145 +167,563 @@ class LicenseManager:
             if public_key_env
             else (public_key_path or DEFAULT_PUBLIC_KEY)
         )
+        # The status snapshot lives beside the log unless overridden.
+        self.status_path = (
+            Path(status_env)
+            if status_env
+            else (status_path or self.log_file.parent / "license_status.json")
+        )
+        # Private per-install secret keying the snapshot HMAC.
+        self.snapshot_key_path = (
+            Path(snapshot_key_env)
+            if snapshot_key_env
+            else self.status_path.with_name(".license_snapshot.key")
+        )
+        self._secret: Optional[bytes] = None
+        # Revocations are only enforced when this file exists.
+        self.revocation_path = (
+            Path(revocation_env)
+            if revocation_env
+            else (revocation_path or DEFAULT_REVOCATIONS)
+        )
         self.expected_product = expected_product or product_env
         self.expected_version = expected_version or version_env
+        self.verification_cache = verification_cache
+        # Optional negative cache and rate limit checked before verifying.
+        self.admission = admission
+        # "json" (structured events, default) or "text" (human-readable lines)
+        self.log_format = log_format_env or log_format or "json"
 
-        # ensure logs/ exists under app root
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        # logs/ is created by the event writer on first write, not here, so
+        # read-only callers (status, metrics) leave the filesystem untouched.
 
+        self._explicit_token = license_token or None
+        self._default_public_key = public_key_path or DEFAULT_PUBLIC_KEY
         self.license_token = license_token or self._load_license_token()
-        self._status: Optional[LicenseStatus] = None
-        self._last_validated_at: Optional[str] = None
-        self._logger = self._configure_logger()
+        self._state = _NO_STATE
+        self._state_lock = threading.Lock()
+        self._flight: Optional[_Flight] = None
+        self._flight_lock = threading.Lock()
+        self._event_writer: Optional[LicenseEventWriter] = None
 
     # Public API -----------------------------------------------------
 
     def validate_license(self) -> bool:
-        """Validate the configured license token."""
+        """Validate the configured license token.
 
-        if not self.license_token:
-            raise LicenseValidationError("No license token provided.")
+        Callers arriving while another thread is validating wait for and share
+        that result (or exception) instead of verifying again.
+        """
+
+        with self._flight_lock:
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight()
+        if not leader:
+            return flight.wait()
+        return self._lead(flight, lambda: self._validate(self.license_token, self.public_key_path))
 
-        if not self.public_key_path.exists():
-            message = f"License public key not found at {self.public_key_path}"
-            self._log_event(message, logging.ERROR)
-            raise LicenseValidationError(message)
+    def _lead(self, flight: _Flight, body: Callable[[], bool]) -> bool:
+        """Run ``body`` as the leader of ``flight`` and share its outcome."""
 
-        token = normalize_token(self.license_token)
+        try:
+            with TRACER.span("license.validate") if TRACER.enabled else NO_SPAN:
+                flight.result = body()
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._flight_lock:
+                self._flight = None
+            flight.done.set()
+
+    def _validate(self, license_token: Optional[str], public_key_path: Path) -> bool:
+        """Verify the given credentials; on success publish them with the new state."""
+
+        if not license_token:
+            if REGISTRY.enabled:
+                record_validation("failure", REASON_NO_TOKEN)
+            raise LicenseValidationError("No license token provided.", REASON_NO_TOKEN)
+
+        started = time.perf_counter()
+        if not public_key_path.exists():
+            message = f"License public key not found at {public_key_path}"
+            self.log_event(message, LOG_ERROR, reason=REASON_KEY, started=started)
+            remove_snapshot(self.status_path)
+            raise LicenseValidationError(message, REASON_KEY)
+
+        token = normalize_token(license_token)
+        admission_key = self._admit(token, public_key_path)
         try:
             payload = verify_token(
-                self.public_key_path,
+                self.public_keys(public_key_path),
                 token,
                 expected_product=self.expected_product,
                 expected_version=self.expected_version,
+                cache=self.verification_cache,
+                revocations=self.load_revocations(public_key_path),
+                check_expiry=True,
             )
         except (OSError, LicenseVerificationError) as exc:
             message = str(exc) or "Invalid license."
-            self._log_event(f"License validation failed: {message}", logging.ERROR)
-            raise LicenseValidationError(message) from exc
+            reason = getattr(exc, "reason", REASON_IO)
+            self.log_event(
+                f"License validation failed: {message}",
+                LOG_ERROR,
+                reason=reason,
+                started=started,
+            )
+            remove_snapshot(self.status_path)
+            self._record_failure(admission_key, reason, message)
+            raise LicenseValidationError(message, reason) from exc
 
         if payload.is_expired:
             message = "License expired."
-            self._log_event(message, logging.ERROR)
-            raise LicenseValidationError(message)
+            self.log_event(message, LOG_ERROR, reason=REASON_EXPIRED, started=started)
+            remove_snapshot(self.status_path)
+            self._record_failure(admission_key, REASON_EXPIRED, message)
+            raise LicenseValidationError(message, REASON_EXPIRED)
+
+        if admission_key is not None and self.admission is not None:
+            self.admission.negative_cache.forget(admission_key)
 
         expiry_iso = datetime.fromtimestamp(payload.expiry, tz=timezone.utc).isoformat()
-        self._status = LicenseStatus(
-            valid=True,
-            expiry=expiry_iso,
-            details=payload.to_details(),
+        state = _ManagerState(
+            LicenseStatus(valid=True, expiry=expiry_iso, details=payload.to_details()),
+            datetime.now(timezone.utc).isoformat(),
+            payload.expiry,
+            payload.features,
+            payload.quotas,
+            True,
         )
-        self._last_validated_at = datetime.now(timezone.utc).isoformat()
-        self._log_event("License validation succeeded.")
+        with self._state_lock:
+            self.license_token = license_token
+            self.public_key_path = public_key_path
+            self._state = state
+        self._save_snapshot(token, state, public_key_path)
+        self.log_event("License validation succeeded.", reason=REASON_OK, started=started)
         return True
 
-    def get_license_status(self) -> Dict[str, Any]:
-        """Return the last known license validation status."""
+    def flush_events(self, timeout: Optional[float] = 5.0) -> None:
+        """Block until queued log events have reached the log file."""
+
+        if self._event_writer is not None:
+            self._event_writer.flush(timeout)
+
+    def reload_credentials(self) -> bool:
+        """Re-resolve the token and public key path from their sources and validate them.
+
+        The new credentials and their result replace the old ones together, as
+        one validation flight: readers see either the previous status or the
+        new one, never an empty state. The key file is re-checked even when its
+        path did not change. Returns whether the token or path changed; raises
+        :class:`LicenseValidationError` (after publishing the failure) when the
+        new credentials do not validate.
+        """
+
+        public_key_env = os.getenv("LICENSE_PUBLIC_KEY_PATH")
+        public_key_path = Path(public_key_env) if public_key_env else self._default_public_key
+        token = self._explicit_token or self._load_license_token()
+        while True:
+            with self._flight_lock:
+                flight = self._flight
+                if flight is None:
+                    flight = self._flight = _Flight()
+                    break
+            # Let the running validation finish; its result is for the old credentials.
+            flight.done.wait()
+        changed = token != self.license_token or public_key_path != self.public_key_path
+        self._lead(flight, lambda: self._reload(token, public_key_path))
+        return changed
+
+    def _reload(self, license_token: Optional[str], public_key_path: Path) -> bool:
+        previous = self._state
+        try:
+            return self._validate(license_token, public_key_path)
+        except LicenseValidationError as exc:
+            failed = _ManagerState(LicenseStatus(valid=False, message=str(exc)), previous.validated_at)
+            with self._state_lock:
+                self.license_token = license_token
+                self.public_key_path = public_key_path
+                self._state = failed
+            raise
+
+    @property
+    def expires_at(self) -> Optional[int]:
+        """Expiry (Unix seconds) of the currently valid license, if any."""
+
+        state = self._state
+        return state.expires_at if state.status is not None and state.status.valid else None
+
+    def has_features(self, mask: int) -> bool:
+        """Return whether the current valid, unexpired license grants every bit in ``mask``.
+
+        This reads the last validation result and never verifies, so it is
+        cheap enough for per-request checks; build ``mask`` once with
+        :func:`~core.license_verifier.feature_mask`.
+        """
+
+        # Only valid states carry an expiry, so no status check is needed.
+        state = self._state
+        expires_at = state.expires_at
+        if expires_at is None:
+            return False
+        if not state.verified:
+            state = self._verified_state(state)
+            expires_at = state.expires_at
+            if expires_at is None:
+                return False
+        return state.features & mask == mask and time.time() < expires_at
+
+    def has_feature(self, feature: "str | int") -> bool:
+        """Return whether the current valid license grants ``feature`` (a name or bit)."""
+
+        return self.has_features(feature_mask(feature))
+
+    def quota(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """Return a signed quota of the current valid license, or ``default``."""
+
+        state = self._state
+        if state.status is None or not state.status.valid:
+            return default
+        if not state.verified:
+            state = self._verified_state(state)
+        for key, value in state.quotas:
+            if key == name:
+                return value
+        return default
+
+    def mark_expired(self) -> None:
+        """Flip a valid status to expired once its expiry has passed."""
+
+        state = self._state
+        if state.status is None or not state.status.valid:
+            return
+        message = "License expired."
+        expired = _ManagerState(LicenseStatus(valid=False, message=message), state.validated_at)
+        if not self._replace_state(state, expired):
+            return  # Revalidated (or reloaded) in the meantime.
+        remove_snapshot(self.status_path)
+        self.log_event(message, LOG_ERROR, reason=REASON_EXPIRED)
+
+    @staticmethod
+    def token_files() -> List[Path]:
+        """Return the token files checked after the environment and keyring."""
+
+        return [
+            Path.home() / ".license_token",
+            Path.home() / ".license_key",
+            Path.home() / ".config" / "shopsaavy" / "license_token",
+            Path.home() / ".config" / "shopsaavy" / "license_key",
+        ]
 
-        if self._status:
-            result = self._status.to_dict()
+    def get_license_status(self) -> Dict[str, Any]:
+        """Return the last known license validation status.
+
+        Without an in-process validation, a matching unexpired snapshot written
+        by an earlier ``validate_license`` call is used instead.
+        """
+
+        state = self._state
+        if state.status is None:
+            self._restore_snapshot(state)
+            state = self._state
+        elif state.expires_at is not None and time.time() >= state.expires_at:
+            self.mark_expired()
+            state = self._state
+
+        if state.status:
+            result = state.status.to_dict()
             if self.license_token:
                 result.setdefault("license_key", self._obfuscate_key())
-            if self._last_validated_at:
-                result.setdefault("validated_at", self._last_validated_at)
+            if state.validated_at:
+                result.setdefault("validated_at", state.validated_at)
             return result
 
         payload: Dict[str, Any] = {"valid": False}
         if self.license_token:
             payload["license_key"] = self._obfuscate_key()
-        if self._last_validated_at:
-            payload["validated_at"] = self._last_validated_at
+        if state.validated_at:
+            payload["validated_at"] = state.validated_at
         return payload
 
+    def load_revocations(self, public_key_path: Optional[Path] = None) -> Optional[RevocationList]:
+        """Return the verified revocation list, or ``None`` when there is none.
+
+        Loaded lists are cached until the file or key changes, so shared
+        callers such as the tenant pool may call this per validation.
+        """
+
+        if not self.revocation_path.exists():
+            return None
+        from .license_revocation import load_revocation_list
+
+        return load_revocation_list(self.revocation_path, self.public_keys(public_key_path))
+
+    def public_keys(self, public_key_path: Optional[Path] = None) -> TokenSource:
+        """Return the key set for a key directory or bundle, else the PEM path."""
+
+        from .license_keys import is_key_set_path, load_key_set
+
+        public_key_path = public_key_path or self.public_key_path
+        if is_key_set_path(public_key_path):
+            return load_key_set(public_key_path)
+        return public_key_path
+
     # Internal helpers ----------------------------------------------
 
+    def _snapshot_binding(
+        self, token: str, public_key_path: Optional[Path] = None, *, create: bool = False
+    ) -> bytes:
+        """Return the snapshot HMAC key; only writers (``create``) make the secret."""
+
+        try:
+            stat = self.revocation_path.stat()
+            revocations = f"{stat.st_mtime_ns}:{stat.st_size}:{stat.st_ino}"
+        except OSError:
+            revocations = ""
+        return snapshot_binding(
+            public_key_path or self.public_key_path,
+            token,
+            self.expected_product,
+            self.expected_version,
+            extra=revocations,
+            secret=self._snapshot_secret(create),
+        )
+
+    def _snapshot_secret(self, create: bool) -> bytes:
+        secret = self._secret
+        if secret is None:
+            secret = self._secret = load_secret(self.snapshot_key_path, create=create)
+        return secret
+
+    def _admit(self, token: str, public_key_path: Path) -> Optional[bytes]:
+        """Reject a known-bad or over-limit validation before any crypto.
+
+        Returns the negative cache key for ``token``, or ``None`` when there is
+        no admission control (or the binding cannot be computed).
+        """
+
+        admission = self.admission
+        if admission is None:
+            return None
+        try:
+            key: Optional[bytes] = self._snapshot_binding(token, public_key_path, create=True)
+        except OSError:
+            key = None
+        if key is not None:
+            cached = admission.negative_cache.lookup(key)
+            if REGISTRY.enabled:
+                record_cache_lookup("negative", cached is not None)
+            if cached is not None:
+                if REGISTRY.enabled:
+                    record_validation("failure", cached.reason)
+                retry_after = max(0.0, cached.retry_at - admission.negative_cache.clock())
+                raise LicenseValidationError(cached.message, cached.reason, retry_after=retry_after)
+        wait = admission.bucket.try_acquire() if admission.bucket is not None else 0.0
+        if wait:
+            from .license_admission import REASON_RATE_LIMITED
+
+            if REGISTRY.enabled:
+                record_validation("failure", REASON_RATE_LIMITED)
+            raise LicenseValidationError(
+                "Too many license validations; retry later.",
+                REASON_RATE_LIMITED,
+                retry_after=wait,
+            )
+        return key
+
+    def _record_failure(self, key: Optional[bytes], reason: str, message: str) -> None:
+        if key is not None and self.admission is not None:
+            self.admission.negative_cache.record_failure(key, reason, message)
+
+    def _verified_state(self, state: _ManagerState) -> _ManagerState:
+        """Check the signature behind a restored ``state`` before granting anything.
+
+        A failure replaces the restored state with an invalid one, so
+        entitlements are never read from a snapshot alone.
+        """
+
+        try:
+            self.validate_license()
+        except LicenseValidationError as exc:
+            denied = _ManagerState(LicenseStatus(valid=False, message=str(exc)), state.validated_at)
+            self._replace_state(state, denied)
+        state = self._state
+        return state if state.verified else _NO_STATE
+
+    def _replace_state(self, expected: _ManagerState, state: _ManagerState) -> bool:
+        """Publish ``state`` unless another thread replaced ``expected`` first."""
+
+        with self._state_lock:
+            if self._state is not expected:
+                return False
+            self._state = state
+            return True
+
+    def _save_snapshot(self, token: str, state: _ManagerState, public_key_path: Path) -> None:
+        assert state.status is not None
+        try:
+            write_snapshot(
+                self.status_path,
+                self._snapshot_binding(token, public_key_path, create=True),
+                {
+                    "status": state.status.to_dict(),
+                    "validated_at": state.validated_at,
+                    "expires_at": state.expires_at,
+                    "features": state.features,
+                    "quotas": [list(item) for item in state.quotas],
+                },
+            )
+        except OSError as exc:
+            self.log_event(f"Unable to write license status snapshot: {exc}", LOG_WARNING)
+
+    def _restore_snapshot(self, expected: _ManagerState) -> bool:
+        if not self.license_token:
+            return False
+        try:
+            binding = self._snapshot_binding(normalize_token(self.license_token))
+        except OSError:  # includes a missing secret: nothing was ever saved
+            return False
+        body = read_snapshot(self.status_path, binding)
+        if REGISTRY.enabled:
+            record_cache_lookup("snapshot", body is not None)
+        if body is None:
+            return False
+        status = body.get("status") or {}
+        state = _ManagerState(
+            LicenseStatus(
+                valid=bool(status.get("valid")),
+                expiry=status.get("expiry"),
+                details=status.get("details"),
+                message=status.get("message"),
+            ),
+            body.get("validated_at"),
+            body.get("expires_at"),
+            int(body.get("features") or 0),
+            tuple((str(name), int(value)) for name, value in body.get("quotas") or ()),
+        )
+        return self._replace_state(expected, state)
+
     def _load_license_token(self) -> str:
+        if not TRACER.enabled:
+            return self._find_license_token()[0]
+        with TRACER.span("license.load_token") as span:
+            token, source = self._find_license_token()
+            span.set_attribute("source", source)
+            return token
+
+    def _find_license_token(self) -> Tuple[str, str]:
+        """Return the token and where it came from: env, keyring, file or none."""
+
         for env_var in ("LICENSE_TOKEN", "LICENSE_KEY"):
             value = os.getenv(env_var)
             if value:
-                return value.strip()
+                return value.strip(), "env"
 
+        traced = TRACER.enabled
+        started = time.perf_counter() if traced else 0.0
         try:
             import keyring  # type: ignore
 
             stored = keyring.get_password("shopsaavy", "license_key")
             if stored:
-                return stored.strip()
+                return stored.strip(), "keyring"
         except Exception:
             pass
+        finally:
+            if traced:
+                TRACER.record("keyring", started)
 
-        possible_files = [
-            Path.home() / ".license_token",
-            Path.home() / ".license_key",
-            Path.home() / ".config" / "shopsaavy" / "license_token",
-            Path.home() / ".config" / "shopsaavy" / "license_key",
-        ]
-        for file_path in possible_files:
+        for file_path in self.token_files():
             if file_path.exists():
                 try:
                     content = file_path.read_text(encoding="utf-8").strip()
                     if content:
-                        return content
+                        return content, "file"
                 except OSError:
                     continue
-        return ""
-
-    def _configure_logger(self) -> logging.Logger:
-        try:
-            resolved = self.log_file.resolve()
-        except OSError:
-            resolved = self.log_file
-        logger_name = f"license_manager.{hash(str(resolved))}"
-        logger = logging.getLogger(logger_name)
-        if not logger.handlers:
-            logger.setLevel(logging.INFO)
-            handler = logging.FileHandler(self.log_file, encoding="utf-8")
-            formatter = logging.Formatter(
-                "%(asctime)s - %(levelname)s - %(message)s",
-                datefmt="%Y-%m-%d %H:%M:%S",
-            )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-            logger.propagate = False
-        return logger
+        return "", "none"
+
+    def _configure_event_writer(self) -> LicenseEventWriter:
+        from .license_events import get_event_writer
+
+        rotate_seconds = os.getenv("LICENSE_LOG_ROTATE_SECONDS")
+        return get_event_writer(
+            self.log_file,
+            fmt=self.log_format,
+            max_bytes=int(os.getenv("LICENSE_LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            rotate_seconds=float(rotate_seconds) if rotate_seconds else None,
+            backup_count=int(os.getenv("LICENSE_LOG_BACKUPS", "5")),
+        )
 
-    def _log_event(self, message: str, level: int = logging.INFO) -> None:
-        obfuscated_key = self._obfuscate_key()
-        formatted_message = f"{message} | key={obfuscated_key}"
-        self._logger.log(level, formatted_message)
+    def log_event(
+        self,
+        message: str,
+        level: int = LOG_INFO,
+        *,
+        reason: Optional[str] = None,
+        started: Optional[float] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Queue a license event for this manager's log; ``extra`` fields override defaults."""
+
+        from .license_events import LEVEL_NAMES
+
+        if self._event_writer is None:
+            self._event_writer = self._configure_event_writer()
+        event: Dict[str, Any] = {
+            "ts": time.time(),
+            "level": LEVEL_NAMES.get(level, str(level)),
+            "event": "license_validation",
+            "message": message,
+            "key": self._obfuscate_key(),
+        }
+        if extra:
+            event.update(extra)
+        elapsed = None if started is None else time.perf_counter() - started
+        if elapsed is not None:
+            event["duration_ms"] = round(elapsed * 1000, 3)
+        if reason is not None:
+            event["outcome"] = "success" if reason == REASON_OK else "failure"
+            event["reason"] = reason
+            if REGISTRY.enabled:
+                record_validation(event["outcome"], reason, elapsed)
+        if TRACER.enabled:
+            if reason is not None:
+                TRACER.current().set_attribute("reason", reason)
+            mark = time.perf_counter()
+            self._event_writer.emit(event)
+            TRACER.record("log_write", mark, attributes={"format": self.log_format})
+            return
+        self._event_writer.emit(event)
 
     def _obfuscate_key(self) -> str:
-        if not self.license_token:
-            return "UNKNOWN"
-        sanitized = "".join(ch for ch in self.license_token if ch.isalnum()).upper()
-        if not sanitized:
-            sanitized = self.license_token[-4:].upper()
-        tail = sanitized[-4:] if len(sanitized) >= 4 else sanitized
-        return f"XXXX-XXXX-{tail}"
+        return obfuscate_token(self.license_token)
+
+
+def obfuscate_token(token: Optional[str]) -> str:
+    """Return a log-safe form of ``token`` that keeps only its last four characters."""
+
+    if not token:
+        return "UNKNOWN"
+    # Scan from the end: only the last four alphanumerics are kept.
+    tail = ""
+    for ch in reversed(token):
+        if ch.isalnum():
+            tail = ch + tail
+            if len(tail) == 4:
+                break
+    return f"XXXX-XXXX-{(tail or token[-4:]).upper()}"
 
 
 __all__ = [
     "LicenseManager",
     "LicenseValidationError",
     "LicenseStatus",
+    "REASON_IO",
+    "REASON_NO_TOKEN",
+    "obfuscate_token",
 ]
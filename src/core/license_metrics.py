@@ -0,0 +1,238 @@
+"""In-process counters and latency histograms for license validation.
+
+Collection is off unless ``LICENSE_METRICS`` is set to a true value or
+:func:`enable_metrics` is called (the ``serve`` daemon does this). Hot paths
+check :attr:`MetricsRegistry.enabled` before touching the clock, so the
+disabled cost is a single attribute read. :func:`render_metrics` returns the
+Prometheus text exposition format.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; validation phases range from microseconds (cached) to milliseconds.
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with a fixed set of label names."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}" for labels, value in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values (seconds)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (+Inf last), sum].
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[0]) if series else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._series.items())
+        names = self.labelnames + ("le",)
+        lines = []
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip([*self.buckets, float("inf")], counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(names, (*labels, le))} {cumulative}")
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(total)}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of named metrics with an on/off switch."""
+
+    def __init__(self, *, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._metrics: Dict[str, "Counter | Histogram"] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def reset(self) -> None:
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry(
+    enabled=os.getenv("LICENSE_METRICS", "").strip().lower() in {"1", "true", "yes", "on"}
+)
+
+VALIDATIONS = REGISTRY.counter(
+    "shopsaavy_license_validations_total",
+    "License validations by outcome and reason.",
+    ("outcome", "reason"),
+)
+CACHE_LOOKUPS = REGISTRY.counter(
+    "shopsaavy_license_cache_lookups_total",
+    "Lookups in the public key, verification and snapshot caches.",
+    ("cache", "result"),
+)
+KEY_LOADS = REGISTRY.counter(
+    "shopsaavy_license_key_loads_total",
+    "Public keys read and parsed (cache misses).",
+    ("source",),
+)
+PHASE_SECONDS = REGISTRY.histogram(
+    "shopsaavy_license_phase_seconds",
+    "Latency of each validation phase.",
+    ("phase",),
+)
+
+
+def enable_metrics() -> None:
+    REGISTRY.enabled = True
+
+
+def disable_metrics() -> None:
+    REGISTRY.enabled = False
+
+
+def render_metrics() -> str:
+    """Return every license metric in Prometheus text format."""
+
+    return REGISTRY.render()
+
+
+def observe_phase(phase: str, started: float) -> float:
+    """Record the time since ``started`` for ``phase`` and return the current clock."""
+
+    now = time.perf_counter()
+    PHASE_SECONDS.observe(now - started, phase)
+    return now
+
+
+def record_validation(outcome: str, reason: str, seconds: "float | None" = None) -> None:
+    VALIDATIONS.inc(outcome, reason)
+    if seconds is not None:
+        PHASE_SECONDS.observe(seconds, "total")
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.inc(cache, "hit" if hit else "miss")
+
+
+__all__ = [
+    "CACHE_LOOKUPS",
+    "CONTENT_TYPE",
+    "Counter",
+    "Histogram",
+    "KEY_LOADS",
+    "MetricsRegistry",
+    "PHASE_SECONDS",
+    "REGISTRY",
+    "VALIDATIONS",
+    "disable_metrics",
+    "enable_metrics",
+    "observe_phase",
+    "record_cache_lookup",
+    "record_validation",
+    "render_metrics",
+]
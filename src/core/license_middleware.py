@@ -0,0 +1,209 @@
+"""ASGI and WSGI middleware that gate requests on the license.
+
+Signatures are never checked per request. A :class:`LicenseGate` validates
+once at startup and then again from a background thread, shortly before the
+license expires and periodically so that a renewed token is picked up. Each
+request compares the clock with the cached expiry and, if the license is not
+valid, gets a prebuilt response:
+
+* ``402 Payment Required`` when the license is invalid, expired or revoked;
+* ``503 Service Unavailable`` (with ``Retry-After``) while the license cannot
+  be checked: not validated yet, public key missing, I/O errors or rate
+  limiting.
+
+Usage::
+
+    app = LicenseASGIMiddleware(app, exempt_paths={"/healthz"})
+    application = LicenseWSGIMiddleware(application)
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .license_admission import REASON_RATE_LIMITED
+from .license_manager import REASON_IO, LicenseManager, LicenseValidationError
+from .license_verifier import REASON_EXPIRED, REASON_KEY, REASON_OK
+
+# Failures that say nothing about the license itself.
+UNAVAILABLE_REASONS = frozenset({REASON_IO, REASON_KEY, REASON_RATE_LIMITED})
+
+_STATUS_LINES = {402: "402 Payment Required", 503: "503 Service Unavailable"}
+
+Denial = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+
+class LicenseGate:
+    """Cached, expiry-aware license decision shared by the middlewares.
+
+    Requests are allowed while ``time.time() < valid_until``. The background
+    thread refreshes ``refresh_margin`` seconds before expiry, at least every
+    ``refresh_interval`` seconds, and every ``retry_interval`` seconds after a
+    failure. Each refresh re-reads the token from its source first. A
+    refresh that fails for an :data:`UNAVAILABLE_REASONS` reason keeps an
+    already verified license until its expiry.
+    """
+
+    def __init__(
+        self,
+        manager: Optional[LicenseManager] = None,
+        *,
+        refresh_margin: float = 300.0,
+        refresh_interval: float = 3600.0,
+        retry_interval: float = 30.0,
+    ) -> None:
+        self.manager = manager if manager is not None else LicenseManager()
+        self.refresh_margin = refresh_margin
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.valid_until = 0.0
+        self.reason: Optional[str] = None
+        self.denial: Denial = self._build_denial(None, "License has not been checked yet.")
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self, *, reload: bool = False) -> bool:
+        """Validate now and update the cached decision; return whether it is valid."""
+
+        with self._refresh_lock:
+            try:
+                if reload:
+                    self.manager.reload_credentials()
+                else:
+                    self.manager.validate_license()
+            except LicenseValidationError as exc:
+                self.reason = exc.reason
+                if exc.reason in UNAVAILABLE_REASONS and time.time() < self.valid_until:
+                    # Already verified: a transient failure does not revoke it.
+                    return False
+                self.denial = self._build_denial(exc.reason, str(exc), exc.retry_after)
+                self.valid_until = 0.0
+                return False
+            # Until the next refresh, the only way to be denied is to expire.
+            self.denial = self._build_denial(REASON_EXPIRED, "License expired.")
+            self.reason = REASON_OK
+            self.valid_until = float(self.manager.expires_at or 0)
+            return True
+
+    def start(self) -> "LicenseGate":
+        """Validate synchronously, then keep refreshing in a daemon thread."""
+
+        if self._thread is None:
+            self.refresh()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="license-gate", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join(timeout)
+
+    def next_delay(self, now: Optional[float] = None) -> float:
+        """Seconds until the next background refresh."""
+
+        now = time.time() if now is None else now
+        remaining = self.valid_until - now
+        if remaining <= 0:
+            return self.retry_interval
+        if self.reason == REASON_OK and remaining > self.refresh_margin:
+            return min(self.refresh_interval, remaining - self.refresh_margin)
+        # Inside the margin, or after a transient failure: retry regularly, and
+        # at expiry at the latest.
+        return min(self.retry_interval, remaining)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.next_delay()):
+            self.refresh(reload=True)
+
+    def _build_denial(self, reason: Optional[str], message: str, retry_after: Optional[float] = None) -> Denial:
+        unavailable = reason is None or reason in UNAVAILABLE_REASONS
+        status = 503 if unavailable else 402
+        body = json.dumps({"valid": False, "reason": reason, "message": message}).encode("utf-8")
+        headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode("ascii"))]
+        if unavailable:
+            seconds = retry_after if retry_after is not None else self.retry_interval
+            headers.append((b"retry-after", str(max(1, int(seconds + 0.999))).encode("ascii")))
+        return status, headers, body
+
+
+class LicenseASGIMiddleware:
+    """Gate ``http`` and ``websocket`` scopes of an ASGI application."""
+
+    def __init__(
+        self,
+        app: Callable[..., Any],
+        gate: Optional[LicenseGate] = None,
+        *,
+        exempt_paths: Iterable[str] = (),
+        start: bool = True,
+    ) -> None:
+        self.app = app
+        self.gate = gate if gate is not None else LicenseGate()
+        self.exempt_paths = frozenset(exempt_paths)
+        if start:
+            self.gate.start()
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Any], send: Callable[..., Any]) -> None:
+        if time.time() < self.gate.valid_until:
+            return await self.app(scope, receive, send)
+        kind = scope["type"]
+        if kind == "lifespan" or scope.get("path") in self.exempt_paths:
+            return await self.app(scope, receive, send)
+        if kind == "websocket":
+            await send({"type": "websocket.close", "code": 1008})
+            return
+        status, headers, body = self.gate.denial
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+class LicenseWSGIMiddleware:
+    """Gate every request of a WSGI application."""
+
+    def __init__(
+        self,
+        app: Callable[..., Any],
+        gate: Optional[LicenseGate] = None,
+        *,
+        exempt_paths: Iterable[str] = (),
+        start: bool = True,
+    ) -> None:
+        self.app = app
+        self.gate = gate if gate is not None else LicenseGate()
+        self.exempt_paths = frozenset(exempt_paths)
+        # (gate denial, WSGI status line, str headers, body), rebuilt when the denial changes.
+        self._response: Tuple[Optional[Denial], str, List[Tuple[str, str]], bytes] = (None, "", [], b"")
+        if start:
+            self.gate.start()
+
+    def __call__(self, environ: Dict[str, Any], start_response: Callable[..., Any]) -> Iterable[bytes]:
+        if time.time() < self.gate.valid_until or environ.get("PATH_INFO") in self.exempt_paths:
+            return self.app(environ, start_response)
+        denial = self.gate.denial
+        response = self._response
+        if response[0] is not denial:
+            status, headers, body = denial
+            response = self._response = (
+                denial,
+                _STATUS_LINES[status],
+                [(name.decode("latin-1"), value.decode("latin-1")) for name, value in headers],
+                body,
+            )
+        _, status_line, str_headers, body = response
+        start_response(status_line, list(str_headers))
+        return [body]
+
+
+__all__ = [
+    "LicenseASGIMiddleware",
+    "LicenseGate",
+    "LicenseWSGIMiddleware",
+    "UNAVAILABLE_REASONS",
+]
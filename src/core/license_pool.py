@@ -0,0 +1,309 @@
+"""Validate licenses for many tenants from one process.
+
+A :class:`LicenseManagerPool` resolves configuration, the public key (or key
+set), the revocation list and the event writer once and shares them across
+tenants. Each tenant costs one compact :class:`TenantStatus` record held in an
+LRU map, so memory stays bounded by ``maxsize`` however many tenants come and
+go. Status snapshots are not written per tenant.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .license_expiry import EXPIRED, ExpiryEvent, ExpiryScheduler
+from .license_manager import (
+    LOG_ERROR,
+    LOG_INFO,
+    LOG_WARNING,
+    REASON_IO,
+    REASON_NO_TOKEN,
+    LicenseManager,
+    LicenseValidationError,
+    obfuscate_token,
+)
+from .license_verifier import (
+    REASON_EXPIRED,
+    REASON_KEY,
+    REASON_OK,
+    LicensePayload,
+    LicenseVerificationError,
+    normalize_token,
+    verify_many,
+    verify_token,
+)
+
+# Placeholder so the template manager skips the env/keyring/file token lookup.
+_TEMPLATE_TOKEN = "pool"
+
+_MESSAGES = {
+    REASON_OK: "License validation succeeded.",
+    REASON_EXPIRED: "License expired.",
+    REASON_NO_TOKEN: "No license token provided.",
+}
+
+
+class TenantStatus:
+    """Compact validation state for one tenant."""
+
+    __slots__ = ("token", "reason", "message", "identifier", "product", "version", "expiry", "validated_at")
+
+    def __init__(self, token: str) -> None:
+        self.token = token
+        self.reason: Optional[str] = None
+        self.message: Optional[str] = None
+        self.identifier: Optional[str] = None
+        self.product: Optional[str] = None
+        self.version: Optional[str] = None
+        self.expiry = 0
+        self.validated_at = 0.0
+
+    @property
+    def valid(self) -> bool:
+        return self.reason == REASON_OK
+
+    def apply(self, reason: str, payload: Optional[LicensePayload], message: Optional[str], now: float) -> None:
+        self.reason = reason
+        self.message = None if reason == REASON_OK else message
+        self.validated_at = now
+        if payload is not None:
+            self.identifier = payload.identifier
+            # Product and version repeat across tenants; share one string each.
+            self.product = sys.intern(payload.product)
+            self.version = sys.intern(payload.version)
+            self.expiry = payload.expiry
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the same shape as :meth:`LicenseManager.get_license_status`."""
+
+        result: Dict[str, Any] = {"valid": self.valid}
+        if self.valid:
+            result["expiry"] = datetime.fromtimestamp(self.expiry, tz=timezone.utc).isoformat()
+            result["details"] = {
+                "identifier": self.identifier,
+                "product": self.product,
+                "version": self.version,
+            }
+        if self.token:
+            result["license_key"] = obfuscate_token(self.token)
+        if self.validated_at:
+            result["validated_at"] = datetime.fromtimestamp(self.validated_at, tz=timezone.utc).isoformat()
+        return result
+
+
+class LicenseManagerPool:
+    """Shared-configuration license validation for many tenants.
+
+    ``token_loader`` is called with a tenant id that is not (or no longer) in
+    the pool and should return its token or ``None``; evicted tenants are then
+    reloaded and revalidated on their next access. Manager keyword arguments
+    such as ``public_key_path`` or ``expected_product`` apply to every tenant.
+
+    With an ``expiry_scheduler`` every valid tenant is scheduled under its
+    tenant id, and its status flips to expired when the deadline passes
+    without any revalidation.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 100_000,
+        token_loader: Optional[Callable[[str], Optional[str]]] = None,
+        max_workers: Optional[int] = None,
+        expiry_scheduler: Optional[ExpiryScheduler] = None,
+        **manager_options: Any,
+    ) -> None:
+        self.maxsize = maxsize
+        self.token_loader = token_loader
+        self.max_workers = max_workers
+        self.expiry_scheduler = expiry_scheduler
+        self.config = LicenseManager(_TEMPLATE_TOKEN, **manager_options)
+        self._records: "OrderedDict[str, TenantStatus]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, tenant_id: object) -> bool:
+        return tenant_id in self._records
+
+    # Tenant management -----------------------------------------------
+
+    def add(self, tenant_id: str, token: str) -> None:
+        """Register or replace ``tenant_id``'s token; it is validated lazily."""
+
+        record = TenantStatus(normalize_token(token))
+        evicted: List[str] = []
+        with self._lock:
+            self._records[tenant_id] = record
+            self._records.move_to_end(tenant_id)
+            while len(self._records) > self.maxsize:
+                evicted.append(self._records.popitem(last=False)[0])
+        if self.expiry_scheduler is not None:
+            for key in (tenant_id, *evicted):
+                self.expiry_scheduler.cancel(key)
+
+    def add_many(self, tenants: Iterable[Tuple[str, str]]) -> None:
+        for tenant_id, token in tenants:
+            self.add(tenant_id, token)
+
+    def remove(self, tenant_id: str) -> None:
+        with self._lock:
+            self._records.pop(tenant_id, None)
+        if self.expiry_scheduler is not None:
+            self.expiry_scheduler.cancel(tenant_id)
+
+    def _record(self, tenant_id: str) -> Optional[TenantStatus]:
+        with self._lock:
+            record = self._records.get(tenant_id)
+            if record is not None:
+                self._records.move_to_end(tenant_id)
+                return record
+        if self.token_loader is None:
+            return None
+        token = self.token_loader(tenant_id)
+        if not token:
+            return None
+        self.add(tenant_id, token)
+        with self._lock:
+            return self._records.get(tenant_id)
+
+    # Validation ------------------------------------------------------
+
+    def validate(self, tenant_id: str) -> bool:
+        """Validate one tenant, raising :class:`LicenseValidationError` on failure."""
+
+        record = self._record(tenant_id)
+        if record is None or not record.token:
+            raise LicenseValidationError("No license token provided.", REASON_NO_TOKEN)
+
+        started = time.perf_counter()
+        payload: Optional[LicensePayload] = None
+        message: Optional[str] = None
+        if not self.config.public_key_path.exists():
+            reason = REASON_KEY
+            message = f"License public key not found at {self.config.public_key_path}"
+        else:
+            try:
+                payload = verify_token(
+                    self.config.public_keys(),
+                    record.token,
+                    expected_product=self.config.expected_product,
+                    expected_version=self.config.expected_version,
+                    cache=self.config.verification_cache,
+                    revocations=self.config.load_revocations(),
+                )
+                reason = REASON_EXPIRED if payload.is_expired else REASON_OK
+            except (OSError, LicenseVerificationError) as exc:
+                reason = getattr(exc, "reason", REASON_IO)
+                message = str(exc) or "Invalid license."
+        message = message or _MESSAGES.get(reason)
+        # Same lock as the expiry flip and status reads, so none sees a half-applied record.
+        with self._lock:
+            record.apply(reason, payload, message, time.time())
+        self._schedule(tenant_id, record)
+        self._log(tenant_id, record, started)
+        if reason != REASON_OK:
+            raise LicenseValidationError(message or "Invalid license.", reason)
+        return True
+
+    def validate_all(self) -> Dict[str, int]:
+        """Validate every tenant in the pool and return counts by reason.
+
+        Signatures are checked on a thread pool with the shared key and
+        revocation list loaded once for the whole run.
+        """
+
+        with self._lock:
+            tenants: List[Tuple[str, TenantStatus]] = list(self._records.items())
+        counts: Dict[str, int] = {}
+        if not tenants:
+            return counts
+
+        now = time.time()
+        if not self.config.public_key_path.exists():
+            message = f"License public key not found at {self.config.public_key_path}"
+            for tenant_id, record in tenants:
+                with self._lock:
+                    record.apply(REASON_KEY, None, message, now)
+                self._schedule(tenant_id, record)
+                self._log(tenant_id, record)
+            return {REASON_KEY: len(tenants)}
+
+        results = verify_many(
+            (record.token for _, record in tenants),
+            self.config.public_keys(),
+            expected_product=self.config.expected_product,
+            expected_version=self.config.expected_version,
+            max_workers=self.max_workers,
+            revocations=self.config.load_revocations(),
+        )
+        for (tenant_id, record), result in zip(tenants, results):
+            with self._lock:
+                record.apply(result.reason, result.payload, result.error or _MESSAGES.get(result.reason), now)
+            counts[result.reason] = counts.get(result.reason, 0) + 1
+            self._schedule(tenant_id, record)
+            self._log(tenant_id, record)
+        return counts
+
+    def get_license_status(self, tenant_id: str) -> Dict[str, Any]:
+        """Return a tenant's status, validating it on first access."""
+
+        record = self._record(tenant_id)
+        if record is None:
+            return {"valid": False}
+        if record.reason is None:
+            try:
+                self.validate(tenant_id)
+            except LicenseValidationError:
+                pass
+        with self._lock:
+            return record.to_dict()
+
+    def _schedule(self, tenant_id: str, record: TenantStatus) -> None:
+        if self.expiry_scheduler is None:
+            return
+        if record.valid:
+            self.expiry_scheduler.schedule(tenant_id, record.expiry, self._on_expiry_event)
+        else:
+            self.expiry_scheduler.cancel(tenant_id)
+
+    def _on_expiry_event(self, event: ExpiryEvent) -> None:
+        # Runs on the scheduler thread: check and flip the record under the lock.
+        with self._lock:
+            record = self._records.get(event.key)
+            if record is None or not record.valid or record.expiry != event.expiry:
+                return
+            if event.kind == EXPIRED:
+                record.apply(REASON_EXPIRED, None, _MESSAGES[REASON_EXPIRED], time.time())
+        if event.kind == EXPIRED:
+            self._log(event.key, record)
+        else:
+            days = max(0, round((event.expiry - time.time()) / 86400))
+            self.config.log_event(
+                f"License expires in {days} days.",
+                LOG_WARNING,
+                extra={"tenant": event.key, "key": obfuscate_token(record.token)},
+            )
+
+    def _log(self, tenant_id: str, record: TenantStatus, started: Optional[float] = None) -> None:
+        assert record.reason is not None
+        if record.valid:
+            message, level = _MESSAGES[REASON_OK], LOG_INFO
+        else:
+            message, level = f"License validation failed: {record.message}", LOG_ERROR
+        self.config.log_event(
+            message,
+            level,
+            reason=record.reason,
+            started=started,
+            extra={"tenant": tenant_id, "key": obfuscate_token(record.token)},
+        )
+
+
+__all__ = ["LicenseManagerPool", "TenantStatus"]
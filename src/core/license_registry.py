@@ -0,0 +1,334 @@
+"""Issuer-side registry of every license token that was handed out.
+
+Records live in a SQLite file with indexes on ``(identifier, expiry)`` and
+``expiry``, so "what expires in the next 30 days" and "which tokens did tenant
+X get" are index range scans even with millions of rows. Only a SHA-256 of the
+token is stored, never the token itself.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .license_snapshot import token_hash
+from .license_verifier import canonical_token, decode_token, normalize_token
+
+DEFAULT_REGISTRY_PATH = "license_registry.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS licenses (
+    id INTEGER PRIMARY KEY,
+    identifier TEXT NOT NULL,
+    product TEXT NOT NULL,
+    version TEXT NOT NULL,
+    expiry INTEGER NOT NULL,
+    key_id INTEGER NOT NULL DEFAULT 0,
+    token_hash TEXT NOT NULL UNIQUE,
+    issued_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS licenses_identifier_expiry ON licenses (identifier, expiry);
+CREATE INDEX IF NOT EXISTS licenses_expiry ON licenses (expiry);
+"""
+
+_COLUMNS = ("identifier", "product", "version", "expiry", "key_id", "token_hash", "issued_at")
+_INSERT = (
+    f"INSERT OR IGNORE INTO licenses ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+
+
+class RegistryRecord(NamedTuple):
+    """One issued token as stored in the registry."""
+
+    identifier: str
+    product: str
+    version: str
+    expiry: int
+    key_id: int
+    token_hash: str
+    issued_at: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = self._asdict()
+        data["key_id"] = f"{self.key_id:08x}"
+        return data
+
+
+def record_for_token(
+    token: str,
+    *,
+    issued_at: Optional[int] = None,
+    key_id: Optional[int] = None,
+) -> RegistryRecord:
+    """Build a record from a raw or grouped token (the signature is not checked).
+
+    v1 tokens do not carry a key id, so the issuer passes ``key_id`` (see
+    :func:`core.gen_license.key_id_for`); otherwise the payload's is used. The
+    hash covers the canonical spelling, so raw and ``SSK-`` forms match.
+    """
+
+    normalized = normalize_token(token)
+    payload, _, _ = decode_token(normalized)
+    return RegistryRecord(
+        payload.identifier,
+        payload.product,
+        payload.version,
+        payload.expiry,
+        payload.key_id if key_id is None else key_id,
+        token_hash(canonical_token(normalized)),
+        int(time.time()) if issued_at is None else issued_at,
+    )
+
+
+class LicenseRegistry:
+    """SQLite-backed store of issued tokens."""
+
+    def __init__(self, path: "os.PathLike[str] | str" = DEFAULT_REGISTRY_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "LicenseRegistry":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # Writing ---------------------------------------------------------
+
+    def record(self, token: str, *, issued_at: Optional[int] = None, key_id: Optional[int] = None) -> bool:
+        """Record one token; return ``False`` if it was already registered."""
+
+        with self._conn:
+            cursor = self._conn.execute(_INSERT, record_for_token(token, issued_at=issued_at, key_id=key_id))
+        return cursor.rowcount == 1
+
+    def record_many(
+        self,
+        tokens: Iterable[str],
+        *,
+        batch_size: int = 10_000,
+        key_id: Optional[int] = None,
+    ) -> int:
+        """Insert ``tokens`` in batched transactions and return how many were new."""
+
+        issued_at = int(time.time())
+        added = 0
+        batch: List[RegistryRecord] = []
+        for token in tokens:
+            batch.append(record_for_token(token, issued_at=issued_at, key_id=key_id))
+            if len(batch) >= batch_size:
+                added += self._insert(batch)
+                batch = []
+        if batch:
+            added += self._insert(batch)
+        return added
+
+    def record_stream(
+        self,
+        records: Iterable[Dict[str, Any]],
+        *,
+        batch_size: int = 10_000,
+        key_id: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield ``records`` unchanged while registering each record's ``token``.
+
+        Rows are inserted in batches of ``batch_size`` per transaction, so this
+        can sit between bulk issuance and its output without buffering the run.
+        """
+
+        issued_at = int(time.time())
+        batch: List[RegistryRecord] = []
+        for record in records:
+            batch.append(record_for_token(record["token"], issued_at=issued_at, key_id=key_id))
+            yield record
+            if len(batch) >= batch_size:
+                self._insert(batch)
+                batch = []
+        if batch:
+            self._insert(batch)
+
+    def _insert(self, batch: List[RegistryRecord]) -> int:
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(_INSERT, batch)
+            return self._conn.total_changes - before
+
+    # Reading ---------------------------------------------------------
+
+    def _where(
+        self,
+        *,
+        identifier: Optional[str] = None,
+        product: Optional[str] = None,
+        expires_after: Optional[int] = None,
+        expires_before: Optional[int] = None,
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if identifier is not None:
+            clauses.append("identifier = ?")
+            params.append(identifier)
+        if product is not None:
+            clauses.append("product = ?")
+            params.append(product)
+        if expires_after is not None:
+            clauses.append("expiry >= ?")
+            params.append(expires_after)
+        if expires_before is not None:
+            clauses.append("expiry < ?")
+            params.append(expires_before)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, *, limit: Optional[int] = None, **filters: Any) -> Iterator[RegistryRecord]:
+        """Stream matching records ordered by expiry.
+
+        Filters: ``identifier``, ``product``, ``expires_after`` and
+        ``expires_before`` (Unix seconds, half-open range).
+        """
+
+        where, params = self._where(**filters)
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM licenses{where} ORDER BY expiry, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        cursor = self._conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            for row in rows:
+                yield RegistryRecord(*row)
+
+    def count(self, **filters: Any) -> int:
+        where, params = self._where(**filters)
+        return self._conn.execute(f"SELECT COUNT(*) FROM licenses{where}", params).fetchone()[0]
+
+    def expiring_within(self, seconds: int, *, now: Optional[int] = None, **filters: Any) -> Iterator[RegistryRecord]:
+        """Stream unexpired records whose expiry falls within ``seconds`` from ``now``."""
+
+        now = int(time.time()) if now is None else now
+        return self.query(expires_after=now, expires_before=now + seconds, **filters)
+
+
+def write_registry_records(records: Iterable[RegistryRecord], out: IO[str], output_format: str) -> int:
+    """Write ``records`` as JSONL or CSV and return how many were written."""
+
+    count = 0
+    if output_format == "csv":
+        writer = csv.DictWriter(out, fieldnames=list(_COLUMNS))
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record.to_dict())
+            count += 1
+    else:
+        for record in records:
+            out.write(json.dumps(record.to_dict()) + "\n")
+            count += 1
+    out.flush()
+    return count
+
+
+def _tokens_from_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield tokens from bulk-issuance JSONL records or plain token lines."""
+
+    for line in lines:
+        entry = line.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        yield json.loads(entry)["token"] if entry.startswith("{") else entry
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query and update the issued-license registry")
+    parser.add_argument(
+        "--db",
+        default=os.getenv("LICENSE_REGISTRY_PATH", DEFAULT_REGISTRY_PATH),
+        help="Registry SQLite file (default: $LICENSE_REGISTRY_PATH or license_registry.sqlite)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("import", help="Record tokens from a file of tokens or gen_license JSONL")
+    add.add_argument("source", help="Input file ('-' for stdin)")
+    add.add_argument("--batch-size", type=int, default=10_000, help="Rows per transaction")
+    add.add_argument(
+        "--key-id",
+        type=lambda value: int(value, 16),
+        help="Hex key id of the signing key, for v1 tokens (default: 0)",
+    )
+
+    for name, description in (("query", "Print matching records"), ("export", "Stream matching records")):
+        command = commands.add_parser(name, help=description)
+        command.add_argument("--identifier", help="Only this identifier")
+        command.add_argument("--product", help="Only this product")
+        command.add_argument("--expiring-within", type=float, metavar="DAYS", help="Unexpired, expiring within DAYS")
+        command.add_argument("--expired", action="store_true", help="Only expired records")
+        command.add_argument("--format", choices=["jsonl", "csv"], default="jsonl", help="Output format")
+        command.add_argument("--output", default="-", help="Output file (default: stdout)")
+        if name == "query":
+            command.add_argument("--limit", type=int, default=100, help="Maximum rows (0 for no limit)")
+            command.add_argument("--count", action="store_true", help="Print only the number of matches")
+
+    args = parser.parse_args(argv)
+
+    with LicenseRegistry(args.db) as registry:
+        if args.command == "import":
+            source = sys.stdin if args.source == "-" else open(args.source, encoding="utf-8")
+            try:
+                added = registry.record_many(
+                    _tokens_from_lines(source),
+                    batch_size=args.batch_size,
+                    key_id=args.key_id,
+                )
+            finally:
+                if source is not sys.stdin:
+                    source.close()
+            print(f"Registered {added} new tokens in {args.db}", file=sys.stderr)
+            return 0
+
+        now = int(time.time())
+        filters: Dict[str, Any] = {"identifier": args.identifier, "product": args.product}
+        if args.expired:
+            filters["expires_before"] = now
+        elif args.expiring_within is not None:
+            filters["expires_after"] = now
+            filters["expires_before"] = now + int(args.expiring_within * 86400)
+
+        if getattr(args, "count", False):
+            print(registry.count(**filters))
+            return 0
+        limit = getattr(args, "limit", 0) or None
+        sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+        try:
+            write_registry_records(registry.query(limit=limit, **filters), sink, args.format)
+        finally:
+            if sink is not sys.stdout:
+                sink.close()
+    return 0
+
+
+__all__ = [
+    "DEFAULT_REGISTRY_PATH",
+    "LicenseRegistry",
+    "RegistryRecord",
+    "record_for_token",
+    "write_registry_records",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
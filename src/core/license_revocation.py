@@ -0,0 +1,235 @@
+"""Signed, memory-mapped revocation lists for license tokens.
+
+File layout (little endian)::
+
+    header   magic "SSRL" | version u8 | 3 pad bytes | count u64 | created u64
+    index    65537 x u32  - start offset of each bucket (first two digest bytes)
+    entries  count x 16-byte truncated SHA-256 digests, sorted
+    trailer  64-byte Ed25519 signature over DOMAIN + SHA-512(header..entries)
+
+Identifiers and tokens are hashed with distinct prefixes so both share one
+array. A lookup reads one bucket range from the map and binary searches the
+few entries inside it, so the cost stays flat as the list grows.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .license_keys import KeySet
+from .license_verifier import (
+    REASON_REVOKED,
+    LicensePayload,
+    LicenseVerificationError,
+    TokenSource,
+    _load_public_key,
+    canonical_token,
+    public_key_fingerprint,
+)
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+MAGIC = b"SSRL"
+FORMAT_VERSION = 1
+DIGEST_SIZE = 16
+SIGNATURE_SIZE = 64
+DOMAIN = b"shopsaavy-revocations-v1"
+REASON_REVOCATION_LIST = "revocation_list"
+
+_HEADER = struct.Struct("<4sB3xQQ")
+_BUCKETS = 1 << 16
+_INDEX = struct.Struct(f"<{_BUCKETS + 1}I")
+_ENTRIES_OFFSET = _HEADER.size + _INDEX.size
+
+
+def identifier_digest(identifier: str) -> bytes:
+    return hashlib.sha256(b"id:" + identifier.encode("utf-8")).digest()[:DIGEST_SIZE]
+
+
+def token_digest(normalized_token: str) -> bytes:
+    # Hash the canonical spelling so padding variants of a token share a digest.
+    token = canonical_token(normalized_token)
+    return hashlib.sha256(b"token:" + token.encode("utf-8")).digest()[:DIGEST_SIZE]
+
+
+def _signed_message(body: "bytes | memoryview | mmap.mmap") -> bytes:
+    return DOMAIN + hashlib.sha512(body).digest()
+
+
+def _trusted_keys(public_key: TokenSource) -> List[Ed25519PublicKey]:
+    if isinstance(public_key, KeySet):
+        return [entry.key for entry in public_key]
+    return [_load_public_key(public_key)]
+
+
+class RevocationList:
+    """Read-only view of a verified revocation list file.
+
+    ``public_key`` may be a :class:`~core.license_keys.KeySet`; the list is
+    accepted if any of its keys signed it.
+    """
+
+    def __init__(self, path: Path, public_key: TokenSource) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._count, self.created = self._validate(public_key)
+        except Exception:
+            self._map.close()
+            raise
+
+    def _validate(self, public_key: TokenSource) -> Tuple[int, int]:
+        from cryptography.exceptions import InvalidSignature
+
+        size = len(self._map)
+        if size < _ENTRIES_OFFSET + SIGNATURE_SIZE:
+            raise LicenseVerificationError("Revocation list is truncated.", REASON_REVOCATION_LIST)
+        magic, version, count, created = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise LicenseVerificationError("Unsupported revocation list format.", REASON_REVOCATION_LIST)
+        body_size = _ENTRIES_OFFSET + count * DIGEST_SIZE
+        if size != body_size + SIGNATURE_SIZE:
+            raise LicenseVerificationError("Revocation list is truncated.", REASON_REVOCATION_LIST)
+
+        with memoryview(self._map) as view:
+            message = _signed_message(view[:body_size])
+        signature = self._map[body_size:]
+        for key in _trusted_keys(public_key):
+            try:
+                key.verify(signature, message)
+            except InvalidSignature:
+                continue
+            return count, created
+        raise LicenseVerificationError("Invalid revocation list signature.", REASON_REVOCATION_LIST)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._map.close()
+
+    def contains_digest(self, digest: bytes) -> bool:
+        bucket = int.from_bytes(digest[:2], "big")
+        lo, hi = struct.unpack_from("<II", self._map, _HEADER.size + bucket * 4)
+        data = self._map
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = _ENTRIES_OFFSET + mid * DIGEST_SIZE
+            probe = data[start : start + DIGEST_SIZE]
+            if probe == digest:
+                return True
+            if probe < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return False
+
+    def is_identifier_revoked(self, identifier: str) -> bool:
+        return self.contains_digest(identifier_digest(identifier))
+
+    def is_token_revoked(self, normalized_token: str) -> bool:
+        return self.contains_digest(token_digest(normalized_token))
+
+    def check(self, normalized_token: str, payload: LicensePayload) -> None:
+        """Raise :class:`LicenseVerificationError` if the token or its identifier is revoked."""
+
+        if self.is_token_revoked(normalized_token) or self.is_identifier_revoked(payload.identifier):
+            raise LicenseVerificationError("License revoked.", REASON_REVOKED)
+
+    def digests(self) -> Iterator[bytes]:
+        for index in range(self._count):
+            start = _ENTRIES_OFFSET + index * DIGEST_SIZE
+            yield self._map[start : start + DIGEST_SIZE]
+
+
+_LISTS: Dict[Tuple[str, int, int, int, bytes], RevocationList] = {}
+_LISTS_LOCK = threading.Lock()
+
+
+def load_revocation_list(path: Path, public_key: TokenSource) -> RevocationList:
+    """Return a verified list for ``path``, reusing it until the file or key changes."""
+
+    if isinstance(public_key, KeySet):
+        key: TokenSource = public_key
+        fingerprint = public_key.fingerprint()
+    else:
+        key = _load_public_key(public_key)
+        fingerprint = public_key_fingerprint(key)
+    resolved = Path(path).resolve()
+    stat = os.stat(resolved)
+    cache_key = (str(resolved), stat.st_mtime_ns, stat.st_size, stat.st_ino, fingerprint)
+    with _LISTS_LOCK:
+        cached = _LISTS.get(cache_key)
+        if cached is not None:
+            return cached
+    revocations = RevocationList(resolved, key)
+    with _LISTS_LOCK:
+        for stale in [entry for entry in _LISTS if entry[0] == cache_key[0]]:
+            del _LISTS[stale]
+        _LISTS[cache_key] = revocations
+    return revocations
+
+
+def build_revocation_list(
+    digests: Iterable[bytes],
+    private_key: Ed25519PrivateKey,
+    *,
+    created: Optional[int] = None,
+) -> bytes:
+    """Serialize and sign a revocation list containing ``digests``."""
+
+    entries = sorted({bytes(digest[:DIGEST_SIZE]) for digest in digests})
+    offsets = [0] * (_BUCKETS + 1)
+    for entry in entries:
+        offsets[int.from_bytes(entry[:2], "big") + 1] += 1
+    for bucket in range(_BUCKETS):
+        offsets[bucket + 1] += offsets[bucket]
+
+    body = b"".join(
+        [
+            _HEADER.pack(MAGIC, FORMAT_VERSION, len(entries), int(time.time()) if created is None else created),
+            _INDEX.pack(*offsets),
+            *entries,
+        ]
+    )
+    return body + private_key.sign(_signed_message(body))
+
+
+def write_revocation_list(path: Path, data: bytes) -> None:
+    """Atomically replace ``path`` with ``data`` (world-readable; it ships with the app)."""
+
+    import tempfile
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+__all__ = [
+    "REASON_REVOCATION_LIST",
+    "RevocationList",
+    "build_revocation_list",
+    "identifier_digest",
+    "load_revocation_list",
+    "token_digest",
+    "write_revocation_list",
+]
@@ -0,0 +1,178 @@
+"""Persisted license status snapshots protected by an HMAC.
+
+The HMAC key mixes the credentials with a random per-install secret that only
+the owner can read, so a snapshot cannot be forged from public inputs.
+Hashing and temp-file modules are imported on use to keep CLI start-up cheap.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+SNAPSHOT_VERSION = 1
+SECRET_SIZE = 32
+
+
+def load_secret(path: Path, *, create: bool = True) -> bytes:
+    """Return the per-install snapshot secret at ``path``, creating it on first use.
+
+    The file is created with mode 0600; with ``create=False`` a missing file
+    raises :class:`FileNotFoundError` instead, so readers leave no trace. An
+    existing file that other users can access, or that is not owned by the
+    current user, is refused with :class:`PermissionError`.
+    """
+
+    path = Path(path)
+    if not create:
+        return _read_secret(path)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return _read_secret(path)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return load_secret(path)
+    secret = os.urandom(SECRET_SIZE)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(secret)
+    return secret
+
+
+def _read_secret(path: Path) -> bytes:
+    if os.name != "nt":
+        stat = path.stat()
+        if stat.st_mode & 0o077 or stat.st_uid != os.getuid():
+            raise PermissionError(f"Snapshot key {path} must be private to its owner (mode 0600)")
+    secret = path.read_bytes()
+    if len(secret) != SECRET_SIZE:
+        raise OSError(f"Snapshot key {path} is not {SECRET_SIZE} bytes")
+    return secret
+
+
+def token_hash(normalized_token: str) -> str:
+    """Return the hex SHA-256 digest of a normalized token."""
+
+    import hashlib
+
+    return hashlib.sha256(normalized_token.encode("utf-8")).hexdigest()
+
+
+def snapshot_binding(
+    public_key_path: Path,
+    normalized_token: str,
+    expected_product: Optional[str] = None,
+    expected_version: Optional[str] = None,
+    *,
+    extra: str = "",
+    secret: bytes = b"",
+) -> bytes:
+    """Derive the HMAC key binding a snapshot to the current credentials.
+
+    The binding covers a digest of the public key file (or key directory), the
+    token hash and the expected product/version (plus any ``extra`` context such
+    as the revocation list version), so changing any of them invalidates the
+    snapshot without any signature work. ``secret`` (see :func:`load_secret`)
+    keeps the key out of reach of anyone who can only write the snapshot.
+    """
+
+    import hashlib
+
+    key_path = Path(public_key_path)
+    if key_path.is_dir():
+        # Key directory: cover every file so adding or editing a key counts.
+        key_hash = hashlib.sha256()
+        for child in sorted(key_path.iterdir()):
+            if child.is_file():
+                key_hash.update(child.name.encode("utf-8") + b"\0" + child.read_bytes())
+        key_digest = key_hash.hexdigest()
+    else:
+        key_digest = hashlib.sha256(key_path.read_bytes()).hexdigest()
+    material = "\n".join(
+        [
+            key_digest,
+            token_hash(normalized_token),
+            expected_product or "",
+            expected_version or "",
+            extra,
+        ]
+    )
+    return hashlib.sha256(secret + material.encode("utf-8")).digest()
+
+
+def write_snapshot(path: Path, binding: bytes, body: Dict[str, Any]) -> None:
+    """Atomically replace ``path`` with ``body`` signed by ``binding``."""
+
+    import hashlib
+    import hmac
+    import tempfile
+
+    data = json.dumps({"version": SNAPSHOT_VERSION, **body}, sort_keys=True, default=str).encode("utf-8")
+    mac = hmac.new(binding, data, hashlib.sha256).hexdigest().encode("ascii")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(mac + b"\n" + data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_snapshot(path: Path, binding: bytes, *, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Return the snapshot body if it is authentic and unexpired, else ``None``."""
+
+    import hashlib
+    import hmac
+
+    try:
+        with open(path, "rb") as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                newline = view.find(b"\n")
+                if newline <= 0:
+                    return None
+                mac = view[:newline]
+                data = view[newline + 1 :]
+    except (OSError, ValueError):
+        return None
+
+    expected = hmac.new(binding, data, hashlib.sha256).hexdigest().encode("ascii")
+    if not hmac.compare_digest(mac, expected):
+        return None
+    try:
+        body = json.loads(data)
+    except ValueError:
+        return None
+    if body.get("version") != SNAPSHOT_VERSION:
+        return None
+    current = time.time() if now is None else now
+    if int(body.get("expires_at", 0)) <= current:
+        return None
+    return body
+
+
+def remove_snapshot(path: Path) -> None:
+    """Delete ``path`` if it exists."""
+
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+__all__ = [
+    "SECRET_SIZE",
+    "load_secret",
+    "read_snapshot",
+    "remove_snapshot",
+    "snapshot_binding",
+    "token_hash",
+    "write_snapshot",
+]
@@ -0,0 +1,283 @@
+"""Per-phase tracing spans for license validation.
+
+Tracing is off unless ``LICENSE_TRACE_PATH`` names a JSONL file or
+:func:`enable_tracing` is called with exporters. As with metrics, hot paths
+check :attr:`Tracer.enabled` before touching the clock, so the disabled cost
+is a single attribute read.
+
+A trace is one root span (``license.validate``, ``license.verify_token``, ...)
+with a child span per phase. Timings come from :func:`time.perf_counter`, so
+they are monotonic. Sampling is decided once per trace at the root, and
+children follow that decision. Finished traces are handed to every exporter
+as one batch when the root ends.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+# Converts perf_counter readings to wall-clock time for exported spans.
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+
+class Span:
+    """One timed operation; a context manager that ends itself on exit."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start",
+        "end",
+        "attributes",
+        "status",
+        "sampled",
+        "_tracer",
+        "_trace",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        parent: Optional["Span"],
+        start: float,
+        attributes: Optional[Dict[str, Any]],
+        sampled: bool,
+    ) -> None:
+        self.name = name
+        self.span_id = random.getrandbits(64)
+        if parent is None:
+            self.trace_id = random.getrandbits(64)
+            self.parent_id: Optional[int] = None
+            self._trace: List[Span] = []
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self._trace = parent._trace
+        self.start = start
+        self.end: Optional[float] = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.status = STATUS_OK
+        self.sampled = sampled
+        self._tracer = tracer
+        self._token = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        return None if self.end is None else self.end - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self._token = _CURRENT.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.status = STATUS_ERROR
+            self.attributes["error"] = exc_type.__name__
+            reason = getattr(exc, "reason", None)
+            if reason is not None:
+                self.attributes.setdefault("reason", reason)
+        if self._token is not None:
+            _CURRENT.reset(self._token)
+            self._token = None
+        self.finish()
+
+    def finish(self, end: Optional[float] = None) -> None:
+        if self.end is not None:
+            return
+        self.end = time.perf_counter() if end is None else end
+        if not self.sampled:
+            return
+        self._trace.append(self)
+        if self.parent_id is None:
+            self._tracer._export(self._trace)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": f"{self.trace_id:016x}",
+            "span_id": f"{self.span_id:016x}",
+            "parent_id": None if self.parent_id is None else f"{self.parent_id:016x}",
+            "name": self.name,
+            "start": round(self.start + _EPOCH_OFFSET, 6),
+            "duration_ms": None if self.end is None else round((self.end - self.start) * 1000, 4),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+_CURRENT: "ContextVar[Optional[Span]]" = ContextVar("license_span", default=None)
+
+
+class _NoSpan:
+    """Stand-in used when tracing is disabled; every method does nothing."""
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+
+NO_SPAN = _NoSpan()
+
+
+class InMemoryExporter:
+    """Keep finished spans in a list, for tests and interactive debugging."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        with self._lock:
+            self.spans.extend(spans)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return [span.name for span in self.spans]
+
+    def find(self, name: str) -> List[Span]:
+        with self._lock:
+            return [span for span in self.spans if span.name == name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class JsonlExporter:
+    """Append each span as one JSON object per line to ``path``."""
+
+    def __init__(self, path: "Path | str") -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Span]) -> None:
+        import json
+
+        data = "".join(json.dumps(span.to_dict(), default=str, separators=(",", ":")) + "\n" for span in spans)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(data)
+
+
+class Tracer:
+    """Create spans and hand sampled traces to the configured exporters.
+
+    ``sample_rate`` is the fraction of traces kept (1.0 keeps all). Exporter
+    errors are swallowed so tracing can never fail a validation.
+    """
+
+    def __init__(
+        self,
+        exporters: Sequence[Any] = (),
+        *,
+        sample_rate: float = 1.0,
+        enabled: bool = False,
+        sampler: Callable[[], float] = random.random,
+    ) -> None:
+        self.exporters: List[Any] = list(exporters)
+        self.sample_rate = sample_rate
+        self.enabled = enabled
+        self.sampler = sampler
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """Start a span under the current one; use it as a context manager."""
+
+        parent = _CURRENT.get()
+        sampled = self._sample() if parent is None else parent.sampled
+        return Span(self, name, parent, time.perf_counter(), attributes, sampled)
+
+    def record(
+        self,
+        name: str,
+        start: float,
+        end: Optional[float] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> float:
+        """Record a finished phase that began at ``start`` and return its end time.
+
+        This matches the ``mark = observe_phase(...)`` pattern of the metrics
+        module, so phases can be traced without restructuring the code.
+        """
+
+        end = time.perf_counter() if end is None else end
+        parent = _CURRENT.get()
+        sampled = self._sample() if parent is None else parent.sampled
+        if sampled:
+            Span(self, name, parent, start, attributes, True).finish(end)
+        return end
+
+    def current(self) -> "Span | _NoSpan":
+        """Return the active span, or :data:`NO_SPAN` outside any span."""
+
+        span = _CURRENT.get()
+        return NO_SPAN if span is None else span
+
+    def _sample(self) -> bool:
+        return self.sample_rate >= 1.0 or self.sampler() < self.sample_rate
+
+    def _export(self, spans: List[Span]) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception:
+                pass
+
+
+def _tracer_from_env() -> Tracer:
+    path = os.getenv("LICENSE_TRACE_PATH")
+    rate = float(os.getenv("LICENSE_TRACE_SAMPLE_RATE", "1") or 1)
+    return Tracer([JsonlExporter(path)] if path else [], sample_rate=rate, enabled=bool(path))
+
+
+TRACER = _tracer_from_env()
+
+
+def enable_tracing(*exporters: Any, sample_rate: Optional[float] = None) -> None:
+    """Turn tracing on, adding ``exporters`` and optionally changing the sample rate."""
+
+    TRACER.exporters.extend(exporters)
+    if sample_rate is not None:
+        TRACER.sample_rate = sample_rate
+    TRACER.enabled = True
+
+
+def disable_tracing() -> None:
+    """Turn tracing off and drop every exporter."""
+
+    TRACER.enabled = False
+    TRACER.exporters.clear()
+
+
+__all__ = [
+    "InMemoryExporter",
+    "JsonlExporter",
+    "NO_SPAN",
+    "STATUS_ERROR",
+    "STATUS_OK",
+    "Span",
+    "TRACER",
+    "Tracer",
+    "disable_tracing",
+    "enable_tracing",
+]
@@ -1,73 +1,282 @@
-"""Utilities for verifying signed license tokens."""
+"""Utilities for verifying signed license tokens.
+
+``cryptography``, ``hashlib`` and ``concurrent.futures`` are imported on first
+use so that callers which never check a signature start quickly.
+"""
 
 from __future__ import annotations
 
 import base64
+import os
+import struct
+import threading
 import time
-from dataclasses import dataclass
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Optional, Union
-
-from cryptography.exceptions import InvalidSignature
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+from typing import TYPE_CHECKING, Any, Deque, Dict, Hashable, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+
+from .license_metrics import KEY_LOADS, REGISTRY, observe_phase, record_cache_lookup
+from .license_tracing import TRACER
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from concurrent.futures import Future
+
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+    from .license_keys import KeySet
+    from .license_revocation import RevocationList
+
+
+TokenSource = Union[str, Path, bytes, "Ed25519PublicKey", "KeySet"]
+
+_RAW_PUBLIC_KEY_SIZE = 32
+_SIGNATURE_SIZE = 64
+
+TOKEN_V1 = 1
+TOKEN_V2 = 2
+
+# v2 token layout: version u8 | expiry u32 | key id u32 | flags u8, then the
+# identifier, product and version as u8-length-prefixed UTF-8, then a 64-byte
+# Ed25519 signature over everything before it. The blob is Base64URL encoded.
+_V2_HEADER = struct.Struct("<BIIB")
+_V2_MIN_SIZE = _V2_HEADER.size + 3 + _SIGNATURE_SIZE
+_V2_FLAGS_OFFSET = _V2_HEADER.size - 1
+
+# Entitlements are optional. In v2 they follow the strings when the flag bit
+# is set: features u64 | quota count u8, then per quota a u8-length-prefixed
+# name and a u32 value. In v1 they are a fifth "|" field holding the features
+# in hex, optionally followed by ";name=value,name=value".
+FLAG_ENTITLEMENTS = 0x80
+MAX_FEATURES = 64
+_V2_FEATURES = struct.Struct("<QB")
+_V2_QUOTA = struct.Struct("<I")
+
+Quotas = Tuple[Tuple[str, int], ...]
+
+# Feature names known to this process, mapped to their bit in the token.
+_FEATURE_BITS: Dict[str, int] = {}
+
+
+REASON_OK = "ok"
+REASON_MALFORMED = "malformed"
+REASON_SIGNATURE = "signature"
+REASON_PRODUCT_MISMATCH = "product_mismatch"
+REASON_VERSION_MISMATCH = "version_mismatch"
+REASON_EXPIRED = "expired"
+REASON_KEY = "key"
+REASON_REVOKED = "revoked"
+REASON_CHECKSUM = "checksum"
+
+# Longer input is rejected before any decoding; real tokens are a few hundred
+# characters in every format.
+MAX_TOKEN_LENGTH = 4096
+
+# Checksummed human form: "SSK-" then Crockford Base32 of the token bytes (the
+# v1 text or the v2 blob) in groups of five, then four check symbols holding
+# the low 20 bits of the CRC-32 of those bytes. Input is case-insensitive and
+# I/L/O are read as 1/1/0.
+HUMAN_PREFIX = "SSK-"
+# The prefix as it reads once separators are dropped ("SSKC5BN4..." is accepted).
+_HUMAN_MARK = HUMAN_PREFIX.rstrip("-")
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RFC4648_B32 = "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+_CROCKFORD_ALIASES = str.maketrans("ILO", "110")
+# Both alphabets map onto the digits int() accepts for base 32, which decodes
+# far faster than base64.b32decode.
+_INT_B32 = "0123456789abcdefghijklmnopqrstuv"
+_FROM_CROCKFORD = str.maketrans(_CROCKFORD, _INT_B32)
+_FROM_RFC4648_B32 = str.maketrans(_RFC4648_B32, _INT_B32)
+_CROCKFORD_CHARS = frozenset(_CROCKFORD)
+_CHECK_SYMBOLS = 4
+_B32_CHARS = frozenset(_RFC4648_B32)
+_B64URL_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+# Base32/Base64 text lengths (mod 8 / mod 4) that decode without error.
+_B32_LENGTHS = frozenset({0, 2, 4, 5, 7})
+_B64_LENGTHS = frozenset({0, 2, 3})
+
+_PRECHECK_MESSAGES = {
+    REASON_MALFORMED: "Malformed license token.",
+    REASON_CHECKSUM: "License key checksum mismatch; check it for typing errors.",
+}
 
 
-TokenSource = Union[str, Path]
+class LicenseVerificationError(Exception):
+    """Raised when a license token cannot be verified.
 
+    ``reason`` carries a short machine-readable code such as ``"signature"``.
+    """
 
-class LicenseVerificationError(Exception):
-    """Raised when a license token cannot be verified."""
+    def __init__(self, message: str, reason: str = REASON_MALFORMED) -> None:
+        super().__init__(message)
+        self.reason = reason
 
 
-@dataclass(frozen=True)
-class LicensePayload:
+class LicensePayload(NamedTuple):
     """Decoded contents of a license token."""
 
     identifier: str
     product: str
     version: str
     expiry: int
+    key_id: int = 0
+    flags: int = 0
+    features: int = 0
+    quotas: Quotas = ()
 
     @property
     def is_expired(self) -> bool:
         """Return whether the payload has expired."""
         return self.expiry < int(time.time())
 
-    def to_details(self) -> dict[str, str]:
+    def has_feature(self, feature: Union[str, int]) -> bool:
+        """Return whether the signed feature bitset grants ``feature`` (a name or bit)."""
+        return bool(self.features & feature_mask(feature))
+
+    def quota(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """Return the signed quota called ``name``, or ``default``."""
+        for key, value in self.quotas:
+            if key == name:
+                return value
+        return default
+
+    def to_details(self) -> dict[str, Any]:
         """Return a mapping of payload details for reporting."""
-        return {
+        details: dict[str, Any] = {
             "identifier": self.identifier,
             "product": self.product,
             "version": self.version,
         }
+        if self.features:
+            details["features"] = self.features
+        if self.quotas:
+            details["quotas"] = dict(self.quotas)
+        return details
+
+
+def define_features(features: "Dict[str, int]") -> None:
+    """Name feature bits so that they can be checked by name.
+
+    The issuer passes the same mapping to ``gen_license --feature-map``.
+    """
+
+    for name, bit in features.items():
+        if not 0 <= int(bit) < MAX_FEATURES:
+            raise ValueError(f"Feature bit for {name!r} must be between 0 and {MAX_FEATURES - 1}")
+    _FEATURE_BITS.update({name: int(bit) for name, bit in features.items()})
+
+
+def feature_mask(*features: Union[str, int]) -> int:
+    """Return the bitmask for feature names or bit numbers.
+
+    Callers on hot paths compute the mask once and test it with ``&``.
+    """
+
+    mask = 0
+    for feature in features:
+        if isinstance(feature, str):
+            try:
+                feature = _FEATURE_BITS[feature]
+            except KeyError:
+                raise ValueError(f"Unknown license feature {feature!r}; see define_features()") from None
+        mask |= 1 << feature
+    return mask
 
 
 def normalize_token(raw_token: str) -> str:
     """Return the canonical representation for the provided token.
 
-    Tokens may be supplied either as the raw ``BASE64URL.BASE64URL`` string or
-    encoded using the grouped Base32 format described in the operations guide.
-    This helper detects the Base32 variant, strips formatting, and returns the
-    decoded raw token string.
+    Tokens may be supplied either as the raw ``BASE64URL.BASE64URL`` (v1) or
+    ``BASE64URL`` (v2) string, in the checksummed ``SSK-`` human form, or in
+    the older grouped Base32 form. The format is told apart by character
+    checks, not by trying decoders. Unrecognised input is returned stripped
+    and fails later as malformed.
+    """
+
+    return _detect_token(raw_token)[0]
+
+
+def _detect_token(raw_token: str) -> Tuple[str, Optional[str]]:
+    """Return ``(normalized, failure reason or None)`` without raising.
+
+    Checks run cheapest first: length, then format markers and alphabet, then
+    the human-form checksum. Every decode below is only attempted on input
+    whose alphabet and length are known to decode.
     """
 
     token = raw_token.strip()
-    if not token:
-        return token
+    if not token or len(token) > MAX_TOKEN_LENGTH:
+        return token, REASON_MALFORMED
+    if "." in token:
+        # Only raw v1 tokens contain "."; neither Base32 form can.
+        return token, None
+    upper = token.upper()
+    collapsed = upper.replace("-", "").replace(" ", "")
+    if collapsed.startswith(_HUMAN_MARK):
+        return _decode_human(upper, collapsed[len(_HUMAN_MARK):])
+
+    stripped = token.rstrip("=")
+    if len(stripped) % 4 in _B64_LENGTHS and _B64URL_CHARS.issuperset(stripped):
+        if _looks_like_v2(_b64u_decode(stripped)):
+            return stripped, None
+
+    # Legacy grouped Base32 without a checksum.
+    collapsed = collapsed.rstrip("=")
+    if collapsed and len(collapsed) % 8 in _B32_LENGTHS and _B32_CHARS.issuperset(collapsed):
+        normalized = _from_token_bytes(_b32decode(collapsed.translate(_FROM_RFC4648_B32)))
+        if normalized is not None:
+            return normalized, None
+    return token, REASON_MALFORMED
+
+
+def _decode_human(upper: str, symbols: str) -> Tuple[str, Optional[str]]:
+    body = symbols.translate(_CROCKFORD_ALIASES)
+    data_part, check = body[:-_CHECK_SYMBOLS], body[-_CHECK_SYMBOLS:]
+    if (
+        not data_part
+        or len(data_part) % 8 not in _B32_LENGTHS
+        or not _CROCKFORD_CHARS.issuperset(body)
+    ):
+        return upper, REASON_MALFORMED
+    data = _b32decode(data_part.translate(_FROM_CROCKFORD))
+    if human_checksum(data) != check:
+        return upper, REASON_CHECKSUM
+    normalized = _from_token_bytes(data)
+    if normalized is None:
+        return upper, REASON_MALFORMED
+    return normalized, None
+
+
+def human_checksum(data: bytes) -> str:
+    """Return the check symbols the ``SSK-`` human form appends to ``data``."""
+
+    import binascii
+
+    value = binascii.crc32(data) & 0xFFFFF
+    return "".join(_CROCKFORD[(value >> shift) & 31] for shift in (15, 10, 5, 0))
 
-    # Remove separators commonly used in the human friendly representation.
-    collapsed = token.replace("-", "").replace(" ", "")
-    try:
-        # Base32 decoding requires correct padding; add it if necessary.
-        padding = (8 - len(collapsed) % 8) % 8
-        decoded = base64.b32decode(collapsed + ("=" * padding), casefold=True)
-        decoded_text = decoded.decode("utf-8")
-        if "." in decoded_text:
-            return decoded_text
-    except Exception:  # pragma: no cover - invalid input falls back to raw token
-        pass
-    return token
+
+def _b32decode(digits: str) -> bytes:
+    """Decode unpadded Base32 already translated to ``int()`` base-32 digits."""
+
+    size = len(digits) * 5 // 8
+    value = int(digits, 32) >> (len(digits) * 5 - size * 8)
+    return value.to_bytes(size, "big")
+
+
+def _from_token_bytes(data: bytes) -> Optional[str]:
+    """Map the bytes carried by a Base32 form back to a normalized token."""
+
+    if _looks_like_v2(data):
+        return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+    if data.isascii() and b"." in data:
+        return data.decode("ascii")
+    return None
+
+
+def token_version(token: str) -> int:
+    """Return the format version of a normalized token."""
+
+    return TOKEN_V1 if "." in token else TOKEN_V2
 
 
 def _b64u_decode(value: str) -> bytes:
@@ -75,29 +284,244 @@ def _b64u_decode(value: str) -> bytes:
     return base64.urlsafe_b64decode(value + padding)
 
 
-def _load_public_key(source: TokenSource) -> Ed25519PublicKey:
-    if isinstance(source, (str, Path)):
-        data = Path(source).read_bytes()
-    else:  # pragma: no cover - defensive branch, type guards ensure coverage
-        data = source
+def canonical_token(token: str) -> str:
+    """Return a normalized ``token`` with every Base64URL part re-encoded.
+
+    Decoding ignores ``=`` padding and the unused low bits of a part's last
+    character, so several spellings verify as the same token. Anything keyed
+    on token text (such as revocation digests) uses this single spelling.
+    Undecodable input is returned unchanged.
+    """
+
+    try:
+        return ".".join(
+            base64.urlsafe_b64encode(_b64u_decode(part.rstrip("="))).decode("ascii").rstrip("=")
+            for part in token.split(".")
+        )
+    except ValueError:
+        return token
+
+
+def _b64u_decode_or_none(value: str) -> Optional[bytes]:
+    try:
+        return _b64u_decode(value.rstrip("="))
+    except ValueError:
+        return None
+
+
+def _looks_like_v2(blob: bytes) -> bool:
+    """Check the v2 framing (version byte and field lengths) without decoding."""
+
+    size = len(blob)
+    if size < _V2_MIN_SIZE or blob[0] != TOKEN_V2:
+        return False
+    body_end = size - _SIGNATURE_SIZE
+    offset = _V2_HEADER.size
+    for _ in range(3):
+        if offset >= body_end:
+            return False
+        offset += 1 + blob[offset]
+    if blob[_V2_FLAGS_OFFSET] & FLAG_ENTITLEMENTS and offset <= body_end:
+        parsed = _read_v2_entitlements(blob, offset, body_end)
+        return parsed is not None and parsed[2] == body_end
+    return offset == body_end
+
+
+def _read_v2_entitlements(blob: "bytes | memoryview", offset: int, end: int) -> Optional[Tuple[int, Quotas, int]]:
+    """Return ``(features, quotas, end offset)`` or ``None`` if truncated."""
+
+    if offset + _V2_FEATURES.size > end:
+        return None
+    features, count = _V2_FEATURES.unpack_from(blob, offset)
+    offset += _V2_FEATURES.size
+    quotas = []
+    for _ in range(count):
+        if offset >= end:
+            return None
+        start = offset + 1
+        offset = start + blob[offset]
+        if offset + _V2_QUOTA.size > end:
+            return None
+        try:
+            name = str(blob[start:offset], "utf-8")
+        except UnicodeDecodeError:
+            return None
+        quotas.append((name, _V2_QUOTA.unpack_from(blob, offset)[0]))
+        offset += _V2_QUOTA.size
+    return features, tuple(quotas), offset
+
+
+def _split_v2(blob: bytes) -> Optional[Tuple[LicensePayload, memoryview, memoryview]]:
+    """Parse a v2 blob without copying; return ``None`` if it is not well formed."""
+
+    view = memoryview(blob)
+    if len(view) < _V2_MIN_SIZE or view[0] != TOKEN_V2:
+        return None
+    _, expiry, key_id, flags = _V2_HEADER.unpack_from(view)
+    body_end = len(view) - _SIGNATURE_SIZE
+    offset = _V2_HEADER.size
+    fields = []
+    for _ in range(3):
+        if offset >= body_end:
+            return None
+        start = offset + 1
+        offset = start + view[offset]
+        if offset > body_end:
+            return None
+        fields.append(view[start:offset])
+    features, quotas = 0, ()
+    if flags & FLAG_ENTITLEMENTS:
+        entitlements = _read_v2_entitlements(view, offset, body_end)
+        if entitlements is None:
+            return None
+        features, quotas, offset = entitlements
+    if offset != body_end:
+        return None
+    try:
+        identifier, product, version = [str(field, "utf-8") for field in fields]
+    except UnicodeDecodeError:
+        return None
+    payload = LicensePayload(
+        identifier, product, version, expiry, key_id=key_id, flags=flags, features=features, quotas=quotas
+    )
+    return payload, view[body_end:], view[:body_end]
+
+
+class KeyCacheInfo(NamedTuple):
+    """Counters describing the process-wide public key cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _PublicKeyCache:
+    """Bounded LRU cache of parsed public keys.
+
+    File sources are keyed by their resolved path together with the file's
+    ``(mtime_ns, size, inode)`` so that a replaced PEM is parsed again.
+    """
+
+    def __init__(self, maxsize: int = 32) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Ed25519PublicKey]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: Hashable) -> Optional[Ed25519PublicKey]:
+        with self._lock:
+            key = self._entries.get(cache_key)
+            if key is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+        if REGISTRY.enabled:
+            record_cache_lookup("public_key", key is not None)
+        return key
+
+    def put(self, cache_key: Hashable, key: Ed25519PublicKey) -> None:
+        with self._lock:
+            self._entries[cache_key] = key
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> KeyCacheInfo:
+        with self._lock:
+            return KeyCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+_KEY_CACHE = _PublicKeyCache()
+
+
+def _parse_public_key(data: bytes) -> Ed25519PublicKey:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+    if len(data) == _RAW_PUBLIC_KEY_SIZE:
+        try:
+            return Ed25519PublicKey.from_public_bytes(data)
+        except ValueError as exc:
+            raise LicenseVerificationError("Invalid raw Ed25519 public key.", REASON_KEY) from exc
     key = serialization.load_pem_public_key(data)
     if not isinstance(key, Ed25519PublicKey):
-        raise LicenseVerificationError("License public key must be Ed25519.")
+        raise LicenseVerificationError("License public key must be Ed25519.", REASON_KEY)
     return key
 
 
+def _load_public_key(source: TokenSource) -> Ed25519PublicKey:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        cache_key: Hashable = ("bytes", bytes(source))
+        key = _KEY_CACHE.get(cache_key)
+        if key is None:
+            key = _parse_public_key(bytes(source))
+            _KEY_CACHE.put(cache_key, key)
+            if REGISTRY.enabled:
+                KEY_LOADS.inc("bytes")
+        return key
+
+    if not isinstance(source, (str, Path)):
+        # Already a loaded Ed25519PublicKey.
+        return source
+
+    path = Path(source).resolve()
+    stat = os.stat(path)
+    cache_key = ("file", str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    key = _KEY_CACHE.get(cache_key)
+    if key is None:
+        key = _parse_public_key(path.read_bytes())
+        _KEY_CACHE.put(cache_key, key)
+        if REGISTRY.enabled:
+            KEY_LOADS.inc("file")
+    return key
+
+
+def public_key_cache_info() -> KeyCacheInfo:
+    """Return hit/miss counters for the process-wide public key cache."""
+
+    return _KEY_CACHE.info()
+
+
+def clear_public_key_cache() -> None:
+    """Drop every cached public key and reset the counters."""
+
+    _KEY_CACHE.clear()
+
+
 def decode_token(token: str) -> tuple[LicensePayload, bytes, bytes]:
-    """Decode a normalized token into its payload components."""
+    """Decode a normalized token into its payload, signature and signed bytes.
+
+    The format is detected automatically. For v2 tokens the signature and
+    signed bytes are ``memoryview`` slices of the decoded blob.
+    """
+
+    if "." not in token:
+        return _decode_v2(token)
 
     parts = token.split(".")
     if len(parts) != 2:
         raise LicenseVerificationError("Malformed license token.")
     payload_b64, signature_b64 = parts
-    payload_bytes = _b64u_decode(payload_b64)
-    signature_bytes = _b64u_decode(signature_b64)
+    try:
+        payload_bytes = _b64u_decode(payload_b64)
+        signature_bytes = _b64u_decode(signature_b64)
+    except ValueError as exc:
+        raise LicenseVerificationError("Malformed license token.") from exc
 
     try:
-        identifier, product, version, expiry_raw = payload_bytes.decode("utf-8").split("|")
+        identifier, product, version, expiry_raw, *extra = payload_bytes.decode("utf-8").split("|")
+        if len(extra) > 1:
+            raise ValueError("too many fields")
+        features, quotas = _parse_v1_entitlements(extra[0]) if extra else (0, ())
     except ValueError as exc:
         raise LicenseVerificationError("Invalid license payload structure.") from exc
 
@@ -111,42 +535,433 @@ def decode_token(token: str) -> tuple[LicensePayload, bytes, bytes]:
         product=product,
         version=version,
         expiry=expiry,
+        features=features,
+        quotas=quotas,
     ), signature_bytes, payload_bytes
 
 
+def _parse_v1_entitlements(field: str) -> Tuple[int, Quotas]:
+    features_hex, _, quota_text = field.partition(";")
+    features = int(features_hex, 16)
+    if features >> MAX_FEATURES:
+        raise ValueError("feature bitset too wide")
+    quotas = []
+    for item in quota_text.split(",") if quota_text else ():
+        name, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"malformed quota {item!r}")
+        quotas.append((name, int(value)))
+    return features, tuple(quotas)
+
+
+def _decode_v2(token: str) -> tuple[LicensePayload, bytes, bytes]:
+    blob = _b64u_decode_or_none(token)
+    if not blob or blob[0] != TOKEN_V2:
+        raise LicenseVerificationError("Malformed license token.")
+    parts = _split_v2(blob)
+    if parts is None:
+        raise LicenseVerificationError("Invalid license payload structure.")
+    return parts
+
+
 def verify_token(
     public_key_path: TokenSource,
     token: str,
     *,
     expected_product: Optional[str] = None,
     expected_version: Optional[str] = None,
+    cache: Optional["VerificationCache"] = None,
+    revocations: Optional[RevocationList] = None,
+    check_expiry: bool = False,
 ) -> LicensePayload:
     """Verify ``token`` using the public key and return its payload.
 
+    ``public_key_path`` may be a PEM path, PEM bytes, raw 32-byte key bytes, an
+    already loaded :class:`Ed25519PublicKey` or a
+    :class:`~core.license_keys.KeySet` of rotating keys. Parsed keys are cached
+    process-wide, so repeated calls do not re-read or re-parse the PEM. When a
+    :class:`VerificationCache` is supplied, successful results are memoized.
+    Tokens found in ``revocations`` are rejected even when cached.
+
     Raises :class:`LicenseVerificationError` if the signature is invalid or if
     the payload does not match the expected product/version constraints.
     """
 
-    normalized = normalize_token(token)
+    if not TRACER.enabled:
+        return _verify_token(
+            public_key_path, token, expected_product, expected_version, cache, revocations, check_expiry, False
+        )
+    with TRACER.span("license.verify_token"):
+        return _verify_token(
+            public_key_path, token, expected_product, expected_version, cache, revocations, check_expiry, True
+        )
+
+
+def _verify_token(
+    public_key_path: TokenSource,
+    token: str,
+    expected_product: Optional[str],
+    expected_version: Optional[str],
+    cache: Optional["VerificationCache"],
+    revocations: Optional[RevocationList],
+    check_expiry: bool,
+    traced: bool,
+) -> LicensePayload:
+    timed = REGISTRY.enabled
+    clocked = timed or traced
+    mark = time.perf_counter() if clocked else 0.0
+    normalized = _precheck(token)
+    if clocked:
+        mark = _end_phase("normalize", mark, timed, traced)
+    if traced:
+        TRACER.current().set_attribute("format", token_version(normalized))
+    keys = _candidate_keys(public_key_path, normalized)
+    if clocked:
+        mark = _end_phase("key_load", mark, timed, traced)
+    payload = _verify_with_keys(
+        keys,
+        normalized,
+        expected_product=expected_product,
+        expected_version=expected_version,
+        cache=cache,
+        check_expiry=check_expiry,
+    )
+    if timed:
+        # Traces show this phase as its decode and signature children.
+        mark = observe_phase("verify", mark)
+    elif traced:
+        mark = time.perf_counter()
+    if revocations is not None:
+        revocations.check(normalized, payload)
+        if clocked:
+            _end_phase("revocation", mark, timed, traced)
+    return payload
+
+
+def _end_phase(phase: str, started: float, timed: bool, traced: bool) -> float:
+    """Report ``phase`` to metrics and/or tracing and return the current clock."""
+
+    now = observe_phase(phase, started) if timed else time.perf_counter()
+    if traced:
+        TRACER.record(phase, started, now)
+    return now
+
+
+def _precheck(token: str) -> str:
+    """Normalize ``token`` or reject it for its length, alphabet or checksum."""
+
+    normalized, reason = _detect_token(token)
+    if reason is not None:
+        raise LicenseVerificationError(_PRECHECK_MESSAGES[reason], reason)
+    return normalized
+
+
+def _candidate_keys(source: TokenSource, normalized: str) -> Tuple[Ed25519PublicKey, ...]:
+    keys_for_token = getattr(source, "keys_for_token", None)
+    if keys_for_token is not None:
+        return keys_for_token(normalized)
+    return (_load_public_key(source),)
+
+
+def _verify_with_keys(
+    keys: Tuple[Ed25519PublicKey, ...],
+    normalized: str,
+    *,
+    expected_product: Optional[str],
+    expected_version: Optional[str],
+    cache: Optional["VerificationCache"] = None,
+    check_expiry: bool = False,
+) -> LicensePayload:
+    # Only tokens without a key id reach here with several keys; a signature
+    # mismatch moves on to the next key, any other failure is final.
+    last = len(keys) - 1
+    for index, key in enumerate(keys):
+        try:
+            if cache is not None:
+                return cache.verify(
+                    key,
+                    normalized,
+                    expected_product=expected_product,
+                    expected_version=expected_version,
+                    check_expiry=check_expiry,
+                )
+            return _verify_normalized(
+                key,
+                normalized,
+                expected_product=expected_product,
+                expected_version=expected_version,
+                check_expiry=check_expiry,
+            )
+        except LicenseVerificationError as exc:
+            if index == last or exc.reason != REASON_SIGNATURE:
+                raise
+    raise LicenseVerificationError("No license public key is available.", REASON_KEY)
+
+
+def _verify_normalized(
+    key: Ed25519PublicKey,
+    normalized: str,
+    *,
+    expected_product: Optional[str],
+    expected_version: Optional[str],
+    check_expiry: bool = False,
+) -> LicensePayload:
+    from cryptography.exceptions import InvalidSignature
+
+    traced = TRACER.enabled
+    mark = time.perf_counter() if traced else 0.0
     payload, signature, payload_bytes = decode_token(normalized)
+    if traced:
+        mark = TRACER.record("decode", mark)
+
+    # Claims are checked before the signature so that unwanted tokens are
+    # rejected cheaply. Only rejections are decided here; a payload is never
+    # returned without a valid signature.
+    if expected_product and payload.product != expected_product:
+        raise LicenseVerificationError("License product mismatch.", REASON_PRODUCT_MISMATCH)
+    if expected_version and payload.version != expected_version:
+        raise LicenseVerificationError("License version mismatch.", REASON_VERSION_MISMATCH)
+    if check_expiry and payload.is_expired:
+        raise LicenseVerificationError("License expired.", REASON_EXPIRED)
 
-    key = _load_public_key(public_key_path)
     try:
         key.verify(signature, payload_bytes)
     except InvalidSignature as exc:
-        raise LicenseVerificationError("Invalid license signature.") from exc
-
-    if expected_product and payload.product != expected_product:
-        raise LicenseVerificationError("License product mismatch.")
-    if expected_version and payload.version != expected_version:
-        raise LicenseVerificationError("License version mismatch.")
+        if traced:
+            TRACER.record("signature", mark, attributes={"valid": False})
+        raise LicenseVerificationError("Invalid license signature.", REASON_SIGNATURE) from exc
+    if traced:
+        TRACER.record("signature", mark, attributes={"valid": True})
 
     return payload
 
 
+def public_key_fingerprint(key: Ed25519PublicKey) -> bytes:
+    """Return a SHA-256 fingerprint of the raw public key bytes."""
+
+    import hashlib
+
+    from cryptography.hazmat.primitives import serialization
+
+    raw = key.public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw,
+    )
+    return hashlib.sha256(raw).digest()
+
+
+_VerificationKey = Tuple[bytes, bytes, Optional[str], Optional[str]]
+
+
+class VerificationCacheInfo(NamedTuple):
+    """Counters describing a :class:`VerificationCache`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class VerificationCache:
+    """Opt-in LRU memo of successful token verifications.
+
+    Entries are keyed by a hash of the normalized token, the public key
+    fingerprint and the expected product/version. An entry lives until the
+    earlier of the token expiry and ``ttl`` seconds after it was stored. Call
+    :meth:`invalidate` after rotating keys.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[_VerificationKey, Tuple[float, LicensePayload]]" = OrderedDict()
+        self._fingerprints: Dict[int, Tuple[Ed25519PublicKey, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def verify(
+        self,
+        key: Ed25519PublicKey,
+        normalized: str,
+        *,
+        expected_product: Optional[str] = None,
+        expected_version: Optional[str] = None,
+        check_expiry: bool = False,
+    ) -> LicensePayload:
+        """Return the cached payload for ``normalized`` or verify and store it."""
+
+        import hashlib
+
+        cache_key = (
+            hashlib.sha256(normalized.encode("utf-8")).digest(),
+            self._fingerprint(key),
+            expected_product or None,
+            expected_version or None,
+        )
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                if REGISTRY.enabled:
+                    record_cache_lookup("verification", True)
+                if TRACER.enabled:
+                    TRACER.current().set_attribute("verification_cache", "hit")
+                return entry[1]
+            if entry is not None:
+                del self._entries[cache_key]
+            self.misses += 1
+        if REGISTRY.enabled:
+            record_cache_lookup("verification", False)
+        if TRACER.enabled:
+            TRACER.current().set_attribute("verification_cache", "miss")
+
+        payload = _verify_normalized(
+            key,
+            normalized,
+            expected_product=expected_product,
+            expected_version=expected_version,
+            check_expiry=check_expiry,
+        )
+
+        deadline = min(float(payload.expiry), now + self.ttl)
+        if deadline > now:
+            with self._lock:
+                self._entries[cache_key] = (deadline, payload)
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return payload
+
+    def invalidate(self) -> None:
+        """Forget every cached verification, e.g. after a key rotation."""
+
+        with self._lock:
+            self._entries.clear()
+            self._fingerprints.clear()
+
+    def info(self) -> VerificationCacheInfo:
+        with self._lock:
+            return VerificationCacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def _fingerprint(self, key: Ed25519PublicKey) -> bytes:
+        # Keep the key object alongside its fingerprint so ``id`` stays unique.
+        cached = self._fingerprints.get(id(key))
+        if cached is not None and cached[0] is key:
+            return cached[1]
+        fingerprint = public_key_fingerprint(key)
+        with self._lock:
+            if len(self._fingerprints) >= self.maxsize:
+                self._fingerprints.clear()
+            self._fingerprints[id(key)] = (key, fingerprint)
+        return fingerprint
+
+
+class TokenVerificationResult(NamedTuple):
+    """Outcome of verifying one token in a batch."""
+
+    index: int
+    valid: bool
+    reason: str
+    payload: Optional[LicensePayload] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"index": self.index, "valid": self.valid, "reason": self.reason}
+        if self.payload is not None:
+            result.update(self.payload.to_details())
+            result["expiry"] = self.payload.expiry
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+def verify_many(
+    tokens: Iterable[str],
+    public_key: TokenSource,
+    *,
+    expected_product: Optional[str] = None,
+    expected_version: Optional[str] = None,
+    check_expiry: bool = True,
+    max_workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    revocations: Optional[RevocationList] = None,
+) -> Iterator[TokenVerificationResult]:
+    """Verify ``tokens`` against one public key (or key set) and yield results in order.
+
+    The key is loaded once and tokens are checked on a thread pool. At most
+    ``max_in_flight`` tokens are pending at any time, so ``tokens`` may be an
+    unbounded stream. Failures are reported through ``reason`` rather than
+    raised.
+    """
+
+    key_source = public_key if hasattr(public_key, "keys_for_token") else _load_public_key(public_key)
+    workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    limit = max(1, max_in_flight or workers * 4)
+
+    def check(index: int, token: str) -> TokenVerificationResult:
+        try:
+            normalized = _precheck(token)
+            payload = _verify_with_keys(
+                _candidate_keys(key_source, normalized),
+                normalized,
+                expected_product=expected_product,
+                expected_version=expected_version,
+            )
+            if revocations is not None:
+                revocations.check(normalized, payload)
+        except LicenseVerificationError as exc:
+            return TokenVerificationResult(index, False, exc.reason, error=str(exc))
+        if check_expiry and payload.is_expired:
+            return TokenVerificationResult(index, False, REASON_EXPIRED, payload, "License expired.")
+        return TokenVerificationResult(index, True, REASON_OK, payload)
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future[TokenVerificationResult]] = deque()
+        for index, token in enumerate(tokens):
+            pending.append(pool.submit(check, index, token))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 __all__ = [
+    "FLAG_ENTITLEMENTS",
+    "HUMAN_PREFIX",
+    "KeyCacheInfo",
     "LicensePayload",
     "LicenseVerificationError",
+    "MAX_FEATURES",
+    "Quotas",
+    "REASON_CHECKSUM",
+    "REASON_EXPIRED",
+    "REASON_KEY",
+    "REASON_MALFORMED",
+    "REASON_OK",
+    "REASON_PRODUCT_MISMATCH",
+    "REASON_REVOKED",
+    "REASON_SIGNATURE",
+    "REASON_VERSION_MISMATCH",
+    "TOKEN_V1",
+    "TOKEN_V2",
+    "TokenSource",
+    "TokenVerificationResult",
+    "VerificationCache",
+    "VerificationCacheInfo",
+    "canonical_token",
+    "clear_public_key_cache",
+    "define_features",
+    "feature_mask",
+    "human_checksum",
     "normalize_token",
+    "public_key_cache_info",
+    "public_key_fingerprint",
+    "token_version",
+    "verify_many",
     "verify_token",
 ]
@@ -0,0 +1,193 @@
+"""Background watcher that revalidates when license credentials change."""
+
+from __future__ import annotations
+
+import os
+import select
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .license_manager import LicenseManager, LicenseValidationError
+
+# inotify(7) event masks.
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_WATCH_MASK = _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+Fingerprint = Tuple[Any, ...]
+
+
+class _Inotify:
+    """Minimal ctypes binding for inotify; raises ``OSError`` when unavailable."""
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._watched: set[str] = set()
+
+    def watch_directory(self, directory: Path) -> None:
+        key = str(directory)
+        if key in self._watched or not directory.is_dir():
+            return
+        if self._libc.inotify_add_watch(self.fd, os.fsencode(key), _WATCH_MASK) >= 0:
+            self._watched.add(key)
+
+    def drain(self) -> None:
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class LicenseWatcher:
+    """Revalidate ``manager`` in the background when its credentials change.
+
+    The watcher tracks the ``LICENSE_TOKEN``/``LICENSE_KEY``/
+    ``LICENSE_PUBLIC_KEY_PATH`` environment values, the token files probed by
+    :meth:`LicenseManager.token_files`, the public key PEM (or every file in a
+    key directory) and the revocation list. inotify wakes it promptly on Linux; otherwise, and for environment
+    changes, it compares cheap ``stat`` fingerprints every ``interval``
+    seconds. Keyring entries are not watched.
+    """
+
+    ENV_VARS = ("LICENSE_TOKEN", "LICENSE_KEY", "LICENSE_PUBLIC_KEY_PATH")
+
+    def __init__(
+        self,
+        manager: LicenseManager,
+        *,
+        interval: float = 5.0,
+        use_inotify: bool = True,
+        on_change: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        self.manager = manager
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.on_change = on_change
+        self._fingerprint: Fingerprint = self.fingerprint()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+        self._wake_r, self._wake_w = -1, -1
+
+    # Change detection ------------------------------------------------
+
+    def watched_paths(self) -> List[Path]:
+        key_path = self.manager.public_key_path
+        key_files = sorted(key_path.iterdir()) if key_path.is_dir() else []
+        return [*self.manager.token_files(), key_path, *key_files, self.manager.revocation_path]
+
+    def fingerprint(self) -> Fingerprint:
+        """Return a cheap summary of every watched credential source."""
+
+        entries: List[Any] = [os.getenv(name) for name in self.ENV_VARS]
+        for path in self.watched_paths():
+            try:
+                stat = path.stat()
+            except OSError:
+                entries.append(None)
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        return tuple(entries)
+
+    def check(self) -> bool:
+        """Revalidate if anything changed since the last check."""
+
+        if self.fingerprint() == self._fingerprint:
+            return False
+        try:
+            self.manager.reload_credentials()
+        except LicenseValidationError:
+            pass
+        # The public key path may itself have moved, so re-read afterwards.
+        self._fingerprint = self.fingerprint()
+        self._register_watches()
+        if self.on_change is not None:
+            self.on_change(self.manager.get_license_status())
+        return True
+
+    # Thread lifecycle ------------------------------------------------
+
+    def start(self) -> "LicenseWatcher":
+        if self._thread is not None:
+            return self
+        if self.use_inotify:
+            try:
+                self._inotify = _Inotify()
+            except OSError:
+                self._inotify = None
+        if self._inotify is not None:
+            self._wake_r, self._wake_w = os.pipe()
+            self._register_watches()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="license-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._wake_w >= 0:
+            os.write(self._wake_w, b"\0")
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_r, self._wake_w = -1, -1
+
+    def __enter__(self) -> "LicenseWatcher":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def _register_watches(self) -> None:
+        if self._inotify is None:
+            return
+        for path in self.watched_paths():
+            self._inotify.watch_directory(path.parent)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._inotify is not None:
+                ready, _, _ = select.select([self._inotify.fd, self._wake_r], [], [], self.interval)
+                if self._inotify.fd in ready:
+                    # Let multi-step writes (truncate, write, rename) settle.
+                    self._stop.wait(0.05)
+                    self._inotify.drain()
+            else:
+                self._stop.wait(self.interval)
+            if self._stop.is_set():
+                break
+            try:
+                self.check()
+            except Exception:  # pragma: no cover - keep watching on unexpected errors
+                continue
+
+
+__all__ = ["LicenseWatcher"]
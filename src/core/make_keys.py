@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import hashlib
+
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
@@ -26,7 +28,14 @@ def main() -> None:
     with open("license_public.pem", "wb") as public_file:
         public_file.write(public_bytes)
 
+    raw_public = public_key.public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw,
+    )
+    key_id = hashlib.sha256(raw_public).hexdigest()[:8]
+
     print("Keypair generated: license_private.pem (keep secure), license_public.pem (embed in app)")
+    print(f"Key id: {key_id}")
 
 
 if __name__ == "__main__":  # pragma: no cover
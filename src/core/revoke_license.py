@@ -0,0 +1,100 @@
+"""Append entries to the signed license revocation list."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Set
+
+from .gen_license import load_private_key
+from .license_keys import load_key_set
+from .license_revocation import (
+    RevocationList,
+    build_revocation_list,
+    identifier_digest,
+    token_digest,
+    write_revocation_list,
+)
+from .license_verifier import TokenSource, normalize_token
+
+
+def digests_from_lines(lines: Iterable[str]) -> Iterator[bytes]:
+    """Yield digests for ``id:<identifier>`` lines and raw or grouped token lines."""
+
+    for line in lines:
+        entry = line.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        if entry.startswith("id:"):
+            yield identifier_digest(entry[3:])
+        else:
+            yield token_digest(normalize_token(entry))
+
+
+def append_revocations(
+    list_path: Path,
+    private_key_data: bytes,
+    new_digests: Iterable[bytes],
+    *,
+    trusted_keys: Optional[TokenSource] = None,
+) -> int:
+    """Merge ``new_digests`` into ``list_path``, re-sign it and return the entry count.
+
+    The existing list must verify against ``trusted_keys`` (default: the
+    signing key), so pass the app's key set after rotating to a new key.
+    """
+
+    private_key = load_private_key(private_key_data)
+    entries: Set[bytes] = set()
+    if list_path.exists():
+        current = RevocationList(list_path, trusted_keys or private_key.public_key())
+        try:
+            entries.update(current.digests())
+        finally:
+            current.close()
+    entries.update(new_digests)
+    write_revocation_list(list_path, build_revocation_list(entries, private_key))
+    return len(entries)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Revoke license tokens or identifiers")
+    parser.add_argument("--priv", default="license_private.pem", help="Path to the private PEM file")
+    parser.add_argument("--list", default="license_revocations.bin", help="Revocation list to update")
+    parser.add_argument(
+        "--keys",
+        help="Key directory or bundle trusted for the existing list (needed after a key rotation)",
+    )
+    parser.add_argument("--id", action="append", default=[], help="Identifier to revoke (repeatable)")
+    parser.add_argument("--token", action="append", default=[], help="Token to revoke (repeatable)")
+    parser.add_argument(
+        "--from-file",
+        help="File of entries, one per line: 'id:<identifier>' or a token ('-' for stdin)",
+    )
+    args = parser.parse_args(argv)
+
+    lines: List[str] = [f"id:{identifier}" for identifier in args.id] + list(args.token)
+    digests = list(digests_from_lines(lines))
+    if args.from_file:
+        source = sys.stdin if args.from_file == "-" else open(args.from_file, encoding="utf-8")
+        try:
+            digests.extend(digests_from_lines(source))
+        finally:
+            if source is not sys.stdin:
+                source.close()
+    if not digests:
+        parser.error("nothing to revoke; pass --id, --token or --from-file")
+
+    count = append_revocations(
+        Path(args.list),
+        Path(args.priv).read_bytes(),
+        digests,
+        trusted_keys=load_key_set(Path(args.keys)) if args.keys else None,
+    )
+    print(f"Revocation list {args.list} now has {count} entries")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
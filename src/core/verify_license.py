@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
+import json
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import IO, Optional
 
-from .license_verifier import LicenseVerificationError, normalize_token, verify_token
+from .license_verifier import LicenseVerificationError, normalize_token, verify_many, verify_token
 
 
 def verify_from_cli(
@@ -28,10 +29,60 @@ def verify_from_cli(
     return not payload.is_expired
 
 
+def verify_stream(
+    public_key: Path,
+    lines: IO[str],
+    out: IO[str],
+    *,
+    expected_product: Optional[str] = None,
+    expected_version: Optional[str] = None,
+) -> bool:
+    """Verify one token per line of ``lines`` and write JSONL results to ``out``.
+
+    Blank lines are skipped, so ``index`` counts tokens rather than lines.
+    Returns ``True`` when every token is valid.
+    """
+
+    all_valid = True
+    tokens = filter(None, (line.strip() for line in lines))
+    for result in verify_many(
+        tokens,
+        public_key,
+        expected_product=expected_product,
+        expected_version=expected_version,
+    ):
+        all_valid = all_valid and result.valid
+        out.write(json.dumps(result.to_dict()) + "\n")
+    out.flush()
+    return all_valid
+
+
 def main(argv: list[str] | None = None) -> int:
     argv = argv or sys.argv[1:]
+    if argv and argv[0] == "--stdin":
+        if len(argv) < 2 or len(argv) > 4:
+            print(
+                "Usage: verify_license.py --stdin <public_key.pem> [expected_product] [expected_version]",
+                file=sys.stderr,
+            )
+            return 1
+        try:
+            all_valid = verify_stream(
+                Path(argv[1]),
+                sys.stdin,
+                sys.stdout,
+                expected_product=argv[2] if len(argv) >= 3 else None,
+                expected_version=argv[3] if len(argv) >= 4 else None,
+            )
+        except (OSError, LicenseVerificationError) as exc:
+            # stdout carries only JSONL results; a run-level failure goes to stderr.
+            print(f"INVALID: {exc}", file=sys.stderr)
+            return 1
+        return 0 if all_valid else 1
+
     if len(argv) < 2 or len(argv) > 4:
         print("Usage: verify_license.py <public_key.pem> <token> [expected_product] [expected_version]")
+        print("       verify_license.py --stdin <public_key.pem> [expected_product] [expected_version]")
         return 1
 
     public_key = Path(argv[0])
@@ -1,7 +1,13 @@
+import base64
 import os
 import sys
+import time
 from pathlib import Path
 
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
 SRC_PATH = Path(__file__).resolve().parent.parent / "src"
 if SRC_PATH.exists():
     sys.path.insert(0, str(SRC_PATH))
@@ -11,3 +17,61 @@ if APP_PATH.exists():
     sys.path.insert(0, str(APP_PATH.parent))
 
 os.environ.setdefault("PYTHONPATH", str(SRC_PATH))
+
+
+@pytest.fixture
+def keypair(tmp_path):
+    """Return a fresh private key and the path of its public PEM in ``tmp_path``."""
+
+    private_key = Ed25519PrivateKey.generate()
+    public_path = tmp_path / "license_public.pem"
+    public_path.write_bytes(
+        private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    return private_key, public_path
+
+
+@pytest.fixture
+def private_key(keypair):
+    return keypair[0]
+
+
+@pytest.fixture
+def configure_env(monkeypatch, tmp_path, keypair):
+    """Point ``LicenseManager()`` at the keypair and keep its files in ``tmp_path``."""
+
+    _, public_path = keypair
+    for name in ("LICENSE_TOKEN", "LICENSE_KEY", "LICENSE_PRODUCT", "LICENSE_LOG_FORMAT"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("LICENSE_PUBLIC_KEY_PATH", str(public_path))
+    monkeypatch.setenv("LICENSE_LOG_PATH", str(tmp_path / "license.log"))
+    monkeypatch.setenv("LICENSE_STATUS_PATH", str(tmp_path / "license_status.json"))
+
+
+def make_token(private_key, identifier="user", *, product="ShopSaavy", version="1.0.0", expiry=None):
+    """Sign a v1 token by hand, independently of the issuer under test."""
+
+    if expiry is None:
+        expiry = int(time.time()) + 3600
+    payload = f"{identifier}|{product}|{version}|{expiry}".encode("utf-8")
+    payload_b64 = base64.urlsafe_b64encode(payload).decode("utf-8").rstrip("=")
+    signature_b64 = base64.urlsafe_b64encode(private_key.sign(payload)).decode("utf-8").rstrip("=")
+    return f"{payload_b64}.{signature_b64}"
+
+
+def tamper(token):
+    """Change a signature character that carries data bits."""
+
+    index = token.index(".") + 2
+    return token[:index] + ("A" if token[index] != "A" else "B") + token[index + 1 :]
+
+
+def private_pem(private_key):
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
@@ -0,0 +1,57 @@
+import importlib.util
+import json
+from pathlib import Path
+
+BENCH_PATH = Path(__file__).resolve().parents[1] / "benchmarks" / "bench_license.py"
+
+
+def load_bench():
+    spec = importlib.util.spec_from_file_location("bench_license", BENCH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_compare_flags_regressions_past_threshold():
+    bench = load_bench()
+    baseline = {"fast": {"ns_per_op": 100.0}, "slow": {"ns_per_op": 100.0}}
+    results = {"fast": {"ns_per_op": 120.0}, "slow": {"ns_per_op": 200.0}, "new": {"ns_per_op": 5.0}}
+
+    regressions = bench.compare(results, baseline, 0.25)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("slow:")
+
+
+def test_baseline_mode_fails_on_regression(monkeypatch, tmp_path):
+    bench = load_bench()
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"results": {"normalize_token.raw": {"ns_per_op": 0.001}}}))
+    output = tmp_path / "bench.json"
+
+    code = bench.main(["--filter", "normalize_token.raw", "--repeat", "1", "--output", str(output), "--baseline", str(baseline)])
+
+    assert code == 1
+    assert "normalize_token.raw" in json.loads(output.read_text())["results"]
+
+
+def test_filter_builds_only_selected_cases(tmp_path):
+    bench = load_bench()
+
+    cases = bench.build_cases(tmp_path, "normalize_token.raw")
+
+    assert [name for name, _, _ in cases] == ["normalize_token.raw"]
+    assert not (tmp_path / "license_public.pem").exists()
+
+
+def test_gate_overheads_are_checked_against_the_budget(monkeypatch, capsys):
+    bench = load_bench()
+    results = {
+        "middleware.wsgi.bare": {"ns_per_op": 100.0},
+        "middleware.wsgi.allowed": {"ns_per_op": 400.0},
+        "middleware.wsgi.denied": {"ns_per_op": 1500.0},
+    }
+    monkeypatch.setattr(bench, "run", lambda selected, repeat: results)
+
+    assert bench.gate_overheads(results) == {"middleware.wsgi.allowed": 300.0, "middleware.wsgi.denied": 1400.0}
+    assert bench.main(["--filter", "middleware.wsgi"]) == 1
+    assert "middleware.wsgi.denied" in capsys.readouterr().out.split("budget 1,000 ns/request")[1]
@@ -0,0 +1,62 @@
+import io
+import json
+
+import pytest
+
+from core.gen_license import issue_bulk, key_id_for, read_rows, write_records
+from core.license_verifier import normalize_token, verify_token
+from conftest import private_pem
+
+
+def test_read_rows_applies_defaults():
+    stream = io.StringIO("identifier,product,days\nalice,,10\nbob,Other,\n")
+
+    rows = list(read_rows(stream, "csv", product="ShopSaavy", version="1.0.0", days=30, now=1000))
+
+    assert rows == [
+        ("alice", "ShopSaavy", "1.0.0", 1000 + 10 * 86400),
+        ("bob", "Other", "1.0.0", 1000 + 30 * 86400),
+    ]
+
+
+def test_read_rows_keeps_explicit_zero_days():
+    stream = io.StringIO('{"id": "dave", "days": 0}\n{"id": "erin"}\n')
+
+    rows = list(read_rows(stream, "jsonl", product="ShopSaavy", version="1.0.0", days=30, now=1000))
+
+    assert [row[3] for row in rows] == [1000, 1000 + 30 * 86400]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_issue_bulk_signs_rows_in_order(private_key, workers):
+    rows = [(f"cust{i}", "ShopSaavy", "1.0.0", 4102444800) for i in range(25)]
+
+    records = list(issue_bulk(iter(rows), private_pem(private_key), workers=workers, chunk_size=4))
+
+    assert [record["identifier"] for record in records] == [row[0] for row in rows]
+    for record in records[:3]:
+        assert verify_token(private_key.public_key(), record["human_readable"]).identifier == record["identifier"]
+
+
+def test_write_records_jsonl(private_key):
+    rows = read_rows(io.StringIO('{"id": "carol"}\n\n'), "jsonl", product="ShopSaavy", version="1.0.0", days=1)
+    out = io.StringIO()
+
+    count = write_records(issue_bulk(rows, private_pem(private_key), workers=1), out, "jsonl")
+
+    assert count == 1
+    assert json.loads(out.getvalue())["identifier"] == "carol"
+
+
+def test_issue_bulk_v2_tokens_are_shorter_and_carry_key_id(private_key):
+    rows = [("customer-0042", "ShopSaavy", "1.0.0", 4102444800)]
+
+    v1, = issue_bulk(iter(rows), private_pem(private_key), workers=1)
+    v2, = issue_bulk(iter(rows), private_pem(private_key), workers=1, token_format="v2")
+
+    assert "." not in v2["token"]
+    assert len(v2["human_readable"]) < len(v1["human_readable"]) * 0.8
+    assert normalize_token(v2["human_readable"]) == v2["token"]
+    payload = verify_token(private_key.public_key(), v2["human_readable"])
+    assert payload.identifier == "customer-0042"
+    assert payload.key_id == key_id_for(private_key)
@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from core import license_manager
+from core.license_admission import AdmissionControl, NegativeCache, TokenBucket
+from core.license_daemon import LicenseDaemon
+from core.license_manager import LicenseManager, LicenseValidationError
+from conftest import make_token
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def count_verifications(monkeypatch):
+    calls = []
+    original = license_manager.verify_token
+
+    def verify(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(license_manager, "verify_token", verify)
+    return calls
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(2.0, 2, clock=clock)
+
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0.0
+
+
+def test_negative_cache_backs_off_per_reason():
+    clock = FakeClock()
+    cache = NegativeCache(base_delay=1.0, max_delay=4.0, clock=clock)
+
+    assert [cache.record_failure(b"k", "signature", "bad") for _ in range(4)] == [1.0, 2.0, 4.0, 4.0]
+    assert cache.record_failure(b"k", "expired", "old") == 1.0
+    assert cache.lookup(b"k").reason == "expired"
+    clock.now += 1.0
+    assert cache.lookup(b"k") is None
+    assert cache.record_failure(b"io", "io", "disk") == 0.0
+    assert cache.lookup(b"io") is None
+
+
+def test_repeated_bad_token_is_answered_from_cache(monkeypatch, keypair):
+    private_key, _ = keypair
+    calls = count_verifications(monkeypatch)
+    clock = FakeClock()
+    admission = AdmissionControl(rate=None, negative_cache=NegativeCache(clock=clock))
+    manager = LicenseManager(make_token(private_key, expiry=int(time.time()) - 10), admission=admission)
+
+    for _ in range(5):
+        with pytest.raises(LicenseValidationError) as excinfo:
+            manager.validate_license()
+        assert excinfo.value.reason == "expired"
+    assert len(calls) == 1
+    assert excinfo.value.retry_after == pytest.approx(1.0)
+
+    clock.now += 1.0
+    with pytest.raises(LicenseValidationError):
+        manager.validate_license()
+    assert len(calls) == 2
+    with pytest.raises(LicenseValidationError) as excinfo:
+        manager.validate_license()
+    assert excinfo.value.retry_after == pytest.approx(2.0)
+
+
+def test_rate_limit_rejects_without_verifying(monkeypatch, keypair):
+    private_key, _ = keypair
+    calls = count_verifications(monkeypatch)
+    manager = LicenseManager(make_token(private_key), admission=AdmissionControl(rate=0.001, burst=2))
+
+    assert manager.validate_license() and manager.validate_license()
+    with pytest.raises(LicenseValidationError) as excinfo:
+        manager.validate_license()
+    assert excinfo.value.reason == "rate_limited"
+    assert excinfo.value.retry_after > 0
+    assert len(calls) == 2
+    assert manager.get_license_status()["valid"] is True
+
+
+def test_daemon_reports_retry_after(monkeypatch, keypair):
+    private_key, _ = keypair
+    token = make_token(private_key)
+    monkeypatch.setenv("LICENSE_TOKEN", token[:-2] + ("AA" if token[-2:] != "AA" else "BB"))
+    daemon = LicenseDaemon()
+
+    first = daemon.handle({"command": "validate"})
+    second = daemon.handle({"command": "validate"})
+    assert first["valid"] is False and "retry_after" not in first
+    assert second["error"] == first["error"]
+    assert 0 < second["retry_after"] <= 1
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from core.gen_license import canonical_payload_v2, sign_with_key_v2
+
+np = pytest.importorskip("numpy")
+
+from core.license_analytics import load_columns, main  # noqa: E402
+from conftest import make_token
+
+DAY = 86400
+NOW = 1_700_000_000
+
+
+def corpus(private_key):
+    tokens = [
+        make_token(private_key, identifier="acme-1", expiry=NOW + 5 * DAY),
+        make_token(private_key, identifier="acme-2", version="2.0.0", expiry=NOW + 40 * DAY),
+        make_token(private_key, identifier="beta-1", product="Other", expiry=NOW - DAY),
+        sign_with_key_v2(private_key, canonical_payload_v2("ácme-3", "ShopSaavy", "2.0.0", NOW + 10 * DAY)),
+    ]
+    return tokens
+
+
+def test_columns_and_queries(keypair):
+    private_key, public_path = keypair
+    columns = load_columns(corpus(private_key), public_path)
+
+    assert len(columns) == 4
+    assert columns.expiry.dtype == np.int64
+    assert columns.identifier(3) == "ácme-3"
+    assert columns.count_expiring_within(30, now=NOW) == 2
+    assert int(columns.expired_mask(now=NOW).sum()) == 1
+    assert columns.histogram("product") == {"ShopSaavy": 3, "Other": 1}
+    assert columns.histogram("product_version") == {
+        ("ShopSaavy", "1.0.0"): 1,
+        ("ShopSaavy", "2.0.0"): 2,
+        ("Other", "1.0.0"): 1,
+    }
+    assert columns.expiry_forecast(period_days=30, periods=2, now=NOW) == [2, 1]
+
+    acme = columns.select(columns.identifier_prefix_mask("acme-"))
+    assert [acme.identifier(i) for i in range(len(acme))] == ["acme-1", "acme-2"]
+    assert acme.histogram("version") == {"1.0.0": 1, "2.0.0": 1}
+    assert acme.payload(1).expiry == NOW + 40 * DAY
+
+
+def test_verification_rejects_bad_tokens_unless_trusted(keypair):
+    private_key, public_path = keypair
+    forged = make_token(Ed25519PrivateKey.generate(), identifier="forged")
+    tokens = corpus(private_key) + [forged, "not-a-token"]
+
+    verified = load_columns(tokens, public_path)
+    assert len(verified) == 4
+    assert verified.rejected == {"signature": 1, "malformed": 1}
+
+    trusted = load_columns(tokens, verify=False)
+    assert len(trusted) == 5
+    assert trusted.rejected == {"malformed": 1}
+    with pytest.raises(ValueError):
+        load_columns(tokens)
+
+
+def test_cli_summary(keypair, tmp_path, capsys):
+    private_key, _ = keypair
+    source = tmp_path / "tokens.txt"
+    source.write_text("\n".join(corpus(private_key)) + "\n", encoding="utf-8")
+
+    assert main([str(source), "--days", "30", "--prefix", "acme"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["total"] == 2
+    assert summary["by"] == {"ShopSaavy": 2}
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.license_async import AsyncLicenseManager
+from core.license_manager import LicenseManager, LicenseValidationError
+from conftest import make_token
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+
+def test_validate_and_status(monkeypatch, private_key):
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+
+    async def scenario():
+        manager = AsyncLicenseManager()
+        assert await manager.validate_license() is True
+        return await manager.get_license_status()
+
+    status = asyncio.run(scenario())
+    assert status["valid"] is True
+    assert status["details"]["identifier"] == "user"
+
+
+def test_concurrent_awaiters_share_one_validation(monkeypatch, private_key):
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    calls = []
+    release = threading.Event()
+    original = LicenseManager.validate_license
+
+    def slow_validate(self):
+        calls.append(threading.get_ident())
+        release.wait(timeout=5)
+        return original(self)
+
+    monkeypatch.setattr(LicenseManager, "validate_license", slow_validate)
+
+    async def scenario():
+        manager = AsyncLicenseManager()
+        waiters = [asyncio.ensure_future(manager.validate_license()) for _ in range(10)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(scenario()) == [True] * 10
+    assert len(calls) == 1
+
+
+def test_failures_reach_every_awaiter(monkeypatch, private_key):
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key, expiry=int(time.time()) - 10))
+
+    async def scenario():
+        manager = AsyncLicenseManager()
+        return await asyncio.gather(
+            manager.validate_license(),
+            manager.validate_license(),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, LicenseValidationError) for result in results)
@@ -0,0 +1,59 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from core.gen_license import issue_token
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+BUILD_ZIPAPP = Path(__file__).resolve().parent.parent / "tools" / "build_zipapp.py"
+
+
+def test_cli_import_defers_heavy_modules():
+    script = (
+        "import sys, core.license_cli\n"
+        "print(','.join(m for m in ('cryptography', 'logging', 'dataclasses', 'tempfile') if m in sys.modules))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(SRC_PATH)}
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert completed.stdout.strip() == ""
+
+
+def test_zipapp_validates_against_app_root_key(keypair, tmp_path):
+    spec = importlib.util.spec_from_file_location("build_zipapp", BUILD_ZIPAPP)
+    build_zipapp = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(build_zipapp)
+
+    private_key, public_path = keypair
+    key_dir = tmp_path / "src" / "core"
+    key_dir.mkdir(parents=True)
+    (key_dir / "license_public.pem").write_bytes(public_path.read_bytes())
+    archive = build_zipapp.build(tmp_path / "dist" / "license_cli.pyz", app_root=tmp_path)
+
+    token = issue_token(private_key, ("user", "ShopSaavy", "1.0.0", int(time.time()) + 3600))
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith("LICENSE_") and key != "PYTHONPATH"
+    }
+    env["LICENSE_TOKEN"] = token
+    env["HOME"] = str(tmp_path)
+    completed = subprocess.run(
+        [sys.executable, str(archive), "validate"],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    assert (tmp_path / "logs" / "license.log").exists()
+    assert not (tmp_path / "dist" / "logs").exists()
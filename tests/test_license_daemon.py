@@ -0,0 +1,115 @@
+import io
+import json
+import socket
+import threading
+
+import pytest
+
+from core.license_daemon import LicenseDaemon
+from conftest import make_token
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+
+def test_stdio_replies_match_cli_shapes(monkeypatch, private_key):
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    daemon = LicenseDaemon()
+    stdin = io.StringIO(
+        '{"id": 1, "command": "status"}\n'
+        "\n"
+        '{"id": 2, "command": "validate"}\n'
+        '{"id": 3, "command": "status"}\n'
+        "not json\n"
+    )
+    stdout = io.StringIO()
+
+    daemon.serve_stdio(stdin, stdout)
+
+    replies = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert replies[0] == {"id": 1, "status": {"valid": False, "license_key": replies[0]["status"]["license_key"]}}
+    assert replies[1]["id"] == 2 and replies[1]["valid"] is True
+    assert replies[2]["status"]["valid"] is True
+    assert replies[3] == {"error": "Malformed request."}
+
+
+def test_reload_picks_up_new_token(monkeypatch, private_key):
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key, product="Other"))
+    monkeypatch.setenv("LICENSE_PRODUCT", "ShopSaavy")
+    daemon = LicenseDaemon()
+    assert daemon.handle({"command": "validate"})["error"] == "License product mismatch."
+
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    assert daemon.handle({"command": "reload"})["reloaded"] is True
+    assert daemon.handle({"command": "validate"})["valid"] is True
+
+
+def test_status_is_answered_during_a_slow_validation(monkeypatch, private_key):
+    from core import license_manager
+
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    daemon = LicenseDaemon()
+    started, release = threading.Event(), threading.Event()
+    original = license_manager.verify_token
+
+    def blocking_verify(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(license_manager, "verify_token", blocking_verify)
+    replies = []
+    worker = threading.Thread(target=lambda: replies.append(daemon.handle({"command": "validate"})))
+    worker.start()
+    try:
+        assert started.wait(5)
+        assert "status" in daemon.handle({"command": "status"})
+        assert "metrics" in daemon.handle({"command": "metrics"})
+    finally:
+        release.set()
+        worker.join()
+    assert replies[0]["valid"] is True
+
+
+def test_reload_picks_up_rotated_token_file(monkeypatch, private_key, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    token_file = tmp_path / ".license_token"
+    token_file.write_text(make_token(private_key, "first"), encoding="utf-8")
+    daemon = LicenseDaemon()
+    assert daemon.handle({"command": "validate"})["status"]["details"]["identifier"] == "first"
+
+    token_file.write_text(make_token(private_key, "second"), encoding="utf-8")
+    assert daemon.handle({"command": "validate"})["status"]["details"]["identifier"] == "first"
+    reply = daemon.handle({"command": "reload"})
+    assert reply["reloaded"] is True and reply["valid"] is True
+    assert reply["status"]["details"]["identifier"] == "second"
+
+
+def test_unix_socket_serves_concurrent_clients(monkeypatch, private_key, tmp_path):
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    socket_path = tmp_path / "license.sock"
+    server = LicenseDaemon().create_unix_server(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    results = []
+
+    def client(index):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+            stream = sock.makefile("rw", encoding="utf-8")
+            stream.write(json.dumps({"id": index, "command": "validate"}) + "\n")
+            stream.flush()
+            results.append(json.loads(stream.readline()))
+
+    try:
+        clients = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+        for worker in clients:
+            worker.start()
+        for worker in clients:
+            worker.join(timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert sorted(reply["id"] for reply in results) == list(range(8))
+    assert all(reply["valid"] is True for reply in results)
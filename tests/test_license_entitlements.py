@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import pytest
+
+from core.gen_license import issue_token, parse_features, parse_quotas
+from core.license_entitlements import requires_license, set_default_manager
+from core.license_manager import LicenseManager, LicenseValidationError
+from core.license_verifier import LicenseVerificationError, define_features, feature_mask, verify_token
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+
+@pytest.fixture(autouse=True)
+def feature_names():
+    define_features({"reports": 0, "multi_store": 5})
+    yield
+    set_default_manager(None)
+
+
+def make_token(private_key, *, token_format="v1", features=0, quotas=None, expiry=None):
+    if expiry is None:
+        expiry = int(time.time()) + 3600
+    row = ("user", "ShopSaavy", "1.0.0", expiry)
+    return issue_token(private_key, row, token_format=token_format, features=features, quotas=quotas)
+
+
+@pytest.mark.parametrize("token_format", ["v1", "v2"])
+def test_entitlements_are_signed_into_both_formats(keypair, token_format):
+    private_key, public_path = keypair
+    token = make_token(private_key, token_format=token_format, features=0b100001, quotas={"seats": 25})
+    payload = verify_token(public_path, token)
+
+    assert payload.has_feature("reports") and payload.has_feature("multi_store")
+    assert not payload.has_feature(1)
+    assert payload.quota("seats") == 25 and payload.quota("stores") is None
+    assert payload.to_details()["quotas"] == {"seats": 25}
+
+    plain = verify_token(public_path, make_token(private_key, token_format=token_format))
+    assert plain.features == 0 and plain.quotas == () and "features" not in plain.to_details()
+
+
+def test_entitlements_cannot_be_altered(keypair):
+    private_key, public_path = keypair
+    token = make_token(private_key, features=1)
+    signature = token.split(".")[1]
+    forged = make_token(private_key, features=0b111111).split(".")[0]
+
+    with pytest.raises(LicenseVerificationError, match="signature"):
+        verify_token(public_path, f"{forged}.{signature}")
+    with pytest.raises(ValueError, match="Unknown license feature"):
+        feature_mask("billing")
+
+
+def test_requires_license_gates_on_the_cached_result(keypair):
+    private_key, _ = keypair
+    manager = LicenseManager(make_token(private_key, features=feature_mask("reports")))
+    manager.validate_license()
+    calls = []
+
+    @requires_license(feature="reports", manager=manager)
+    def export():
+        calls.append("export")
+        return "ok"
+
+    @requires_license(feature=["reports", "multi_store"], manager=manager)
+    def branches():
+        return "ok"
+
+    assert export() == "ok" and export.__name__ == "export"
+    with pytest.raises(LicenseValidationError) as exc:
+        branches()
+    assert exc.value.reason == "feature"
+
+    manager._state = manager._state._replace(expires_at=int(time.time()) - 1)
+    with pytest.raises(LicenseValidationError) as exc:
+        export()
+    assert exc.value.reason == "unlicensed"
+    assert calls == ["export"]
+
+
+def test_default_manager_validates_once_on_demand(keypair, monkeypatch):
+    private_key, _ = keypair
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key, features=feature_mask("multi_store")))
+    manager = LicenseManager()
+    set_default_manager(manager)
+
+    @requires_license("multi_store")
+    async def handler():
+        return "ok"
+
+    assert asyncio.run(handler()) == "ok"
+    assert manager.has_feature("multi_store") and not manager.has_feature("reports")
+
+
+def test_snapshot_restores_entitlements(keypair):
+    private_key, _ = keypair
+    token = make_token(private_key, features=1, quotas={"stores": 3})
+    LicenseManager(token).validate_license()
+
+    restored = LicenseManager(token)
+    assert restored.get_license_status()["valid"] is True
+    assert restored.has_feature("reports") and restored.quota("stores") == 3
+
+
+def test_restored_entitlements_require_a_signature_check(keypair):
+    from core.license_snapshot import write_snapshot
+    from core.license_verifier import normalize_token
+
+    private_key, _ = keypair
+    token = make_token(private_key, features=1)
+    unsigned = token[:-8] + ("A" if token[-8] != "A" else "B") + token[-7:]
+    manager = LicenseManager(unsigned)
+    forged = {
+        "status": {"valid": True},
+        "validated_at": "2026-01-01T00:00:00+00:00",
+        "expires_at": time.time() + 3600,
+        "features": 1,
+        "quotas": [["stores", 99]],
+    }
+    write_snapshot(manager.status_path, manager._snapshot_binding(normalize_token(unsigned), create=True), forged)
+
+    restored = LicenseManager(unsigned)
+    assert restored.get_license_status()["valid"] is True
+    assert not restored.has_feature("reports")
+    assert restored.quota("stores") is None
+    assert restored.get_license_status()["valid"] is False
+
+
+def test_gen_license_parses_feature_and_quota_arguments():
+    assert parse_features(["0,3", "reports"], {"reports": 7}) == 0b10001001
+    assert parse_quotas(["seats=10"]) == {"seats": 10}
+    with pytest.raises(ValueError):
+        parse_features(["billing"])
+    with pytest.raises(ValueError):
+        parse_quotas(["seats"])
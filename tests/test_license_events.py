@@ -0,0 +1,52 @@
+import gzip
+import json
+import time
+
+import pytest
+
+from core.license_events import LicenseEventWriter
+from core.license_manager import LicenseManager, LicenseValidationError
+from conftest import make_token
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+
+def test_validation_writes_structured_events(monkeypatch, private_key, tmp_path):
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    manager = LicenseManager()
+    manager.validate_license()
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key, expiry=int(time.time()) - 5))
+    expired = LicenseManager()
+    with pytest.raises(LicenseValidationError) as exc:
+        expired.validate_license()
+    assert exc.value.reason == "expired"
+    expired.flush_events()
+
+    events = [json.loads(line) for line in (tmp_path / "license.log").read_text().splitlines()]
+    assert [(event["outcome"], event["reason"]) for event in events] == [
+        ("success", "ok"),
+        ("failure", "expired"),
+    ]
+    assert events[0]["key"].startswith("XXXX-XXXX-")
+    assert events[0]["duration_ms"] >= 0
+
+
+def test_text_format_keeps_human_readable_lines(tmp_path):
+    writer = LicenseEventWriter(tmp_path / "license.log", fmt="text")
+    writer.emit({"ts": time.time(), "level": "ERROR", "message": "License expired.", "key": "XXXX-XXXX-ABCD"})
+    writer.close()
+
+    line = (tmp_path / "license.log").read_text().strip()
+    assert line.endswith(" - ERROR - License expired. | key=XXXX-XXXX-ABCD")
+
+
+def test_rotation_compresses_segments_and_prunes(tmp_path):
+    path = tmp_path / "license.log"
+    writer = LicenseEventWriter(path, max_bytes=200, backup_count=2, batch_size=1)
+    for index in range(20):
+        writer.emit({"ts": time.time(), "level": "INFO", "message": f"event {index}", "key": "K"})
+    writer.close()
+
+    segments = sorted(tmp_path.glob("license.log.*.gz"))
+    assert len(segments) == 2
+    assert all(json.loads(line)["message"].startswith("event ") for line in gzip.open(segments[-1], "rt"))
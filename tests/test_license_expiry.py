@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+from core.license_expiry import EXPIRED, WARNING, ExpiryScheduler, track_manager
+from core.license_manager import LicenseManager
+from core.license_pool import LicenseManagerPool
+from conftest import make_token
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+DAY = 86400
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_warning_then_expiry_in_order():
+    clock = FakeClock()
+    events = []
+    scheduler = ExpiryScheduler(events.append, warning_windows=(14 * DAY, DAY), clock=clock)
+    scheduler.schedule("a", int(clock.now) + 30 * DAY)
+    scheduler.schedule("b", int(clock.now) + 10 * DAY)
+
+    assert [(event.key, event.kind) for event in scheduler.run_pending()] == [("b", WARNING)]
+    assert scheduler.next_deadline() == clock.now + 9 * DAY
+    clock.now += 9 * DAY
+    assert [(e.key, e.window) for e in scheduler.run_pending()] == [("b", DAY)]
+    clock.now += 30 * DAY
+    fired = scheduler.run_pending()
+    assert [(e.key, e.kind) for e in fired] == [("b", EXPIRED), ("a", WARNING), ("a", WARNING), ("a", EXPIRED)]
+    assert len(scheduler) == 0
+    assert len(events) == 6
+
+
+def test_reschedule_and_cancel_drop_stale_deadlines():
+    clock = FakeClock()
+    scheduler = ExpiryScheduler(warning_windows=(), clock=clock)
+    scheduler.schedule("a", int(clock.now) + 10)
+    scheduler.schedule("a", int(clock.now) + 100)
+    scheduler.schedule("b", int(clock.now) + 20)
+    assert scheduler.cancel("b") is True
+
+    clock.now += 50
+    assert scheduler.run_pending() == []
+    clock.now += 50
+    assert [event.key for event in scheduler.run_pending()] == ["a"]
+
+
+def test_background_thread_fires_callback():
+    fired = threading.Event()
+    with ExpiryScheduler(lambda event: fired.set(), warning_windows=()) as scheduler:
+        scheduler.schedule("soon", int(time.time()))
+        assert fired.wait(2)
+
+
+def test_failing_callback_does_not_stop_delivery(keypair, tmp_path):
+    private_key, _ = keypair
+    manager = LicenseManager(make_token(private_key))
+    fired = threading.Event()
+
+    def callback(event):
+        if event.key == "broken":
+            raise RuntimeError("boom")
+        fired.set()
+
+    with ExpiryScheduler(callback, warning_windows=(), event_log=manager) as scheduler:
+        scheduler.schedule("broken", int(time.time()))
+        scheduler.schedule("later", int(time.time()) + 1)
+        assert fired.wait(3)
+    manager.flush_events()
+    log = (tmp_path / "license.log").read_text(encoding="utf-8")
+    assert "Expiry callback failed for 'broken' (expired): RuntimeError('boom')" in log
+
+
+def test_track_manager_flips_status(keypair):
+    private_key, _ = keypair
+    manager = LicenseManager(make_token(private_key))
+    manager.validate_license()
+    clock = FakeClock(time.time())
+    scheduler = ExpiryScheduler(clock=clock)
+
+    assert track_manager(scheduler, manager) is True
+    assert [event.kind for event in scheduler.run_pending()] == [WARNING]
+    clock.now += 3601
+    scheduler.run_pending()
+    status = manager.get_license_status()
+    assert status["valid"] is False
+    assert status["message"] == "License expired."
+
+
+def test_status_goes_stale_without_scheduler(keypair):
+    private_key, _ = keypair
+    manager = LicenseManager(make_token(private_key, expiry=int(time.time()) + 1))
+    manager.validate_license()
+    manager._state = manager._state._replace(expires_at=int(time.time()) - 1)
+
+    assert manager.get_license_status()["valid"] is False
+
+
+def test_pool_tenants_expire_through_scheduler(keypair):
+    private_key, _ = keypair
+    clock = FakeClock(time.time())
+    scheduler = ExpiryScheduler(warning_windows=(), clock=clock)
+    pool = LicenseManagerPool(expiry_scheduler=scheduler)
+    pool.add("short", make_token(private_key, identifier="short", expiry=int(clock.now) + 60))
+    pool.add("long", make_token(private_key, identifier="long", expiry=int(clock.now) + 7200))
+    pool.validate_all()
+
+    clock.now += 120
+    scheduler.run_pending()
+    assert pool.get_license_status("short")["valid"] is False
+    assert pool.get_license_status("long")["valid"] is True
+    pool.remove("long")
+    assert len(scheduler) == 0
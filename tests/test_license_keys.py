@@ -0,0 +1,104 @@
+import json
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from core.gen_license import canonical_payload_v2, key_id_for, sign_with_key_v2
+from core.license_keys import KeySet, format_key_id, load_key_set, public_key_id, token_key_id
+from core.license_manager import LicenseManager, LicenseValidationError
+from core.license_revocation import build_revocation_list, identifier_digest, write_revocation_list
+from core.license_verifier import LicenseVerificationError, verify_many, verify_token
+from conftest import make_token
+
+
+def public_pem(private_key):
+    return private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
+
+def make_token_v2(private_key, identifier="user"):
+    payload = canonical_payload_v2(
+        identifier, "ShopSaavy", "1.0.0", int(time.time()) + 3600, key_id=key_id_for(private_key)
+    )
+    return sign_with_key_v2(private_key, payload)
+
+
+@pytest.fixture
+def rotation(tmp_path):
+    old, new = Ed25519PrivateKey.generate(), Ed25519PrivateKey.generate()
+    directory = tmp_path / "keys"
+    directory.mkdir()
+    (directory / "2025.pem").write_bytes(public_pem(old))
+    (directory / "2026.pem").write_bytes(public_pem(new))
+    return old, new, directory
+
+
+def test_v2_tokens_select_their_key_by_id(rotation):
+    old, new, directory = rotation
+    keys = load_key_set(directory)
+
+    assert len(keys) == 2
+    assert public_key_id(new.public_key()) == key_id_for(new)
+    for private_key in (old, new):
+        token = make_token_v2(private_key)
+        assert token_key_id(token) == key_id_for(private_key)
+        assert keys.keys_for_token(token) == (keys.get(key_id_for(private_key)).key,)
+        assert verify_token(keys, token).identifier == "user"
+
+    # v1 tokens carry no id and fall back to every currently valid key.
+    assert verify_token(keys, make_token(old)).identifier == "user"
+
+    stranger = Ed25519PrivateKey.generate()
+    with pytest.raises(LicenseVerificationError, match="unknown key") as exc:
+        verify_token(keys, make_token_v2(stranger))
+    assert exc.value.reason == "key"
+    with pytest.raises(LicenseVerificationError, match="signature"):
+        verify_token(keys, make_token(stranger))
+
+
+def test_validity_windows_retire_old_keys(rotation):
+    old, new, directory = rotation
+    now = int(time.time())
+    (directory / "keys.json").write_text(
+        json.dumps({"keys": {"2025.pem": {"not_after": now - 60}, "2026.pem": {"not_before": "2020-01-01T00:00:00+00:00"}}})
+    )
+    keys = load_key_set(directory)
+
+    assert [format_key_id(entry.key_id) for entry in keys.active()] == [format_key_id(key_id_for(new))]
+    with pytest.raises(LicenseVerificationError, match="not valid at this time"):
+        verify_token(keys, make_token_v2(old))
+    results = list(verify_many([make_token(old), make_token_v2(new)], keys, max_workers=2))
+    assert [result.reason for result in results] == ["signature", "ok"]
+
+
+def test_json_bundle(tmp_path):
+    key = Ed25519PrivateKey.generate()
+    bundle = tmp_path / "keys.json"
+    bundle.write_text(json.dumps({"keys": [{"public_key": public_pem(key).decode("ascii"), "not_after": 4102444800}]}))
+
+    keys = KeySet.from_path(bundle)
+    assert keys.get(key_id_for(key)).not_after == 4102444800
+    assert verify_token(keys, make_token_v2(key)).identifier == "user"
+
+
+def test_manager_accepts_key_directory_and_old_revocation_list(monkeypatch, rotation, tmp_path):
+    old, new, directory = rotation
+    revocations = tmp_path / "revocations.bin"
+    write_revocation_list(revocations, build_revocation_list([identifier_digest("gone")], old))
+    monkeypatch.delenv("LICENSE_KEY", raising=False)
+    monkeypatch.setenv("LICENSE_PUBLIC_KEY_PATH", str(directory))
+    monkeypatch.setenv("LICENSE_LOG_PATH", str(tmp_path / "license.log"))
+    monkeypatch.setenv("LICENSE_REVOCATION_PATH", str(revocations))
+
+    monkeypatch.setenv("LICENSE_TOKEN", make_token_v2(new))
+    assert LicenseManager().validate_license() is True
+    assert LicenseManager().get_license_status()["valid"] is True
+
+    monkeypatch.setenv("LICENSE_TOKEN", make_token_v2(new, "gone"))
+    with pytest.raises(LicenseValidationError) as exc:
+        LicenseManager().validate_license()
+    assert exc.value.reason == "revoked"
@@ -1,46 +1,14 @@
 import base64
+import threading
 import time
 
 import pytest
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
-from core.license_manager import LicenseManager, LicenseValidationError
+from core import license_manager
+from core.license_manager import LicenseManager, LicenseStatus, LicenseValidationError
+from conftest import make_token
 
-
-@pytest.fixture
-def keypair(tmp_path):
-    private_key = Ed25519PrivateKey.generate()
-    public_key = private_key.public_key()
-
-    public_path = tmp_path / "license_public.pem"
-    public_path.write_bytes(
-        public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo,
-        )
-    )
-    return private_key, public_path
-
-
-@pytest.fixture(autouse=True)
-def configure_env(monkeypatch, tmp_path, keypair):
-    _, public_path = keypair
-    monkeypatch.delenv("LICENSE_TOKEN", raising=False)
-    monkeypatch.delenv("LICENSE_KEY", raising=False)
-    monkeypatch.setenv("LICENSE_PUBLIC_KEY_PATH", str(public_path))
-    monkeypatch.setenv("LICENSE_LOG_PATH", str(tmp_path / "license.log"))
-    yield
-
-
-def make_token(private_key: Ed25519PrivateKey, *, identifier="user", product="ShopSaavy", version="1.0.0", expiry=None):
-    if expiry is None:
-        expiry = int(time.time()) + 3600
-    payload = f"{identifier}|{product}|{version}|{expiry}".encode("utf-8")
-    payload_b64 = base64.urlsafe_b64encode(payload).decode("utf-8").rstrip("=")
-    signature = private_key.sign(payload)
-    signature_b64 = base64.urlsafe_b64encode(signature).decode("utf-8").rstrip("=")
-    return f"{payload_b64}.{signature_b64}"
+pytestmark = pytest.mark.usefixtures("configure_env")
 
 
 def test_valid_license(monkeypatch, keypair):
@@ -83,7 +51,8 @@ def test_expired_license(monkeypatch, keypair):
 def test_invalid_signature(monkeypatch, keypair):
     private_key, _ = keypair
     token = make_token(private_key)
-    tampered = token[:-1] + ("A" if token[-1] != "A" else "B")
+    # Change a character that carries signature bits, not just base64 padding.
+    tampered = token[:-2] + ("A" if token[-2] != "A" else "B") + token[-1]
     monkeypatch.setenv("LICENSE_TOKEN", tampered)
 
     manager = LicenseManager()
@@ -102,3 +71,190 @@ def test_product_mismatch(monkeypatch, keypair):
     with pytest.raises(LicenseValidationError) as exc:
         manager.validate_license()
     assert "License product mismatch" in str(exc.value)
+
+
+def test_status_snapshot_survives_new_manager(monkeypatch, keypair, tmp_path):
+    private_key, _ = keypair
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    LicenseManager().validate_license()
+
+    status = LicenseManager().get_license_status()
+    assert status["valid"] is True
+    assert status["details"]["identifier"] == "user"
+    assert "validated_at" in status
+
+    snapshot = tmp_path / "license_status.json"
+    snapshot.write_bytes(snapshot.read_bytes().replace(b'"valid": true', b'"valid": fals'))
+    assert LicenseManager().get_license_status()["valid"] is False
+
+
+def test_status_snapshot_bound_to_token(monkeypatch, keypair):
+    private_key, _ = keypair
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    LicenseManager().validate_license()
+
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key, identifier="other"))
+    assert LicenseManager().get_license_status()["valid"] is False
+
+
+def test_forged_snapshot_without_secret_rejected(monkeypatch, keypair, tmp_path):
+    from core.license_snapshot import snapshot_binding, write_snapshot
+
+    private_key, _ = keypair
+    token = make_token(private_key)
+    monkeypatch.setenv("LICENSE_TOKEN", token)
+    manager = LicenseManager()
+    forged = {
+        "status": {"valid": True, "expiry": None, "details": None, "message": "forged"},
+        "validated_at": "2026-01-01T00:00:00+00:00",
+        "expires_at": time.time() + 3600,
+    }
+    binding = snapshot_binding(manager.public_key_path, token, manager.expected_product, manager.expected_version)
+    write_snapshot(manager.status_path, binding, forged)
+
+    assert LicenseManager().get_license_status()["valid"] is False
+    assert not manager.snapshot_key_path.exists()
+
+
+def test_status_read_creates_no_files(monkeypatch, keypair, tmp_path):
+    private_key, _ = keypair
+    state_dir = tmp_path / "state"
+    monkeypatch.setenv("LICENSE_LOG_PATH", str(state_dir / "license.log"))
+    monkeypatch.setenv("LICENSE_STATUS_PATH", str(state_dir / "license_status.json"))
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+
+    assert LicenseManager().get_license_status()["valid"] is False
+    assert not state_dir.exists()
+
+    manager = LicenseManager()
+    manager.validate_license()
+    assert manager.snapshot_key_path.stat().st_mode & 0o777 == 0o600
+    assert LicenseManager().get_license_status()["valid"] is True
+
+
+def test_failed_validation_discards_snapshot(monkeypatch, keypair, tmp_path):
+    private_key, _ = keypair
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    LicenseManager().validate_license()
+    assert (tmp_path / "license_status.json").exists()
+
+    monkeypatch.setenv("LICENSE_PRODUCT", "Other")
+    with pytest.raises(LicenseValidationError):
+        LicenseManager().validate_license()
+    assert not (tmp_path / "license_status.json").exists()
+
+
+def run_burst(manager, threads=16):
+    barrier = threading.Barrier(threads)
+    outcomes = []
+
+    def worker():
+        barrier.wait()
+        try:
+            outcomes.append(manager.validate_license())
+        except LicenseValidationError as exc:
+            outcomes.append(exc.reason)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return outcomes
+
+
+def slow_verify(monkeypatch, calls):
+    original = license_manager.verify_token
+
+    def verify(*args, **kwargs):
+        calls.append(1)
+        time.sleep(0.1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(license_manager, "verify_token", verify)
+
+
+def test_concurrent_validations_share_one_verification(monkeypatch, keypair):
+    private_key, _ = keypair
+    manager = LicenseManager(make_token(private_key))
+    calls = []
+    slow_verify(monkeypatch, calls)
+
+    assert run_burst(manager) == [True] * 16
+    assert len(calls) == 1
+    assert run_burst(manager) == [True] * 16
+    assert len(calls) == 2
+    assert manager.get_license_status()["valid"] is True
+
+
+def test_concurrent_failures_share_one_error(monkeypatch, keypair):
+    private_key, _ = keypair
+    manager = LicenseManager(make_token(private_key, expiry=int(time.time()) - 10))
+    calls = []
+    slow_verify(monkeypatch, calls)
+
+    assert run_burst(manager) == ["expired"] * 16
+    assert len(calls) == 1
+
+
+def test_status_reads_during_revalidation(monkeypatch, keypair):
+    private_key, _ = keypair
+    tokens = [make_token(private_key, identifier=name) for name in ("first", "second")]
+    manager = LicenseManager(tokens[0])
+    manager.validate_license()
+    stop = threading.Event()
+    seen = []
+
+    def reader():
+        while not stop.is_set():
+            status = manager.get_license_status()
+            seen.append((status["valid"], "validated_at" in status, status["details"]["identifier"]))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for index in range(50):
+        manager.license_token = tokens[index % 2]
+        manager.validate_license()
+    stop.set()
+    thread.join()
+    assert seen and all(valid and stamped for valid, stamped, _ in seen)
+
+
+def test_reload_swaps_credentials_and_status_together(monkeypatch, keypair):
+    private_key, _ = keypair
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key, identifier="first"))
+    manager = LicenseManager()
+    manager.validate_license()
+    calls = []
+    slow_verify(monkeypatch, calls)
+    stop = threading.Event()
+    seen = []
+
+    def reader():
+        while not stop.is_set():
+            status = manager.get_license_status()
+            seen.append((status["valid"], (status.get("details") or {}).get("identifier")))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key, identifier="second"))
+    assert manager.reload_credentials() is True
+    manager.expected_product = "Other"
+    with pytest.raises(LicenseValidationError):
+        manager.reload_credentials()
+    stop.set()
+    thread.join()
+
+    assert len(calls) == 2
+    assert seen and all(entry in {(True, "first"), (True, "second"), (False, None)} for entry in seen)
+    assert manager.get_license_status()["valid"] is False
+
+
+def test_license_status_is_an_immutable_named_tuple():
+    status = LicenseStatus(valid=True, expiry="2030-01-01T00:00:00+00:00")
+
+    assert status.to_dict() == {"valid": True, "expiry": "2030-01-01T00:00:00+00:00"}
+    assert status._asdict() == {"valid": True, "expiry": status.expiry, "details": None, "message": None}
+    assert status._replace(valid=False, message="revoked").to_dict()["message"] == "revoked"
+    with pytest.raises(AttributeError):
+        status.valid = False
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from core import license_metrics
+from core.license_cli import main
+from core.license_daemon import LicenseDaemon
+from core.license_manager import LicenseManager, LicenseValidationError
+from core.license_metrics import CACHE_LOOKUPS, KEY_LOADS, PHASE_SECONDS, REGISTRY, VALIDATIONS
+from core.license_verifier import clear_public_key_cache
+from conftest import make_token, tamper
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+
+@pytest.fixture
+def metrics():
+    clear_public_key_cache()
+    REGISTRY.reset()
+    license_metrics.enable_metrics()
+    yield REGISTRY
+    license_metrics.disable_metrics()
+    REGISTRY.reset()
+
+
+def test_validations_are_counted_by_outcome_and_reason(private_key, metrics):
+    good = make_token(private_key)
+    LicenseManager(good).validate_license()
+    for token in (tamper(make_token(private_key, identifier="bad")), make_token(private_key, expiry=1)):
+        with pytest.raises(LicenseValidationError):
+            LicenseManager(token).validate_license()
+
+    assert VALIDATIONS.value("success", "ok") == 1
+    assert VALIDATIONS.value("failure", "signature") == 1
+    assert VALIDATIONS.value("failure", "expired") == 1
+    assert KEY_LOADS.value("file") == 1
+    assert CACHE_LOOKUPS.value("public_key", "hit") == 2
+    assert PHASE_SECONDS.count("total") == 3
+    # The expired token is rejected on its claimed expiry, before the signature.
+    assert PHASE_SECONDS.count("verify") == 1
+
+    text = license_metrics.render_metrics()
+    assert '# TYPE shopsaavy_license_phase_seconds histogram' in text
+    assert 'shopsaavy_license_validations_total{outcome="failure",reason="signature"} 1' in text
+    assert 'shopsaavy_license_phase_seconds_bucket{phase="total",le="+Inf"} 3' in text
+    assert 'shopsaavy_license_phase_seconds_count{phase="normalize"} 3' in text
+
+
+def test_disabled_registry_records_nothing(monkeypatch, private_key):
+    REGISTRY.reset()
+    monkeypatch.setattr(REGISTRY, "enabled", False)
+
+    LicenseManager(make_token(private_key)).validate_license()
+
+    assert VALIDATIONS.value("success", "ok") == 0
+    assert PHASE_SECONDS.count("total") == 0
+
+
+def test_daemon_and_cli_export_prometheus_text(monkeypatch, private_key, metrics, capsys, tmp_path):
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    daemon = LicenseDaemon()
+    daemon.handle({"command": "validate"})
+    reply = json.loads(daemon.handle_line('{"id": 4, "command": "metrics"}'))
+    assert reply["id"] == 4
+    assert 'shopsaavy_license_validations_total{outcome="success",reason="ok"} 1' in reply["metrics"]
+
+    REGISTRY.reset()
+    daemon.manager.flush_events()
+    log = tmp_path / "license.log"
+    logged = log.read_bytes()
+    assert main(["metrics"]) == 0
+    out = capsys.readouterr().out
+    assert out.startswith("# HELP shopsaavy_license_validations_total")
+    assert 'shopsaavy_license_cache_lookups_total{cache="snapshot",result="hit"} 1' in out
+    assert VALIDATIONS.value("success", "ok") == 0
+    assert log.read_bytes() == logged
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from core.license_manager import LicenseManager
+from core.license_middleware import LicenseASGIMiddleware, LicenseGate, LicenseWSGIMiddleware
+from conftest import make_token
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+
+def wsgi_app(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [b"hello"]
+
+
+def call_wsgi(app, path="/"):
+    captured = {}
+
+    def start_response(status, headers):
+        captured["status"], captured["headers"] = status, dict(headers)
+
+    body = b"".join(app({"PATH_INFO": path}, start_response))
+    return captured["status"], captured["headers"], body
+
+
+async def asgi_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"hello"})
+
+
+def call_asgi(app, scope):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def gate_for(token):
+    return LicenseGate(LicenseManager(token))
+
+
+def test_wsgi_passes_valid_and_rejects_expired_licenses(keypair):
+    private_key, _ = keypair
+    allowed = LicenseWSGIMiddleware(wsgi_app, gate_for(make_token(private_key)).start())
+    assert call_wsgi(allowed) == ("200 OK", {"Content-Type": "text/plain"}, b"hello")
+    allowed.gate.stop()
+
+    denied = LicenseWSGIMiddleware(wsgi_app, gate_for(make_token(private_key, expiry=int(time.time()) - 5)))
+    status, headers, body = call_wsgi(denied)
+    denied.gate.stop()
+    assert status == "402 Payment Required"
+    assert json.loads(body)["reason"] == "expired"
+    assert headers["content-type"] == "application/json"
+    assert call_wsgi(LicenseWSGIMiddleware(wsgi_app, denied.gate, exempt_paths={"/healthz"}, start=False), "/healthz")[0] == "200 OK"
+
+
+def test_unavailable_checks_answer_503_with_retry_after(keypair, monkeypatch, tmp_path):
+    private_key, _ = keypair
+    monkeypatch.setenv("LICENSE_PUBLIC_KEY_PATH", str(tmp_path / "missing.pem"))
+    gate = LicenseGate(LicenseManager(make_token(private_key)), retry_interval=12)
+
+    status, headers, body = call_wsgi(LicenseWSGIMiddleware(wsgi_app, gate, start=False))
+    assert status == "503 Service Unavailable" and headers["retry-after"] == "12"
+    assert gate.refresh() is False
+    assert call_wsgi(LicenseWSGIMiddleware(wsgi_app, gate, start=False))[0] == "503 Service Unavailable"
+    assert json.loads(gate.denial[2])["reason"] == "key"
+
+
+def test_asgi_gates_http_and_websocket_but_not_lifespan(keypair):
+    private_key, _ = keypair
+    gate = gate_for(make_token(private_key))
+    gate.refresh()
+    app = LicenseASGIMiddleware(asgi_app, gate, start=False)
+    assert call_asgi(app, {"type": "http", "path": "/"})[0]["status"] == 200
+
+    # Expiry is enforced per request from the cached deadline, without revalidating.
+    gate.valid_until = time.time() - 1
+    start, body = call_asgi(app, {"type": "http", "path": "/"})
+    assert start["status"] == 402 and json.loads(body["body"])["reason"] == "expired"
+    assert call_asgi(app, {"type": "websocket", "path": "/ws"}) == [{"type": "websocket.close", "code": 1008}]
+    assert call_asgi(app, {"type": "lifespan"})[0]["status"] == 200
+
+
+def test_refresh_picks_up_a_renewed_token(keypair, monkeypatch):
+    private_key, _ = keypair
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key, expiry=int(time.time()) - 5))
+    gate = LicenseGate(LicenseManager())
+    assert gate.refresh() is False and gate.reason == "expired"
+
+    renewed_expiry = int(time.time()) + 7200
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key, expiry=renewed_expiry))
+    assert gate.refresh(reload=True) is True
+    assert gate.valid_until == renewed_expiry
+
+    # A missing key after a successful check keeps serving until expiry.
+    monkeypatch.setenv("LICENSE_PUBLIC_KEY_PATH", "/nonexistent/license_public.pem")
+    assert gate.refresh(reload=True) is False and gate.reason == "key"
+    assert gate.valid_until == renewed_expiry
+
+
+def test_background_refresh_is_scheduled_before_expiry():
+    gate = LicenseGate(LicenseManager("unused"), refresh_margin=300, refresh_interval=3600, retry_interval=30)
+    now = 1_000_000.0
+    gate.reason = "ok"
+    gate.valid_until = now + 86400
+    assert gate.next_delay(now) == 3600
+    gate.valid_until = now + 1000
+    assert gate.next_delay(now) == 700
+    gate.valid_until = now + 10
+    assert gate.next_delay(now) == 10
+    gate.reason, gate.valid_until = "io", now + 86400
+    assert gate.next_delay(now) == 30
+    gate.valid_until = 0.0
+    assert gate.next_delay(now) == 30
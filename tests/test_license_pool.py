@@ -0,0 +1,78 @@
+import json
+import time
+
+import pytest
+
+from core.license_manager import LicenseValidationError
+from core.license_pool import LicenseManagerPool, TenantStatus
+from conftest import make_token
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+
+def test_validate_all_counts_by_reason(keypair, tmp_path):
+    private_key, _ = keypair
+    pool = LicenseManagerPool()
+    pool.add_many((f"t{index}", make_token(private_key, identifier=f"t{index}")) for index in range(20))
+    pool.add("old", make_token(private_key, identifier="old", expiry=int(time.time()) - 60))
+    pool.add("other", make_token(private_key, identifier="other", product="Other"))
+
+    assert pool.validate_all() == {"ok": 21, "expired": 1}
+    assert pool.get_license_status("t3")["details"]["identifier"] == "t3"
+    assert pool.get_license_status("old")["valid"] is False
+    assert not (tmp_path / "license_status.json").exists()
+
+    events = [json.loads(line) for line in (tmp_path / "license.log").read_text().splitlines()]
+    assert {event["tenant"] for event in events} == {f"t{index}" for index in range(20)} | {"old", "other"}
+
+
+def test_expected_product_is_shared(keypair):
+    private_key, _ = keypair
+    pool = LicenseManagerPool(expected_product="ShopSaavy")
+    pool.add("good", make_token(private_key, identifier="good"))
+    pool.add("bad", make_token(private_key, identifier="bad", product="Other"))
+
+    assert pool.validate("good") is True
+    with pytest.raises(LicenseValidationError) as excinfo:
+        pool.validate("bad")
+    assert excinfo.value.reason == "product_mismatch"
+
+
+def test_lru_eviction_and_loader_refill(keypair):
+    private_key, _ = keypair
+    tokens = {f"t{index}": make_token(private_key, identifier=f"t{index}") for index in range(5)}
+    loads = []
+
+    def loader(tenant_id):
+        loads.append(tenant_id)
+        return tokens.get(tenant_id)
+
+    pool = LicenseManagerPool(maxsize=3, token_loader=loader)
+    for tenant_id in ("t0", "t1", "t2"):
+        pool.add(tenant_id, tokens[tenant_id])
+    pool.get_license_status("t0")
+    pool.add("t3", tokens["t3"])
+
+    assert len(pool) == 3
+    assert "t1" not in pool and "t0" in pool
+    assert pool.get_license_status("t1")["valid"] is True
+    assert loads == ["t1"]
+    assert pool.get_license_status("missing") == {"valid": False}
+    with pytest.raises(LicenseValidationError):
+        pool.validate("missing")
+
+
+def test_missing_key_marks_every_tenant(keypair, monkeypatch, tmp_path):
+    private_key, _ = keypair
+    monkeypatch.setenv("LICENSE_PUBLIC_KEY_PATH", str(tmp_path / "absent.pem"))
+    pool = LicenseManagerPool()
+    pool.add("a", make_token(private_key, identifier="a"))
+    pool.add("b", make_token(private_key, identifier="b"))
+
+    assert pool.validate_all() == {"key": 2}
+
+
+def test_tenant_status_uses_slots():
+    record = TenantStatus("token")
+    with pytest.raises(AttributeError):
+        record.extra = 1
@@ -0,0 +1,63 @@
+import io
+import json
+
+from core.gen_license import human_readable, issue_bulk, key_id_for, write_records
+from core.license_registry import LicenseRegistry, main, write_registry_records
+from conftest import private_pem
+
+NOW = 1_700_000_000
+DAY = 86400
+
+
+def issue(private_key, rows, **kwargs):
+    return list(issue_bulk(iter(rows), private_pem(private_key), workers=1, **kwargs))
+
+
+def test_bulk_issuance_is_recorded_and_queryable(tmp_path, private_key):
+    rows = [(f"tenant{i % 3}", "ShopSaavy", "1.0.0", NOW + (i + 1) * DAY) for i in range(30)]
+
+    with LicenseRegistry(tmp_path / "registry.sqlite") as registry:
+        out = io.StringIO()
+        records = registry.record_stream(issue(private_key, rows, token_format="v2"), batch_size=7)
+        assert write_records(records, out, "jsonl") == 30
+
+        assert registry.count() == 30
+        assert registry.record(json.loads(out.getvalue().splitlines()[0])["token"]) is False
+
+        tenant = list(registry.query(identifier="tenant1"))
+        assert [record.expiry for record in tenant] == sorted(record.expiry for record in tenant)
+        assert len(tenant) == 10 and tenant[0].key_id == key_id_for(private_key)
+
+        soon = list(registry.expiring_within(5 * DAY, now=NOW))
+        assert [record.expiry for record in soon] == [NOW + day * DAY for day in range(1, 5)]
+        assert registry.count(identifier="tenant0", expires_before=NOW + 10 * DAY) == 3
+
+        buffer = io.StringIO()
+        assert write_registry_records(registry.query(limit=2), buffer, "csv") == 2
+        assert buffer.getvalue().splitlines()[0].startswith("identifier,product,version,expiry,key_id")
+
+
+def test_cli_imports_generator_output_and_queries(tmp_path, private_key, capsys):
+    issued = tmp_path / "issued.jsonl"
+    with open(issued, "w", encoding="utf-8") as handle:
+        write_records(issue(private_key, [("alice", "ShopSaavy", "1.0.0", NOW), ("bob", "ShopSaavy", "1.0.0", 4102444800)]), handle, "jsonl")
+    db = str(tmp_path / "registry.sqlite")
+
+    assert main(["--db", db, "import", str(issued)]) == 0
+    assert main(["--db", db, "query", "--expired"]) == 0
+    expired = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record["identifier"] for record in expired] == ["alice"]
+
+    assert main(["--db", db, "query", "--identifier", "bob", "--count"]) == 0
+    assert capsys.readouterr().out.strip() == "1"
+
+
+def test_v1_records_issuer_key_id_and_canonical_hash(tmp_path, private_key):
+    token = issue(private_key, [("alice", "ShopSaavy", "1.0.0", NOW)])[0]["token"]
+    key_id = key_id_for(private_key)
+
+    with LicenseRegistry(tmp_path / "registry.sqlite") as registry:
+        assert registry.record(token, key_id=key_id) is True
+        assert registry.record(human_readable(token), key_id=key_id) is False
+        assert registry.record(token + "=") is False
+        assert [record.key_id for record in registry.query()] == [key_id]
@@ -0,0 +1,85 @@
+import os
+import string
+
+import pytest
+
+from core.license_manager import LicenseManager, LicenseValidationError
+from core.license_revocation import (
+    RevocationList,
+    build_revocation_list,
+    identifier_digest,
+    load_revocation_list,
+    write_revocation_list,
+)
+from core.license_verifier import LicenseVerificationError, verify_token
+from core.revoke_license import append_revocations, digests_from_lines
+from conftest import make_token, private_pem
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+
+@pytest.fixture(autouse=True)
+def revocation_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("LICENSE_REVOCATION_PATH", str(tmp_path / "revocations.bin"))
+
+
+def test_manager_rejects_revoked_identifier_and_snapshot(monkeypatch, private_key, tmp_path):
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key, "leaked"))
+    assert LicenseManager().validate_license() is True
+
+    append_revocations(tmp_path / "revocations.bin", private_pem(private_key), [identifier_digest("leaked")])
+
+    assert LicenseManager().get_license_status()["valid"] is False
+    with pytest.raises(LicenseValidationError) as exc:
+        LicenseManager().validate_license()
+    assert exc.value.reason == "revoked"
+
+
+def test_revoked_token_hash(private_key, tmp_path):
+    leaked = make_token(private_key)
+    path = tmp_path / "revocations.bin"
+    append_revocations(path, private_pem(private_key), [])
+    revocations = load_revocation_list(path, private_key.public_key())
+    assert verify_token(private_key.public_key(), leaked, revocations=revocations).identifier == "user"
+
+    append_revocations(path, private_pem(private_key), digests_from_lines([leaked]))
+    revocations = load_revocation_list(path, private_key.public_key())
+    with pytest.raises(LicenseVerificationError, match="License revoked"):
+        verify_token(private_key.public_key(), leaked, revocations=revocations)
+    assert verify_token(private_key.public_key(), make_token(private_key, "fresh"), revocations=revocations)
+
+
+def test_revoked_token_padding_variants(private_key, tmp_path):
+    leaked = make_token(private_key)
+    path = tmp_path / "revocations.bin"
+    append_revocations(path, private_pem(private_key), digests_from_lines([leaked]))
+    revocations = load_revocation_list(path, private_key.public_key())
+
+    alphabet = string.ascii_uppercase + string.ascii_lowercase + string.digits + "-_"
+    # The last signature character carries two unused bits that decoders ignore.
+    padding_bit = leaked[:-1] + alphabet[alphabet.index(leaked[-1]) ^ 1]
+    for variant in (padding_bit, leaked + "=="):
+        with pytest.raises(LicenseVerificationError, match="License revoked"):
+            verify_token(private_key.public_key(), variant, revocations=revocations)
+
+
+def test_tampered_list_is_rejected(private_key, tmp_path):
+    path = tmp_path / "revocations.bin"
+    data = bytearray(build_revocation_list([identifier_digest("a")], private_key))
+    data[-70] ^= 0xFF
+    write_revocation_list(path, bytes(data))
+
+    with pytest.raises(LicenseVerificationError, match="signature"):
+        RevocationList(path, private_key.public_key())
+
+
+def test_lookup_over_many_entries(private_key, tmp_path):
+    digests = [os.urandom(16) for _ in range(50_000)]
+    path = tmp_path / "revocations.bin"
+    write_revocation_list(path, build_revocation_list(digests + [identifier_digest("gone")], private_key))
+
+    revocations = RevocationList(path, private_key.public_key())
+    assert len(revocations) == 50_001
+    assert revocations.is_identifier_revoked("gone")
+    assert not revocations.is_identifier_revoked("present")
+    assert all(revocations.contains_digest(digest) for digest in digests[:1000])
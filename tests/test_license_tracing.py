@@ -0,0 +1,97 @@
+import json
+import time
+
+import pytest
+
+from core.license_manager import LicenseManager, LicenseValidationError
+from core.license_tracing import (
+    TRACER,
+    InMemoryExporter,
+    JsonlExporter,
+    Tracer,
+    disable_tracing,
+    enable_tracing,
+)
+from core.license_verifier import verify_token
+from conftest import make_token
+
+pytestmark = pytest.mark.usefixtures("configure_env")
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemoryExporter()
+    enable_tracing(exporter, sample_rate=1.0)
+    yield exporter
+    disable_tracing()
+
+
+def test_validation_records_a_span_per_phase(keypair, exporter, monkeypatch):
+    private_key, _ = keypair
+    monkeypatch.setenv("LICENSE_TOKEN", make_token(private_key))
+    manager = LicenseManager()
+    manager.validate_license()
+    manager.flush_events()
+
+    (load,) = exporter.find("license.load_token")
+    assert load.attributes["source"] == "env"
+    (root,) = exporter.find("license.validate")
+    trace = [span for span in exporter.spans if span.trace_id == root.trace_id]
+    names = {span.name for span in trace}
+    assert {"license.verify_token", "normalize", "key_load", "decode", "signature", "log_write"} <= names
+    assert root.parent_id is None and root.attributes["reason"] == "ok"
+    (verify,) = exporter.find("license.verify_token")
+    assert verify.parent_id == root.span_id
+    assert all(span.parent_id == verify.span_id for span in exporter.find("signature"))
+    assert all(root.start <= span.start <= span.end <= root.end for span in trace)
+
+
+def test_failures_mark_the_span_as_error(keypair, exporter):
+    private_key, _ = keypair
+    manager = LicenseManager(make_token(private_key, expiry=int(time.time()) - 10))
+    with pytest.raises(LicenseValidationError):
+        manager.validate_license()
+
+    (root,) = exporter.find("license.validate")
+    assert root.status == "error"
+    assert root.attributes["reason"] == "expired"
+    # The claimed expiry rejects the token before any signature work.
+    assert exporter.find("signature") == []
+
+
+def test_sampling_is_decided_per_trace():
+    exporter = InMemoryExporter()
+    decisions = iter([0.9, 0.1])
+    tracer = Tracer([exporter], sample_rate=0.5, enabled=True, sampler=lambda: next(decisions))
+
+    for _ in range(2):
+        with tracer.span("root"):
+            tracer.record("child", time.perf_counter())
+    assert exporter.names() == ["child", "root"]
+
+
+def test_jsonl_exporter_writes_one_span_per_line(keypair, tmp_path):
+    private_key, public_path = keypair
+    path = tmp_path / "traces" / "license.jsonl"
+    enable_tracing(JsonlExporter(path))
+    try:
+        verify_token(public_path, make_token(private_key))
+    finally:
+        disable_tracing()
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    by_name = {record["name"]: record for record in records}
+    assert by_name["license.verify_token"]["parent_id"] is None
+    assert by_name["signature"]["parent_id"] == by_name["license.verify_token"]["span_id"]
+    assert all(record["duration_ms"] >= 0 for record in records)
+
+
+def test_disabled_tracing_records_nothing(keypair):
+    private_key, public_path = keypair
+    exporter = InMemoryExporter()
+    TRACER.exporters.append(exporter)
+    try:
+        verify_token(public_path, make_token(private_key))
+    finally:
+        TRACER.exporters.remove(exporter)
+    assert exporter.spans == []
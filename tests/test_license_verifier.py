@@ -0,0 +1,259 @@
+import base64
+import io
+import json
+import os
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from core.gen_license import canonical_payload_v2, human_readable, sign_with_key_v2
+from core.license_verifier import (
+    TOKEN_V1,
+    TOKEN_V2,
+    LicensePayload,
+    LicenseVerificationError,
+    VerificationCache,
+    clear_public_key_cache,
+    decode_token,
+    normalize_token,
+    public_key_cache_info,
+    token_version,
+    verify_many,
+    verify_token,
+)
+from core.verify_license import main as verify_license_main, verify_stream
+from conftest import make_token, tamper
+
+
+@pytest.fixture(autouse=True)
+def fresh_key_cache():
+    clear_public_key_cache()
+    yield
+    clear_public_key_cache()
+
+
+def write_public_key(path, private_key):
+    path.write_bytes(
+        private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    return path
+
+
+def test_public_key_file_is_parsed_once(tmp_path, private_key):
+    public_path = write_public_key(tmp_path / "license_public.pem", private_key)
+    token = make_token(private_key)
+
+    for _ in range(3):
+        verify_token(public_path, token)
+
+    info = public_key_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+
+
+def test_replaced_public_key_file_is_reloaded(tmp_path, private_key):
+    public_path = write_public_key(tmp_path / "license_public.pem", private_key)
+    verify_token(public_path, make_token(private_key))
+
+    rotated = Ed25519PrivateKey.generate()
+    write_public_key(public_path, rotated)
+    stat = public_path.stat()
+    os.utime(public_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert verify_token(public_path, make_token(rotated)).identifier == "user"
+    assert public_key_cache_info().misses == 2
+
+
+def test_accepts_raw_and_in_memory_keys(private_key):
+    token = make_token(private_key)
+    raw = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.Raw,
+        format=serialization.PublicFormat.Raw,
+    )
+
+    assert verify_token(raw, token).product == "ShopSaavy"
+    assert verify_token(private_key.public_key(), token).product == "ShopSaavy"
+
+
+def test_verification_cache_skips_repeat_signature_checks(tmp_path, private_key):
+    public_path = write_public_key(tmp_path / "license_public.pem", private_key)
+    token = make_token(private_key)
+    cache = VerificationCache(ttl=60)
+
+    first = verify_token(public_path, token, expected_product="ShopSaavy", cache=cache)
+    second = verify_token(public_path, token, expected_product="ShopSaavy", cache=cache)
+    verify_token(public_path, token, expected_product=None, cache=cache)
+
+    assert first is second
+    assert (cache.info().hits, cache.info().misses) == (1, 2)
+
+    cache.invalidate()
+    verify_token(public_path, token, expected_product="ShopSaavy", cache=cache)
+    assert cache.info().misses == 3
+
+
+def test_verification_cache_entries_end_at_token_expiry(private_key, monkeypatch):
+    expiry = int(time.time()) + 5
+    token = make_token(private_key, expiry=expiry)
+    cache = VerificationCache(ttl=3600)
+    verify_token(private_key.public_key(), token, cache=cache)
+
+    monkeypatch.setattr("core.license_verifier.time.time", lambda: expiry + 1)
+    verify_token(private_key.public_key(), token, cache=cache)
+    assert cache.info().misses == 2
+
+
+def test_verification_cache_does_not_store_failures(private_key):
+    tampered = tamper(make_token(private_key))
+    cache = VerificationCache()
+
+    for _ in range(2):
+        with pytest.raises(LicenseVerificationError):
+            verify_token(private_key.public_key(), tampered, cache=cache)
+    assert cache.info().currsize == 0
+
+
+def test_verify_many_reports_reason_per_token(private_key):
+    good = make_token(private_key)
+    tokens = [
+        good,
+        tamper(good),
+        "not-a-token",
+        make_token(private_key, expiry=int(time.time()) - 10),
+        make_token(private_key, product="Other"),
+    ]
+
+    results = list(
+        verify_many(iter(tokens), private_key.public_key(), expected_product="ShopSaavy", max_in_flight=2)
+    )
+
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert [result.reason for result in results] == [
+        "ok",
+        "signature",
+        "malformed",
+        "expired",
+        "product_mismatch",
+    ]
+    assert results[0].valid and results[0].payload.identifier == "user"
+
+
+def test_verify_license_stdin_streams_jsonl(tmp_path, private_key):
+    public_path = write_public_key(tmp_path / "license_public.pem", private_key)
+    lines = io.StringIO(f"{make_token(private_key)}\n\n  \n{make_token(private_key, version='2.0.0')}\n\n")
+    out = io.StringIO()
+
+    all_valid = verify_stream(public_path, lines, out, expected_version="1.0.0")
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert all_valid is False
+    assert [record["reason"] for record in records] == ["ok", "version_mismatch"]
+    assert records[0]["identifier"] == "user"
+
+
+def test_verify_license_stdin_reports_run_errors_on_stderr(tmp_path, private_key, monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO(make_token(private_key) + "\n"))
+
+    assert verify_license_main(["--stdin", str(tmp_path / "missing.pem")]) == 1
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err.startswith("INVALID: ")
+
+
+def test_v2_tokens_are_detected_and_verified(private_key):
+    payload = canonical_payload_v2("dev|01", "ShopSaavy", "1.0.0", 4102444800, key_id=7, flags=1)
+    token = sign_with_key_v2(private_key, payload)
+    v1_token = make_token(private_key)
+
+    assert token_version(token) == TOKEN_V2 and token_version(v1_token) == TOKEN_V1
+    decoded, signature, signed = decode_token(token)
+    assert isinstance(signature, memoryview) and bytes(signed) == payload
+    assert (decoded.identifier, decoded.expiry, decoded.key_id, decoded.flags) == ("dev|01", 4102444800, 7, 1)
+
+    assert normalize_token(human_readable(token).lower()) == token
+    assert verify_token(private_key.public_key(), human_readable(token)).identifier == "dev|01"
+    assert verify_token(private_key.public_key(), v1_token).identifier == "user"
+    tampered = token[:-10] + ("A" if token[-10] != "A" else "B") + token[-9:]
+    with pytest.raises(LicenseVerificationError, match="signature"):
+        verify_token(private_key.public_key(), tampered)
+
+
+@pytest.mark.parametrize("cut", [1, 64, 70])
+def test_v2_rejects_truncated_blobs(private_key, cut):
+    token = sign_with_key_v2(private_key, canonical_payload_v2("user", "ShopSaavy", "1.0.0", 4102444800))
+    blob = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    truncated = base64.urlsafe_b64encode(blob[:-cut]).decode("ascii").rstrip("=")
+
+    with pytest.raises(LicenseVerificationError) as exc:
+        verify_token(private_key.public_key(), truncated)
+    assert exc.value.reason == "malformed"
+
+
+class NoSignatureWork:
+    """Key source that fails the test if a signature is ever checked."""
+
+    def keys_for_token(self, token):
+        return (self,)
+
+    def verify(self, signature, data):
+        raise AssertionError("signature checked for a token that should be rejected earlier")
+
+
+def test_human_form_is_checksummed_and_forgiving(private_key):
+    token = make_token(private_key)
+    human = human_readable(token)
+
+    assert human.startswith("SSK-")
+    assert normalize_token(human) == token
+    sloppy = "ssk-" + human[4:].lower().replace("1", "l").replace("0", "o").replace("-", " ")
+    assert normalize_token(sloppy) == token
+    assert normalize_token(human.replace("-", "")) == token
+    assert normalize_token("ssk " + human[4:].lower()) == token
+
+    index = len("SSK-") + 3
+    typo = human[:index] + ("Z" if human[index] != "Z" else "Y") + human[index + 1 :]
+    with pytest.raises(LicenseVerificationError) as exc:
+        verify_token(NoSignatureWork(), typo)
+    assert exc.value.reason == "checksum"
+
+
+def test_legacy_base32_keys_are_still_accepted(private_key):
+    token = make_token(private_key)
+    legacy = base64.b32encode(token.encode("utf-8")).decode("ascii").rstrip("=")
+
+    assert normalize_token("-".join(legacy[i : i + 5] for i in range(0, len(legacy), 5))) == token
+
+
+@pytest.mark.parametrize("bad", ["", "x" * 5000, "not a token!", "SSK-", "SSK-ABCDE-UUUU"])
+def test_prechecks_reject_malformed_input_without_signature_work(bad):
+    with pytest.raises(LicenseVerificationError) as exc:
+        verify_token(NoSignatureWork(), bad)
+    assert exc.value.reason == "malformed"
+
+
+def test_claim_mismatches_are_rejected_before_the_signature(private_key):
+    other = make_token(private_key, product="Other")
+    expired = make_token(private_key, expiry=int(time.time()) - 10)
+
+    with pytest.raises(LicenseVerificationError) as exc:
+        verify_token(NoSignatureWork(), other, expected_product="ShopSaavy")
+    assert exc.value.reason == "product_mismatch"
+    with pytest.raises(LicenseVerificationError) as exc:
+        verify_token(NoSignatureWork(), expired, check_expiry=True)
+    assert exc.value.reason == "expired"
+    # Without the opt-in the expired token is still verified and returned.
+    assert verify_token(private_key.public_key(), expired).is_expired
+
+
+def test_license_payload_is_an_immutable_named_tuple():
+    payload = LicensePayload("alice", "ShopSaavy", "1.0.0", 4102444800, quotas=(("seats", 5),))
+
+    assert payload._asdict()["key_id"] == 0 and payload.quota("seats") == 5
+    assert payload._replace(expiry=0).is_expired
+    with pytest.raises(AttributeError):
+        payload.expiry = 0
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from core.license_manager import LicenseManager
+from core.license_watcher import LicenseWatcher
+from conftest import make_token
+
+
+@pytest.fixture
+def home(monkeypatch, tmp_path):
+    home_dir = tmp_path / "home"
+    home_dir.mkdir()
+    monkeypatch.setenv("HOME", str(home_dir))
+    monkeypatch.delenv("LICENSE_TOKEN", raising=False)
+    monkeypatch.delenv("LICENSE_KEY", raising=False)
+    monkeypatch.delenv("LICENSE_PRODUCT", raising=False)
+    monkeypatch.setenv("LICENSE_PUBLIC_KEY_PATH", str(tmp_path / "license_public.pem"))
+    monkeypatch.setenv("LICENSE_LOG_PATH", str(tmp_path / "license.log"))
+    return home_dir
+
+
+def install_key(tmp_path):
+    key = Ed25519PrivateKey.generate()
+    (tmp_path / "license_public.pem").write_bytes(
+        key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
+    return key
+
+
+def test_check_revalidates_only_after_a_change(home, tmp_path):
+    key = install_key(tmp_path)
+    (home / ".license_token").write_text(make_token(key, "first"))
+    manager = LicenseManager()
+    manager.validate_license()
+    watcher = LicenseWatcher(manager, use_inotify=False)
+
+    assert watcher.check() is False
+
+    rotated = install_key(tmp_path)
+    (home / ".license_token").write_text(make_token(rotated, "second-customer"))
+    assert watcher.check() is True
+    status = manager.get_license_status()
+    assert status["valid"] is True
+    assert status["details"]["identifier"] == "second-customer"
+
+
+def test_rotated_key_without_new_token_shows_invalid(home, tmp_path):
+    key = install_key(tmp_path)
+    (home / ".license_token").write_text(make_token(key, "first"))
+    manager = LicenseManager()
+    manager.validate_license()
+    watcher = LicenseWatcher(manager, use_inotify=False)
+
+    install_key(tmp_path)
+    assert watcher.check() is True
+    assert manager.get_license_status()["valid"] is False
+
+
+def test_background_thread_picks_up_token_file(home, tmp_path):
+    key = install_key(tmp_path)
+    manager = LicenseManager()
+    changed = threading.Event()
+
+    with LicenseWatcher(manager, interval=0.1, on_change=lambda status: changed.set()):
+        (home / ".license_token").write_text(make_token(key, "late"))
+        assert changed.wait(timeout=5)
+
+    assert manager.get_license_status()["details"]["identifier"] == "late"
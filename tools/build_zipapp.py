@@ -0,0 +1,97 @@
+"""Build a precompiled single-file zipapp of the license CLI and time its cold start."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import py_compile
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipapp
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+CORE_DIR = ROOT / "src" / "core"
+DEFAULT_OUTPUT = ROOT / "dist" / "license_cli.pyz"
+
+# The archive sits outside the checkout's src/ tree, so its __main__ points
+# LICENSE_APP_ROOT at the app root, relative to the archive's own location.
+MAIN_SOURCE = """import os
+import sys
+
+os.environ.setdefault(
+    "LICENSE_APP_ROOT",
+    os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(sys.argv[0])), {app_root!r})),
+)
+
+from core.license_cli import main
+
+sys.exit(main())
+"""
+
+
+def build(output: Path, *, optimize: int = 1, app_root: Path = ROOT) -> Path:
+    """Compile ``src/core`` to bytecode and pack it into ``output``.
+
+    Modules are stored as legacy ``.pyc`` files next to each other (no
+    ``__pycache__``) so ``zipimport`` loads them without compiling. The archive
+    only runs on the Python version that built it. Default paths (public key,
+    logs) resolve under ``app_root``, which the archive finds relative to
+    itself, so keep the two together when moving them.
+    """
+
+    with tempfile.TemporaryDirectory() as staging:
+        stage = Path(staging)
+        package_dir = stage / "core"
+        package_dir.mkdir()
+        for source in sorted(CORE_DIR.glob("*.py")):
+            py_compile.compile(
+                str(source),
+                cfile=str(package_dir / (source.stem + ".pyc")),
+                dfile=f"core/{source.name}",
+                doraise=True,
+                optimize=optimize,
+            )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        relative_root = os.path.relpath(Path(app_root).resolve(), output.parent.resolve())
+        (stage / "__main__.py").write_text(MAIN_SOURCE.format(app_root=relative_root), encoding="utf-8")
+
+        zipapp.create_archive(stage, output, interpreter="/usr/bin/env python3", compressed=False)
+    return output
+
+
+def measure_cold_start(archive: Path, *, runs: int = 5, command: str = "status") -> float:
+    """Return the median wall time in milliseconds of ``archive <command>``."""
+
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(archive), command],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the license CLI zipapp")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Archive path")
+    parser.add_argument("--app-root", type=Path, default=ROOT, help="App root holding src/core keys and logs/")
+    parser.add_argument("--runs", type=int, default=5, help="Cold-start samples to take (0 to skip)")
+    args = parser.parse_args()
+
+    archive = build(args.output, app_root=args.app_root)
+    print(f"Built {archive} ({archive.stat().st_size} bytes)")
+    if args.runs > 0:
+        median_ms = measure_cold_start(archive, runs=args.runs)
+        print(f"Cold start '{archive.name} status': median {median_ms:.1f} ms over {args.runs} runs")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
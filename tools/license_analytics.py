@@ -0,0 +1,16 @@
+"""Summarize expiries across a set of license tokens.
+
+Thin launcher for :mod:`core.license_analytics`.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.license_analytics import main  # noqa: E402
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,16 @@
+"""Query and update the issued-license registry.
+
+Thin launcher for :mod:`core.license_registry`.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.license_registry import main  # noqa: E402
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
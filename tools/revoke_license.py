@@ -0,0 +1,17 @@
+"""Append entries to the signed license revocation list.
+
+Thin launcher for :mod:`core.revoke_license` so the shared list format lives in
+one place.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.revoke_license import main  # noqa: E402
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())